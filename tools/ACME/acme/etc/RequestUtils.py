@@ -162,6 +162,10 @@ def requestFromResult(inResult:Result, originator:str = None, ty:T = None, op:Op
 	if inResult.request.parameters:
 		if (ec := inResult.request.parameters.get(C.hfEC)):			# Event Category, copy from the original request
 			req['ec'] = ec
+		if (cnst := inResult.request.parameters.get(C.hfCTS)):		# Content Status, for partial discovery results
+			req['cnst'] = cnst
+		if (cnot := inResult.request.parameters.get(C.hfCTO)):		# Content Offset, for partial discovery results
+			req['cnot'] = cnot
 	
 	# If the response contains a request (ie. for polling), then add that request to the pc
 	pc = None
@@ -680,6 +680,12 @@ class DesiredIdentifierResultType(ACMEIntEnum):
 	unstructured	= 2
 
 
+class ContentStatus(ACMEIntEnum):
+	""" Content Status of a response """
+	partialContent	= 1
+	fullContent		= 2
+
+
 ##############################################################################
 #
 #	CSE related
@@ -1049,6 +1055,20 @@ class LastTSInstance:
 		
 
 
+##############################################################################
+#
+#	Notification related
+#
+
+@dataclass
+class NotificationTarget:
+	"""	Data class for the delivery state of a notification target. """
+	failures:int					= 0		# Number of consecutive failed notifications
+	nextAttempt:float				= 0.0	# Timestamp before which no notification is sent when the circuit is open
+	circuitOpen:bool				= False	# Indicator whether sending notifications to the target is suspended
+	probing:bool					= False	# Indicator whether a notification currently checks whether a suspended target is reachable again
+
+
 ##############################################################################
 #
 #	Announcement related
@@ -250,12 +250,12 @@ def structuredPath(resource:Resource) -> str:
 	if resource.ty == T.CSEBase: # if CSE
 		return rn
 
-	# retrieve identifier record of the parent
+	# retrieve the structured path of the parent
 	if not (pi := resource.pi):
 		# L.logErr('PI is None')
 		return rn
-	if len(rpi := CSE.storage.identifier(pi)) == 1:
-		return cast(str, f'{rpi[0]["srn"]}/{rn}')
+	if (psrn := CSE.storage.structuredPathFromRI(pi)):
+		return f'{psrn}/{rn}'
 	# L.logErr(traceback.format_stack())
 	L.logErr(f'Parent {pi} not found in DB')
 	return rn # fallback
@@ -269,25 +269,19 @@ def structuredPathFromRI(ri:str) -> str:
 		Return:
 			Structured path
 	"""
-	try:
-		return CSE.storage.identifier(ri)[0]['srn']
-	except:
-		return None
+	return CSE.storage.structuredPathFromRI(ri)
 
 
 def riFromStructuredPath(srn: str) -> str:
 	""" Get the resource ID from a resource by its structured path. 
-		Makes a lookup to a table in the DB.
+		The lookup is cached by the storage.
 
 		Args:
 			srn: structured path
 		Return:
 			Resource ID
 	"""
-	try:
-		return CSE.storage.structuredIdentifier(srn)[0]['ri']
-	except:
-		return None
+	return CSE.storage.riFromStructuredPath(srn)
 
 
 def srnFromHybrid(srn:str, id:str) -> Tuple[str, str]:
@@ -836,7 +830,7 @@ def getAttributeSize(attribute:Any) -> int:
 def hasRegisteredAE(originator:str) -> bool:
 	"""	Check wether an AE with `originator` is registered at the CSE.
 	"""
-	return len(CSE.storage.searchByFragment({'aei' : originator})) > 0
+	return CSE.storage.hasRegisteredAE(originator)
 
 
 ##############################################################################
@@ -10,7 +10,7 @@
 from __future__ import annotations
 from .TextTools import simpleMatch
 import random, sys, heapq, datetime, traceback, time
-from threading import Thread, Timer, Event, RLock, enumerate as threadsEnumerate
+from threading import Thread, Timer, Event, Lock, RLock, enumerate as threadsEnumerate
 from typing import Callable, List, Dict, Any, Tuple
 import logging
 
@@ -59,6 +59,8 @@ class BackgroundWorker(object):
 		self.finished				= finished			# Callback after worker finished
 		self.ignoreException		= ignoreException	# Ignore exception when running workers
 		self.id 					= id
+		self.earlierRunTime:float	= None				# Timestamp requested by `runEarlier()` while the callback was executed
+		self.lockSchedule			= Lock()			# Protects the re-scheduling by `runEarlier()` and `_work()`
 
 
 	def start(self, **args:Any) -> BackgroundWorker:
@@ -161,6 +163,33 @@ class BackgroundWorker(object):
 		return self
 
 
+	def runEarlier(self, runTime:float) -> BackgroundWorker:
+		"""	Run the worker at *runTime* if this is earlier than its next scheduled run.
+
+			In contrast to `restart()` this never waits for the worker callback: if the callback
+			is currently executed then the earlier time is taken into account when the worker is
+			scheduled again afterwards.
+
+			Args:
+				runTime: UTC-based timestamp.
+			Return:
+				The background worker instance, or None if the worker isn't running
+		"""
+		with self.lockSchedule:
+			if not self.running:
+				return None
+			if self.executing:
+				if self.earlierRunTime is None or runTime < self.earlierRunTime:
+					self.earlierRunTime = runTime
+				return self
+			if self.nextRunTime is not None and runTime >= self.nextRunTime:
+				return self
+			BackgroundWorkerPool._unqueueWorker(self)
+			self.nextRunTime = runTime
+			BackgroundWorkerPool._queueWorker(self.nextRunTime, self)
+		return self
+
+
 	def _work(self) -> None:
 		"""	Wrapper around the actual worker function. It deals with terminating,
 			process time compensation, etc.
@@ -173,7 +202,8 @@ class BackgroundWorker(object):
 		result = True
 		try:
 			self.numberOfRuns += 1
-			self.executing = True
+			with self.lockSchedule:
+				self.executing = True
 
 			# The following calls the worker callback.
 			# If there is no exception, then the loop is left
@@ -207,22 +237,28 @@ class BackgroundWorker(object):
 				else:
 					BackgroundWorker._logger(logging.ERROR, f'Worker "{self.name}" exception during callback {self.callback.__name__}: {str(e)}\n{"".join(traceback.format_exception(type(e), value = e, tb = e.__traceback__))}')
 		finally:
-			self.executing = False
 			if not result or (self.maxCount and self.numberOfRuns >= self.maxCount):
 				# False returned, or the numberOfRuns has reached the maxCount
+				self.executing = False
 				self.stop()
 				# Not queued anymore after this run, but the Timer is restarted in stop()
 			else:
-				now = _utcTime()
-				while True:
-					if self.runOnTime:									# compensate for processing time?
-						self.nextRunTime += self.interval				# timestamp for next interval (fixed interval)
-					else:
-						self.nextRunTime =  now + self.interval			# timestamp for next interval (interval + time from end of processing)
-					if now < self.nextRunTime or self.runPastEvents:	# check whether to increment nextRunTime again (and again...)
-						break
-
-				BackgroundWorkerPool._queueWorker(self.nextRunTime, self)		# execute at nextRunTime
+				with self.lockSchedule:
+					self.executing = False
+					now = _utcTime()
+					while True:
+						if self.runOnTime:									# compensate for processing time?
+							self.nextRunTime += self.interval				# timestamp for next interval (fixed interval)
+						else:
+							self.nextRunTime =  now + self.interval			# timestamp for next interval (interval + time from end of processing)
+						if now < self.nextRunTime or self.runPastEvents:	# check whether to increment nextRunTime again (and again...)
+							break
+					if self.earlierRunTime is not None:					# An earlier run was requested meanwhile
+						self.nextRunTime = min(self.nextRunTime, self.earlierRunTime)
+						self.earlierRunTime = None
+
+					if self.running:
+						BackgroundWorkerPool._queueWorker(self.nextRunTime, self)		# execute at nextRunTime
 
 
 	def _postCall(self) -> None:
@@ -67,6 +67,31 @@ class Event(list):	# type:ignore[type-arg]
 			_runner(*args, **kwargs)
 
 
+	def callBulk(self, arguments:list[Any]) -> None:
+		"""	Raise the event once for each of the elements in `arguments`, which is passed
+			as the single argument to the callbacks. If the event was created with
+			`runInBackground` as True, then all callbacks for all arguments are called
+			sequentially in a single thread.
+
+			Args:
+				arguments: List of arguments. Each is passed to a separate event call.
+		"""
+
+		def _runner(arguments:list[Any]) -> None:
+			"""	Call all registered function for each of the arguments.
+			"""
+			for argument in arguments:
+				for function in self:
+					function(argument)
+
+		if not self.manager._running or not arguments:
+			return
+		if self.runInBackground:
+			BackgroundWorkerPool.runJob(lambda arguments = arguments: _runner(arguments))
+		else:
+			_runner(arguments)
+
+
 	def __repr__(self) -> str:
 		return f'Event({list.__repr__(self)})' 
 
@@ -172,3 +172,45 @@ def simpleMatch(st:str, pattern:str, star:str='*') -> bool:
 		return stIndex == stLen-1
 	
 	return _simpleMatch(st, pattern)
+
+
+def compileSimpleMatch(pattern:str, star:str='*') -> re.Pattern:
+	"""	Compile a pattern for `simpleMatch()` to a regular expression. The returned
+		expression's *fullmatch()* method gives the same result as `simpleMatch()`,
+		but the pattern doesn't need to be interpreted again for every test.
+
+		Parameter:
+			- pattern : the pattern string
+			- star : optionally specify a different character as the star character
+		Return:
+			Compiled regular expression.
+	"""
+	result = []
+	i = 0
+	while i < len(pattern):
+		p = pattern[i]
+		if p == '?':
+			result.append('.')
+		elif p == star:
+			result.append('.*')
+		elif p == '+':
+			result.append('.+')
+		else:
+			if p == '\\' and i + 1 < len(pattern):	# Literal match with the following character
+				i += 1
+				p = pattern[i]
+			result.append(re.escape(p))
+		i += 1
+	return re.compile(''.join(result), re.DOTALL)
+
+
+def isSimpleMatchPattern(pattern:str, star:str='*') -> bool:
+	"""	Test whether a string contains any of the `simpleMatch()` expression operators.
+
+		Parameter:
+			- pattern : the pattern string
+			- star : optionally specify a different character as the star character
+		Return:
+			True if *pattern* is not matched literally.
+	"""
+	return '?' in pattern or star in pattern or '+' in pattern or '\\' in pattern
@@ -7,8 +7,10 @@
 """ AccessControlPolicy (ACP) resource type """
 
 from __future__ import annotations
-from typing import List
-from ..helpers.TextTools import simpleMatch
+import re
+from typing import List, Tuple, FrozenSet
+from dataclasses import dataclass
+from ..helpers.TextTools import compileSimpleMatch, isSimpleMatchPattern
 from ..etc import Utils as Utils
 from ..etc.Types import AttributePolicyDict, ResourceTypes as T, Result, Permission, JSON
 from ..services import CSE as CSE
@@ -17,9 +19,76 @@ from ..resources.Resource import *
 from ..resources.AnnounceableResource import AnnounceableResource
 
 
+@dataclass
+class AccessControlRule:
+	"""	Pre-compiled *accessControlRule* of an <ACP> resource. """
+	acop:int
+	""" The permissions as a bit-field. """
+	allOriginators:bool
+	""" True if the rule contains the 'all' originator. """
+	originators:FrozenSet[str]
+	""" Originators that are matched literally. """
+	patterns:List[re.Pattern]
+	""" Compiled wildcard originators. """
+	acod:List[Tuple[FrozenSet[int], FrozenSet[int]]] = None
+	""" (chty, ty) sets for each *accessControlObjectDetails*, or None. """
+
+
+	def matchOriginator(self, originator:str) -> bool:
+		"""	Check whether an *originator* is matched by the rule.
+
+			Args:
+				originator: The originator to test.
+			Return:
+				True if the originator is matched.
+		"""
+		return (self.allOriginators or 
+				originator in self.originators or 
+				(originator is not None and any(p.fullmatch(originator) for p in self.patterns)))
+
+
+def compileAccessControlRules(acrs:list[JSON]) -> list[AccessControlRule]:
+	"""	Compile a list of *accessControlRules* into `AccessControlRule` objects.
+
+		Args:
+			acrs: List of *accessControlRules*.
+		Return:
+			List of `AccessControlRule`.
+	"""
+	rules = []
+	for acr in (acrs or []):
+
+		# Literal and wildcard originators
+		originators = set()
+		patterns = []
+		for a in (acr.get('acor') or []):
+			if isSimpleMatchPattern(a):
+				patterns.append(compileSimpleMatch(a))
+			else:
+				originators.add(a)
+
+		# Resource type sets of the accessControlObjectDetails
+		acodSets = None
+		if acod := acr.get('acod'):
+			if isinstance(acod, dict):	# a single acod may be given as a dict
+				acod = [ acod ]
+			acodSets = [ (frozenset(each.get('chty') or []), frozenset(each.get('ty') or [])) 
+						 for each in acod 
+						 if isinstance(each, dict) ]
+
+		rules.append(AccessControlRule(acop = acr.get('acop') or 0,
+									   allOriginators = 'all' in originators,
+									   originators = frozenset(originators),
+									   patterns = patterns,
+									   acod = acodSets))
+	return rules
+
+
 class ACP(AnnounceableResource):
 	""" AccessControlPolicy (ACP) resource type """
 
+	__slots__ = ('_rules', '_selfRules')
+
 	_allowedChildResourceTypes:list[T] = [ T.SUB ] # TODO Transaction to be added
 	""" The allowed child-resource types. """
 
@@ -53,6 +122,7 @@ class ACP(AnnounceableResource):
 
 		self.setAttribute('pv/acr', [], overwrite = False)
 		self.setAttribute('pvs/acr', [], overwrite = False)
+		self._compileRules()
 
 
 	def validate(self, originator:str = None, create:bool = False, dct:JSON = None, parentResource:Resource = None) -> Result:
@@ -99,6 +169,13 @@ class ACP(AnnounceableResource):
 				r.dbUpdate()
 
 
+	def update(self, dct:JSON = None, originator:str = None) -> Result:
+		# Inherited
+		res = super().update(dct, originator)
+		self._compileRules()
+		return res
+
+
 	def validateAnnouncedDict(self, dct:JSON) -> JSON:
 		# Inherited
 		if acr := Utils.findXPath(dct, f'{T.ACPAnnc.tpe()}/pvs/acr'):
@@ -123,6 +200,7 @@ class ACP(AnnounceableResource):
 		o = list(set(originators))	# Remove duplicates from list of originators
 		if p := self['pv/acr']:
 			p.append({'acop' : permission, 'acor': o})
+		self._compileRules()
 
 
 	def removePermissionForOriginator(self, originator:str) -> None:
@@ -135,6 +213,7 @@ class ACP(AnnounceableResource):
 			for acr in p:
 				if originator in acr['acor']:
 					p.remove(acr)
+		self._compileRules()
 					
 
 	def addSelfPermission(self, originators:List[str], permission:Permission) -> None:
@@ -146,6 +225,7 @@ class ACP(AnnounceableResource):
 		"""
 		if p := self['pvs/acr']:
 			p.append({'acop' : permission, 'acor': list(set(originators))}) 	# list(set()) : Remove duplicates from list of originators
+		self._compileRules()
 
 
 	def checkPermission(self, originator:str, requestedPermission:Permission, ty:T) -> bool:
@@ -159,32 +239,22 @@ class ACP(AnnounceableResource):
 				If any of the configured *accessControlRules* of the ACP resource matches, then the originatorhas access, and *True* is returned, or *False* otherwise.
 		"""
 		# L.isDebug and L.logDebug(f'originator: {originator} requestedPermission: {requestedPermission}')
-		for acr in self['pv/acr']:
-			# L.isDebug and L.logDebug(f'p.acor: {p['acor']} requestedPermission: {p['acop']}')
+		for rule in self._rules:
 
 			# Check Permission-to-check first
-			if requestedPermission & acr['acop'] == Permission.NONE:	# permission not fitting at all
+			if requestedPermission & rule.acop == Permission.NONE:	# permission not fitting at all
 				continue
 
-			# Check acod : chty
-			if acod := acr.get('acod'):
-				for eachAcod in acod:
-					if requestedPermission == Permission.CREATE:
-						if ty is None or ty not in eachAcod.get('chty'):	# ty is an int
-							continue										# for CREATE: type not in chty
-					else:
-						if ty not in eachAcod.get('ty'):
-							continue								# any other Permission type: ty not in chty
-					break # found one
-				else:
+			# Check acod : chty for CREATE, ty for any other permission
+			if rule.acod is not None:
+				index = 0 if requestedPermission == Permission.CREATE else 1
+				if not any(ty in each[index] for each in rule.acod):	# ty is an int
 					continue	# NOT found, so continue the overall search
 
 				# TODO support acod/specialization
 
 			# Check originator
-			if 'all' in acr['acor'] or originator in acr['acor'] or requestedPermission == Permission.NOTIFY:
-				return True
-			if any([ simpleMatch(originator, a) for a in acr['acor'] ]):	# check whether there is a wildcard match
+			if requestedPermission == Permission.NOTIFY or rule.matchOriginator(originator):
 				return True
 		return False
 
@@ -200,13 +270,18 @@ class ACP(AnnounceableResource):
 		"""
 		# NOTE The same function also exists in ACPAnnc.py
 
-		for p in self['pvs/acr']:
-			if requestedPermission & p['acop'] == 0:	# permission not fitting at all
+		for rule in self._selfRules:
+			if requestedPermission & rule.acop == 0:	# permission not fitting at all
 				continue
 			# TODO check acod in pvs
-			if 'all' in p['acor'] or originator in p['acor']:
-				return True
-			if any([ simpleMatch(originator, a) for a in p['acor'] ]):	# check whether there is a wildcard match
+			if rule.matchOriginator(originator):
 				return True
 		return False
 
+
+	def _compileRules(self) -> None:
+		"""	Compile the *accessControlRules* of the *privileges* and *selfPrivileges* attributes 
+			for the permission checks. This must be called whenever these attributes change.
+		"""
+		self._rules = compileAccessControlRules(self.attribute('pv/acr'))
+		self._selfRules = compileAccessControlRules(self.attribute('pvs/acr'))
@@ -16,6 +16,8 @@ from ..resources.Resource import *
 class ACPAnnc(AnnouncedResource):
 	""" AccessControlPolicy announced (ACPA) resource type """
 
+	__slots__ = ()
+
 	_allowedChildResourceTypes:list[T] = [ T.SUB ]
 	""" The allowed child-resource types. """
 
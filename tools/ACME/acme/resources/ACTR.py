@@ -19,6 +19,8 @@ from ..resources import Factory as Factory
 
 class ACTR(AnnounceableResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes:list[T] = [ T.SUB ] # TODO Dependecy
 	""" The allowed child-resource types. """
@@ -18,6 +18,8 @@ from ..resources.AnnounceableResource import AnnounceableResource
 class AE(AnnounceableResource):
 	""" Application Entity (AE) resource type """
 
+	__slots__ = ()
+
 	_allowedChildResourceTypes:list[T] = [ T.ACP, T.ACTR, T.CNT, T.FCNT, T.GRP, T.PCH, T.SUB, T.TS, T.TSB ]
 	""" The allowed child-resource types. """
 
@@ -15,6 +15,8 @@ from ..resources.Resource import *
 class AEAnnc(AnnouncedResource):
 	""" Application Entity announced (AEA) resource type """
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes:list[T] = [ T.ACP, T.ACPAnnc, T.ACTR, T.ACTRAnnc, T.CNT, T.CNTAnnc, T.FCNT, T.FCNTAnnc, T.GRP, T.GRPAnnc, T.TS, T.TSAnnc ]
 
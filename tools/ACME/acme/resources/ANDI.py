@@ -14,6 +14,8 @@ defaultDeviceID = ''
 
 class ANDI(MgmtObj):
 
+	__slots__ = ()
+
 	# Attributes and Attribute policies for this Resource Class
 	# Assigned during startup in the Importer
 	_attributes:AttributePolicyDict = {		
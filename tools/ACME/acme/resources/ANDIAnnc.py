@@ -14,6 +14,8 @@ from ..resources.MgmtObjAnnc import *
 
 class ANDIAnnc(MgmtObjAnnc):
 
+	__slots__ = ()
+
 	# Attributes and Attribute policies for this Resource Class
 	# Assigned during startup in the Importer
 	_attributes:AttributePolicyDict = {		
@@ -14,6 +14,8 @@ defaultAreaNwkType = ''
 
 
 class ANI(MgmtObj):
+
+	__slots__ = ()
 	
 	# Attributes and Attribute policies for this Resource Class
 	# Assigned during startup in the Importer
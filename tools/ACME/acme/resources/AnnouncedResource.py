@@ -13,6 +13,8 @@ from ..resources.Resource import *
 
 class AnnouncedResource(Resource):
 
+	__slots__ = ()
+
 	def __init__(self, ty:T, dct:JSON, pi:str = None, tpe:str = None, inheritACP:bool = False, create:bool = False,) -> None:
 		super().__init__(ty, dct, pi, tpe = tpe, inheritACP = inheritACP, create = create)
 
@@ -25,6 +25,8 @@ defaultBatteryStatus = btsUNKNOWN
 
 class BAT(MgmtObj):
 
+	__slots__ = ()
+
 	# Attributes and Attribute policies for this Resource Class
 	# Assigned during startup in the Importer
 	_attributes:AttributePolicyDict = {		
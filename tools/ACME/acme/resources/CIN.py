@@ -14,6 +14,8 @@ from ..resources.AnnounceableResource import AnnounceableResource
 
 class CIN(AnnounceableResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes:list[T] = [ ]
 
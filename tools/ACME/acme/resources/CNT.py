@@ -8,7 +8,6 @@
 #
 
 from __future__ import annotations
-from typing import List
 from ..etc.Types import AttributePolicyDict, ResourceTypes as T, Result, ResponseStatusCode as RC, JSON
 from ..etc import Utils, DateUtils
 from ..services import CSE as CSE
@@ -21,6 +20,8 @@ from ..resources import Factory
 
 class CNT(AnnounceableResource):
 
+	__slots__ = ( '__validating', )
+
 	_allowedChildResourceTypes =  [ T.ACTR, T.CNT, T.CIN, T.FCNT, T.SUB, T.TS ]
 
 	# Attributes and Attribute policies for this Resource Class
@@ -162,7 +163,6 @@ class CNT(AnnounceableResource):
 
 
 	# TODO Align this and FCNT implementations
-	# TODO use raw for TS and TCNT
 	
 	def _validateChildren(self) -> None:
 		""" Internal validation and checks. This called more often then just from
@@ -173,39 +173,22 @@ class CNT(AnnounceableResource):
 			return
 		self.__validating = True
 
-		# Only get the CINs in raw format. Instantiate them as resources if needed
-		cinsRaw = cast(List[JSON], sorted(CSE.storage.directChildResources(self.ri, T.CIN, raw = True), key = lambda x: x['ct']))
-		cni = len(cinsRaw)			
+		# Number and size of the <cin> are maintained by the storage's instance index
+		cni, cbs = CSE.storage.instanceStatistics(self.ri, T.CIN)
 			
 		# Check number of instances
 		if (mni := self.mni) is not None:
 			while cni > mni and cni > 0:
-				# Only instantiate the <cin> when needed here for deletion
-				cin = Factory.resourceFromDict(cinsRaw[0]).resource
-				L.isDebug and L.logDebug(f'cni > mni: Removing <cin>: {cin.ri}')
-				# remove oldest
-				# Deleting a child must not cause a notification for 'deleteDirectChild'.
-				# Don't do a delete check means that CNT.childRemoved() is not called, where subscriptions for 'deleteDirectChild'  is tested.
-				CSE.dispatcher.deleteResource(cin, parentResource = self, doDeleteCheck = False)
-				del cinsRaw[0]	# Remove from list
-				cni -= 1	# decrement cni when deleting a <cin>
-
-		# Calculate cbs of remaining cins
-		cbs = sum([ each['cs'] for each in cinsRaw])
+				if not CSE.dispatcher.removeOldestInstance(self, T.CIN, 'cni > mni'):
+					break
+				cni, cbs = CSE.storage.instanceStatistics(self.ri, T.CIN)
 
 		# check size
 		if (mbs := self.mbs) is not None:
 			while cbs > mbs and cbs > 0:
-				# Only instantiate the <cin> when needed here for deletion
-				cin = Factory.resourceFromDict(cinsRaw[0]).resource
-				L.isDebug and L.logDebug(f'cbs > mbs: Removing <cin>: {cin.ri}')
-				# remove oldest
-				cbs -= cin.cs
-				# Deleting a child must not cause a notification for 'deleteDirectChild'.
-				# Don't do a delete check means that CNT.childRemoved() is not called, where subscriptions for 'deleteDirectChild'  is tested.
-				CSE.dispatcher.deleteResource(cin, parentResource = self, doDeleteCheck = False)
-				del cinsRaw[0]	# Remove from list
-				cni -= 1	# decrement cni when deleting a <cin>
+				if not CSE.dispatcher.removeOldestInstance(self, T.CIN, 'cbs > mbs'):
+					break
+				cni, cbs = CSE.storage.instanceStatistics(self.ri, T.CIN)
 
 		# Some attributes may have been updated, so store the resource 
 		self['cni'] = cni
@@ -214,4 +197,3 @@ class CNT(AnnounceableResource):
 	
 		# End validating
 		self.__validating = False
-
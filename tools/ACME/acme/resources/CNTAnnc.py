@@ -14,6 +14,8 @@ from ..resources.AnnouncedResource import AnnouncedResource
 
 class CNTAnnc(AnnouncedResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.ACTR, T.ACTRAnnc, T.CNT, T.CNTAnnc, T.CIN, T.CINAnnc, T.FCNT, T.FCNTAnnc, T.SUB, T.TS, T.TSAnnc ]
 
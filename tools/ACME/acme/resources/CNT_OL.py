@@ -17,6 +17,8 @@ from ..services.Logging import Logging as L
 
 class CNT_OL(Resource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes:list[T] = [ ]
 
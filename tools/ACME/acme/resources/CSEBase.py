@@ -20,6 +20,8 @@ from ..services.Logging import Logging as L
 
 class CSEBase(AnnounceableResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.ACP, T.ACTR, T.AE, T.CSR, T.CNT, T.FCNT, T.GRP, T.NOD, T.REQ, T.SUB, T.TS, T.TSB, T.CSEBaseAnnc ]
 
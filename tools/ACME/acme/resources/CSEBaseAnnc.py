@@ -14,6 +14,8 @@ from ..resources.AnnouncedResource import AnnouncedResource
 
 class CSEBaseAnnc(AnnouncedResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [	T.ACPAnnc, T.ACTRAnnc, T.AEAnnc, T.CNTAnnc, T.FCNTAnnc, T.GRPAnnc,
 									T.NODAnnc, T.SUB, T.TSAnnc, T.TSBAnnc ]
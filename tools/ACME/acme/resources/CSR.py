@@ -14,6 +14,8 @@ from ..resources.AnnounceableResource import AnnounceableResource
 
 class CSR(AnnounceableResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [	T.ACP, T.ACPAnnc, T.ACTR, T.ACTRAnnc, T.AEAnnc, T.CNT, T.CNTAnnc, 
 									T.CINAnnc, T.CSRAnnc, T.FCNT, T.FCNTAnnc, T.FCI, T.GRP, T.GRPAnnc, 
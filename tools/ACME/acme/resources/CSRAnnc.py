@@ -15,6 +15,8 @@ from ..resources.Resource import *
 
 class CSRAnnc(AnnouncedResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [	T.ACTR, T.ACTRAnnc,  T.CNT, T.CNTAnnc, T.CINAnnc, T.FCNT, T.FCNTAnnc, T.GRP, T.GRPAnnc, T.ACP, T.ACPAnnc,
 									T.SUB, T.TS, T.TSAnnc, T.CSRAnnc, T.MGMTOBJAnnc, T.NODAnnc, T.AEAnnc, T.TSB, T.TSBAnnc ]
@@ -18,6 +18,8 @@ defaultDeviceLabel = "unknown serial id"
 
 class DVI(MgmtObj):
 
+	__slots__ = ()
+
 	# Attributes and Attribute policies for this Resource Class
 	# Assigned during startup in the Importer
 	_attributes:AttributePolicyDict = {		
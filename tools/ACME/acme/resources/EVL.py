@@ -28,6 +28,8 @@ defaultLogStatus = lgstUnknown
 
 class EVL(MgmtObj):
 
+	__slots__ = ()
+
 	# Attributes and Attribute policies for this Resource Class
 	# Assigned during startup in the Importer
 	_attributes:AttributePolicyDict = {		
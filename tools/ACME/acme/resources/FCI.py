@@ -14,6 +14,8 @@ from ..resources.Resource import *
 
 class FCI(Resource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes:list[T] = [ ]
 
@@ -21,6 +21,8 @@ from ..resources.AnnounceableResource import AnnounceableResource
 
 class FCNT(AnnounceableResource):
 
+	__slots__ = ( '__validating', '_hasInstances', 'ignoreAttributes' )
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.ACTR, T.CNT, T.FCNT, T.SUB, T.TS, T.FCI ]
 
@@ -186,37 +188,22 @@ class FCNT(AnnounceableResource):
 			if not deletingFCI and (_updateCustomAttributes or dct is None or not self[self._hasFCI]):
 				self.addFlexContainerInstance(originator)
 			
-			fcis = self.flexContainerInstances()
-			cni = len(fcis)	# number of instances
+			# Number and size of the <fci> are maintained by the storage's instance index
+			cni, cbs = CSE.storage.instanceStatistics(self.ri, T.FCI)
 
 			# check mni
 			if (mni := self.mni) is not None:	# is an int
-				mni = self.mni
 				while cni > mni and cni > 0:
-					L.isDebug and L.logDebug(f'cni > mni: Removing <fci>: {fcis[0].ri}')
-					# remove oldest
-					# Deleting a child must not cause a notification for 'deleteDirectChild'.
-					# Don't do a delete check means that FCNT.childRemoved() is not called, where subscriptions for 'deleteDirectChild'  is tested.
-					CSE.dispatcher.deleteResource(fcis[0], parentResource = self, doDeleteCheck = False)
-					del fcis[0]	# Remove from list
-					cni -= 1	# decrement cni when deleting a <fci>
-
-			# Calculate cbs
-			cbs = sum([ each.cs for each in fcis])
+					if not CSE.dispatcher.removeOldestInstance(self, T.FCI, 'cni > mni'):
+						break
+					cni, cbs = CSE.storage.instanceStatistics(self.ri, T.FCI)
 
 			# check size
 			if (mbs := self.mbs) is not None:
 				while cbs > mbs and cbs > 0:
-					L.isDebug and L.logDebug(f'cbs > mbs: Removing <fci>: {fcis[0].ri}')
-					# remove oldest
-					cbs -= fcis[0].cs			
-					# Deleting a child must not cause a notification for 'deleteDirectChild'.
-					# Don't do a delete check means that FCNT.childRemoved() is not called, where subscriptions for 'deleteDirectChild'  is tested.
-					CSE.dispatcher.deleteResource(fcis[0], parentResource = self, doDeleteCheck = False)
-					cni -= 1	# again, decrement cbi when deleting a cni
-
-				# Add "current" atribute, if it is not there
-				self.setAttribute('cbs', 0, overwrite = False)
+					if not CSE.dispatcher.removeOldestInstance(self, T.FCI, 'cbs > mbs'):
+						break
+					cni, cbs = CSE.storage.instanceStatistics(self.ri, T.FCI)
 			
 			self['cni'] = cni
 			self['cbs'] = cbs
@@ -256,8 +243,8 @@ class FCNT(AnnounceableResource):
 				dct['at'] = [ x for x in self['at'] if x.count('/') == 1 ]	# Only copy single csi in at
 
 		resource = Factory.resourceFromDict(resDict={ self.tpe : dct }, pi=self.ri, ty=T.FCI).resource
+		resource['cs'] = self.cs	# before creation, so that it is counted for the parent's cbs
 		CSE.dispatcher.createResource(resource, originator=originator)
-		resource['cs'] = self.cs
 
 		# Check for mia handling
 		if self.mia is not None:	# mia is an int
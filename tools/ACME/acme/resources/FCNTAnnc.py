@@ -14,6 +14,8 @@ from ..resources.Resource import *
 class FCNTAnnc(AnnouncedResource):
 	""" FlexContainerAnnounced resource class """
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [	T.ACTR, T.ACTRAnnc, T.CNT, T.CNTAnnc, T.CIN, T.CINAnnc, 
 									T.FCNT, T.FCNTAnnc, T.FCI, T.TS, T.TSAnnc, T.SUB ]
@@ -16,6 +16,8 @@ from ..resources.Resource import *
 
 class FCNT_LA(Resource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes:list[T] = [ ]
 
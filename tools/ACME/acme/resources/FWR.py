@@ -24,6 +24,8 @@ defaultUDS = { 'acn' : '', 'sus' : statusUninitialized }
 
 class FWR(MgmtObj):
 
+	__slots__ = ()
+
 	# Attributes and Attribute policies for this Resource Class
 	# Assigned during startup in the Importer
 	_attributes:AttributePolicyDict = {		
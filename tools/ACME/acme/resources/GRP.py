@@ -17,6 +17,8 @@ from ..resources.AnnounceableResource import AnnounceableResource
 
 class GRP(AnnounceableResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.ACTR, T.SUB, T.GRP_FOPT ]
 
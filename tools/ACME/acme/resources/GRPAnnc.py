@@ -15,6 +15,8 @@ from ..resources.Resource import *
 
 class GRPAnnc(AnnouncedResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.ACTR, T.ACTRAnnc, T.SUB ]
 
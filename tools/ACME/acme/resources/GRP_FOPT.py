@@ -21,6 +21,8 @@ from ..resources.Resource import *
 
 class GRP_FOPT(Resource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes:list[T] = [ ]
 
@@ -17,6 +17,8 @@ defaultMemTotal = 0
 
 class MEM(MgmtObj):
 
+	__slots__ = ()
+
 	# Attributes and Attribute policies for this Resource Class
 	# Assigned during startup in the Importer
 	_attributes:AttributePolicyDict = {		
@@ -15,6 +15,8 @@ from ..resources.AnnounceableResource import AnnounceableResource
 
 class MgmtObj(AnnounceableResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.SUB ]
 
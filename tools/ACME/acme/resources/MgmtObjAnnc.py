@@ -15,6 +15,8 @@ from ..resources.Resource import *
 
 class MgmtObjAnnc(AnnouncedResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.SUB ]
 
@@ -21,6 +21,8 @@ from ..resources.AnnounceableResource import AnnounceableResource
 
 class NOD(AnnounceableResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.ACTR, T.MGMTOBJ, T.SUB ]
 
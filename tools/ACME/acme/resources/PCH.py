@@ -22,6 +22,8 @@ from ..services.Logging import Logging as L
 
 class PCH(Resource):
 
+	__slots__ = ()
+
 	_parentOriginator = '__parentOriginator__'
 	_pcuRI = '__pcuRI__'
 
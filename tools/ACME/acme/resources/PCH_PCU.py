@@ -18,6 +18,8 @@ from ..etc import DateUtils, Utils
 
 class PCH_PCU(Resource):
 
+	__slots__ = ()
+
 	_aggregate = '__aggregate__'
 
 	# Specify the allowed child-resource types
@@ -15,6 +15,8 @@ from ..etc import Utils as Utils
 
 class RBO(MgmtObj):
 
+	__slots__ = ()
+
 	# Attributes and Attribute policies for this Resource Class
 	# Assigned during startup in the Importer
 	_attributes:AttributePolicyDict = {		
@@ -13,6 +13,8 @@ from ..resources.MgmtObjAnnc import *
 
 class RBOAnnc(MgmtObjAnnc):
 
+	__slots__ = ()
+
 	# Attributes and Attribute policies for this Resource Class
 	# Assigned during startup in the Importer
 	_attributes:AttributePolicyDict = {		
@@ -17,6 +17,8 @@ from ..resources import Factory as Factory
 
 class REQ(Resource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.SUB ]
 
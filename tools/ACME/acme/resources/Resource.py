@@ -11,6 +11,8 @@
 from __future__ import annotations
 from typing import Any, List, Tuple, cast
 from copy import deepcopy
+from types import MemberDescriptorType
+from collections.abc import ItemsView, ValuesView
 
 from ..etc.Constants import Constants as C
 from ..etc.Types import ResourceTypes as T, Result, NotificationEventType, ResponseStatusCode as RC, CSERequest, JSON
@@ -26,11 +28,172 @@ from .Resource import *
 # TODO _remodeID - is anybody using that one??
 
 
+class ResourceAttributes(dict):
+	"""	Copy-on-write dictionary for the attributes of a resource.
+
+		The dictionary is initialized with a shallow copy of a resource document, and the attribute
+		values are shared with that document. The document itself is never changed. A mutable value 
+		(list or dict) is only copied when its attribute is accessed for the first time, because it 
+		might be changed in place by the caller. Immutable values are never copied.
+
+		The attribute values are also copied when they are accessed through *items()* and *values()*.
+		Only the functions that read the dictionary directly in C (e.g. *dict()*, *dict.update()*, the
+		*|* operator, or *json.dumps()*) return the shared values. They must not be changed in place.
+	"""
+
+	__slots__ = ( 'owned', )
+
+	_immutableTypes = (str, int, float, bool, type(None))
+	"""	Attribute value types that are never copied. """
+
+	def __init__(self, dct:JSON = None) -> None:
+		"""	Initialization of the attribute dictionary.
+
+			Args:
+				dct: Optional resource document. Its values are shared until they are accessed.
+		"""
+		super().__init__(dct or {})
+		self.owned:set[str] = set()
+		"""	Attributes whose values are not shared anymore. """
+
+
+	def __getitem__(self, key:str) -> Any:
+		value = dict.__getitem__(self, key)
+		if key not in self.owned and not isinstance(value, self._immutableTypes):
+			value = deepcopy(value)
+			dict.__setitem__(self, key, value)
+			self.owned.add(key)
+		return value
+
+
+	def __setitem__(self, key:str, value:Any) -> None:
+		dict.__setitem__(self, key, value)
+		self.owned.add(key)
+
+
+	def __delitem__(self, key:str) -> None:
+		dict.__delitem__(self, key)
+		self.owned.discard(key)
+
+
+	def __copy__(self) -> ResourceAttributes:
+		return self.copy()
+
+
+	def __deepcopy__(self, memo:dict) -> ResourceAttributes:
+		return ResourceAttributes(deepcopy(dict(self), memo))
+
+
+	def get(self, key:str, default:Any = None) -> Any:	# type:ignore[override]
+		return self[key] if key in self else default
+
+
+	def items(self) -> ItemsView[str, Any]:	# type:ignore[override]
+		return ItemsView(self)	# iterates through __getitem__()
+
+
+	def values(self) -> ValuesView[Any]:	# type:ignore[override]
+		return ValuesView(self)	# iterates through __getitem__()
+
+
+	def setdefault(self, key:str, default:Any = None) -> Any:
+		if key not in self:
+			self[key] = default
+		return self[key]
+
+
+	def pop(self, key:str, *default:Any) -> Any:	# type:ignore[override]
+		self.owned.discard(key)
+		return dict.pop(self, key, *default)
+
+
+	def popitem(self) -> Tuple[str, Any]:
+		key, value = dict.popitem(self)
+		if key not in self.owned and not isinstance(value, self._immutableTypes):
+			value = deepcopy(value)
+		self.owned.discard(key)
+		return key, value
+
+
+	def update(self, *args:Any, **kwargs:Any) -> None:	# type:ignore[override]
+		for key, value in dict(*args, **kwargs).items():
+			self[key] = value
+
+
+	def clear(self) -> None:
+		dict.clear(self)
+		self.owned.clear()
+
+
+	def copy(self) -> ResourceAttributes:
+		"""	Return a copy of the attribute dictionary. The copy shares the attribute values that
+			are still shared by this dictionary, and gets its own copies of the values that this
+			dictionary owns. It doesn't own any value itself, so that it can be copied again without
+			copying any value. This dictionary keeps the ownership of its values.
+
+			Return:
+				A new ResourceAttributes dictionary.
+		"""
+		return ResourceAttributes(self._sharableValues())
+
+
+	def snapshot(self) -> JSON:
+		"""	Return a read-only snapshot of the attributes, e.g. to compare them later with the
+			updated attributes. The snapshot is not affected by later changes to this dictionary. 
+
+			Return:
+				A dictionary that shares the attribute values. It must not be changed.
+		"""
+		return self._sharableValues()
+
+
+	def _sharableValues(self) -> JSON:
+		"""	Return a shallow copy of the attributes in which the mutable values that are owned by this
+			dictionary are replaced by copies. The values are therefore not affected by later changes
+			to this dictionary.
+
+			Return:
+				A dictionary with the attribute values.
+		"""
+		if not self.owned:
+			return dict(self)
+		return { key:(deepcopy(value) if key in self.owned and not isinstance(value, self._immutableTypes) else value)
+				 for key, value in dict.items(self) }
+
+
+	def removeNoneValues(self, allowedNull:list[str] = []) -> None:
+		"""	Recursively remove the None values, but ignore the attributes in the *allowedNull* list.
+			This is the in-place version of `etc.Utils.removeNoneValuesFromDict()`.
+
+			Args:
+				allowedNull: List of attribute names that may have a None value.
+		"""
+		for key, value in list(dict.items(self)):
+			if value is None:
+				if key not in allowedNull:
+					del self[key]
+			elif isinstance(value, dict) and (cleaned := Utils.removeNoneValuesFromDict(value)) != value:
+				dict.__setitem__(self, key, cleaned)	# nested values are still shared
+
+
+
+
+def _slotDescriptors(cls:type) -> list[MemberDescriptorType]:
+	"""	Return the descriptors of all slots of a class and its base classes.
+	"""
+	if (descriptors := _slotDescriptorsCache.get(cls)) is None:
+		descriptors = [ d for c in cls.__mro__ for d in c.__dict__.values() if isinstance(d, MemberDescriptorType) ]
+		_slotDescriptorsCache[cls] = descriptors
+	return descriptors
+
+_slotDescriptorsCache:dict[type, list[MemberDescriptorType]] = {}
 
 
 class Resource(object):
 	""" Base class for all oneM2M resource types """
 
+	__slots__ = ( 'tpe', 'readOnly', 'inheritACP', 'dict', 'isImported', '_originalDict' )
+
 	# Contstants for internal attributes
 	_rtype 				= '__rtype__'
 	_srn				= '__srn__'
@@ -79,7 +242,7 @@ class Resource(object):
 		"""	Flag set during creation of a resource instance whether a resource type allows only read-only access to a resource. """
 		self.inheritACP	= inheritACP
 		"""	Flag set during creation of a resource instance whether a resource type inherits the `resources.ACP.ACP` from its parent resource. """
-		self.dict 		= {}
+		self.dict 		= ResourceAttributes()
 		"""	Dictionary for public and internal resource attributes. """
 		self.isImported	= False
 		"""	Flag set during creation of a resource instance whether a resource is imported, which disables some validation checks. """
@@ -92,10 +255,8 @@ class Resource(object):
 
 		if dct is not None: 
 			self.isImported = dct.get(self._imported)	# might be None, or boolean
-			self.dict = deepcopy(dct.get(self.tpe))
-			if not self.dict:
-				self.dict = deepcopy(dct)
-			self._originalDict = deepcopy(dct)	# keep for validation in activate() later
+			self.dict = ResourceAttributes(dct.get(self.tpe) or dct)	# values are copied on access
+			self._originalDict = dct	# keep for validation in activate() later. Never changed
 		else:
 			# no Dict, so the resource is instantiated programmatically
 			self.setAttribute(self._isInstantiated, True)
@@ -140,7 +301,7 @@ class Resource(object):
 
 			# Remove empty / null attributes from dict
 			# But see also the comment in update() !!!
-			self.dict = Utils.removeNoneValuesFromDict(self.dict, ['cr'])	# allow the ct attribute to stay in the dictionary. It will be handled with in the RegistrationManager
+			self.dict.removeNoneValues(['cr'])	# allow the ct attribute to stay in the dictionary. It will be handled with in the RegistrationManager
 
 			self[self._rtype] = self.tpe
 			self.setAttribute(self._announcedTo, [], overwrite = False)
@@ -156,7 +317,7 @@ class Resource(object):
 				noACP: Optional indicator whether the *acpi* attribute shall be included in the result.
 		"""
 		# remove (from a copy) all internal attributes before printing
-		dct = { k:deepcopy(v) for k,v in self.dict.items() 				# Copy k:v to the new dictionary, ...
+		dct = { k:deepcopy(v) for k,v in dict.items(self.dict) 			# Copy k:v to the new dictionary (the values are copied here anyway), ...
 					if k not in self.internalAttributes 				# if k is not in internal attributes (starting with __), AND
 					and not (noACP and k == 'acpi')						# if not noACP is True and k is 'acpi', AND
 					and not (update and k in self._excludeFromUpdate) 	# if not update is True and k is in _excludeFromUpdate)
@@ -228,7 +389,7 @@ class Resource(object):
 		CSE.notification.checkSubscriptions(self, NotificationEventType.resourceDelete)
 		
 		# Remove directChildResources
-		CSE.dispatcher.deleteChildResources(self, originator)
+		CSE.dispatcher.deleteChildResources(self, originator, parentDeleted = True)
 		
 		# Removal of a deleted resource from group(s) is done 
 		# asynchronously in GroupManager, triggered by an event.
@@ -247,7 +408,7 @@ class Resource(object):
 			Return:
 				Result object indicating success or failure.
 		"""
-		dictOrg = deepcopy(self.dict)	# Save for later for notification
+		dictOrg = self.dict.snapshot()	# Save for later for notification
 
 		updatedAttributes = None
 		if dct:
@@ -857,6 +1018,23 @@ class Resource(object):
 		return isinstance(other, Resource) and self.ri == other.ri
 
 
+	def clone(self) -> Resource:
+		"""	Create an independent copy of the resource without instantiating it again from its
+			database document. Changes to the attributes of the copy do not affect this resource.
+
+			Return:
+				A new Resource object of the same type and with the same attributes.
+		"""
+		resource = object.__new__(cls := type(self))	# no __init__()
+		for slot in _slotDescriptors(cls):
+			try:
+				slot.__set__(resource, slot.__get__(self))
+			except AttributeError:	# not set
+				pass
+		resource.dict = self.dict.copy()
+		return resource
+
+
 	def isModifiedAfter(self, otherResource:Resource) -> bool:
 		"""	Test whether this resource has been modified after another resource.
 
@@ -18,6 +18,8 @@ from ..resources.Resource import *
 
 class SUB(Resource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes:list[T] = [ ]
 
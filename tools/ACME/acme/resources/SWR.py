@@ -23,6 +23,8 @@ defaultStatus = { 'acn' : '', 'sus' : statusUninitialized }
 
 class SWR(MgmtObj):
 
+	__slots__ = ()
+
 	# Attributes and Attribute policies for this Resource Class
 	# Assigned during startup in the Importer
 	_attributes:AttributePolicyDict = {		
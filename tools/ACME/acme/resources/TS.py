@@ -23,6 +23,8 @@ from ..resources import Factory as Factory
 
 class TS(AnnounceableResource):
 
+	__slots__ = ( '__validating', )
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.ACTR, T.TSI, T.SUB ]
 
@@ -273,35 +275,22 @@ class TS(AnnounceableResource):
 			return
 		self.__validating = True
 
-		# TODO Optimize: Do we really need the resources?
-		tsis = self.timeSeriesInstances()	# retrieve TIS child resources
-		cni = len(tsis)			
+		# Number and size of the <tsi> are maintained by the storage's instance index
+		cni, cbs = CSE.storage.instanceStatistics(self.ri, T.TSI)
 			
 		# Check number of instances
 		if (mni := self.mni) is not None:	# mni is an int
 			while cni > mni and cni > 0:
-				L.isDebug and L.logDebug(f'cni > mni: Removing <tsi>: {tsis[0].ri}')
-				# remove oldest
-				# Deleting a child must not cause a notification for 'deleteDirectChild'.
-				# Don't do a delete check means that TS.childRemoved() is not called, where subscriptions for 'deleteDirectChild'  is tested.
-				CSE.dispatcher.deleteResource(tsis[0], parentResource = self, doDeleteCheck = False)
-				del tsis[0]
-				cni -= 1	# decrement cni when deleting a <cin>
-
-		# Calculate cbs
-		cbs = sum([ each.cs for each in tsis])
+				if not CSE.dispatcher.removeOldestInstance(self, T.TSI, 'cni > mni'):
+					break
+				cni, cbs = CSE.storage.instanceStatistics(self.ri, T.TSI)
 
 		# check size
 		if (mbs := self.mbs) is not None:
 			while cbs > mbs and cbs > 0:
-				L.isDebug and L.logDebug(f'cbs > mbs: Removing <tsi>: {tsis[0].ri}')
-				# remove oldest
-				cbs -= tsis[0]['cs']
-				# Deleting a child must not cause a notification for 'deleteDirectChild'.
-				# Don't do a delete check means that TS.childRemoved() is not called, where subscriptions for 'deleteDirectChild'  is tested.
-				CSE.dispatcher.deleteResource(tsis[0], parentResource = self, doDeleteCheck = False)
-				del tsis[0]
-				cni -= 1	# decrement cni when deleting a <tsi>
+				if not CSE.dispatcher.removeOldestInstance(self, T.TSI, 'cbs > mbs'):
+					break
+				cni, cbs = CSE.storage.instanceStatistics(self.ri, T.TSI)
 
 		# Some attributes may have been updated, so store the resource 
 		self['cni'] = cni
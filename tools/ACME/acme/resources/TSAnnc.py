@@ -14,6 +14,8 @@ from ..resources.AnnouncedResource import AnnouncedResource
 
 class TSAnnc(AnnouncedResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.ACTR, T.ACTRAnnc, T.SUB, T.TSI, T.TSIAnnc ]
 
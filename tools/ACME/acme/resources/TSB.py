@@ -21,6 +21,8 @@ from ..services.Logging import Logging as L
 
 class TSB(AnnounceableResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes = [ T.SUB ]
 
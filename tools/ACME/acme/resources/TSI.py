@@ -15,6 +15,8 @@ from ..resources.AnnounceableResource import AnnounceableResource
 
 class TSI(AnnounceableResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes:list[T] = [ ]
 
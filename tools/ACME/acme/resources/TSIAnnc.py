@@ -14,6 +14,8 @@ from ..resources.AnnouncedResource import AnnouncedResource
 
 class TSIAnnc(AnnouncedResource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes:list[T] = [ ]
 
@@ -17,6 +17,8 @@ from ..resources.Resource import *
 
 class TS_OL(Resource):
 
+	__slots__ = ()
+
 	# Specify the allowed child-resource types
 	_allowedChildResourceTypes:list[T] = [ ]
 
@@ -16,6 +16,8 @@ from ..resources.Resource import Resource
 
 class Unknown(Resource):
 
+	__slots__ = ()
+
 	def __init__(self, dct:JSON, tpe:str, pi:str = None, create:bool = False) -> None:
 		super().__init__(T.UNKNOWN, dct, pi, tpe = tpe, create = create)
 
@@ -142,6 +142,7 @@ class Configuration(object):
 
 				'cse.security.enableACPChecks'			: config.getboolean('cse.security', 'enableACPChecks',			 	fallback = True),
 				'cse.security.fullAccessAdmin'			: config.getboolean('cse.security', 'fullAccessAdmin',			 	fallback = True),
+				'cse.security.accessDecisionCacheSize'	: config.getint('cse.security', 'accessDecisionCacheSize',		 	fallback = 10000),
 
 				#
 				#	CSE Operation
@@ -151,6 +152,20 @@ class Configuration(object):
 				'cse.operation.jobBalanceLatency'		: config.getint('cse.operation', 'jobBalanceLatency', 				fallback = 1000),
 				'cse.operation.jobBalanceReduceFactor'	: config.getfloat('cse.operation', 'jobBalanceReduceFactor', 		fallback = 2.0),
 
+				#
+				#	CSE Notifications
+				#
+
+				'cse.notification.deliveryWorkers'		: config.getint('cse.notification', 'deliveryWorkers', 			fallback = 4),
+				'cse.notification.deliveryQueueSize'	: config.getint('cse.notification', 'deliveryQueueSize', 			fallback = 1000),
+				'cse.notification.maxParallelTargets'	: config.getint('cse.notification', 'maxParallelTargets', 			fallback = 8),
+				'cse.notification.retryAttempts'		: config.getint('cse.notification', 'retryAttempts', 				fallback = 3),
+				'cse.notification.retryInterval'		: config.getfloat('cse.notification', 'retryInterval', 				fallback = 1.0),
+				'cse.notification.failureThreshold'		: config.getint('cse.notification', 'failureThreshold', 			fallback = 3),
+				'cse.notification.maxRetryInterval'		: config.getfloat('cse.notification', 'maxRetryInterval', 			fallback = 300.0),
+				'cse.notification.deadLetterSize'		: config.getint('cse.notification', 'deadLetterSize', 				fallback = 100),
+				'cse.notification.persistBatchNotifications'	: config.getboolean('cse.notification', 'persistBatchNotifications', fallback = False),
+
 				#
 				#	HTTP Server
 				#
@@ -162,6 +177,8 @@ class Configuration(object):
 				'http.enableStructureEndpoint'			: config.getboolean('server.http', 'enableStructureEndpoint', 		fallback = False),
 				'http.enableUpperTesterEndpoint'		: config.getboolean('server.http', 'enableUpperTesterEndpoint', 	fallback = False),
 				'http.allowPatchForDelete'				: config.getboolean('server.http', 'allowPatchForDelete', 			fallback = False),
+				'http.connectionPoolSize'				: config.getint('server.http', 'connectionPoolSize', 				fallback = 10),
+				'http.connectionIdleTimeout'			: config.getfloat('server.http', 'connectionIdleTimeout', 			fallback = 60.0),
 
 				#
 				#	HTTP Server Security
@@ -200,10 +217,16 @@ class Configuration(object):
 				#	Database
 				#
 
+				'db.backend'							: config.get('database', 'backend', 								fallback = 'tinydb'),
 				'db.path'								: config.get('database', 'path', 									fallback = './data'),
 				'db.inMemory'							: config.getboolean('database', 'inMemory', 						fallback = False),
 				'db.cacheSize'							: config.getint('database', 'cacheSize', 							fallback = 0),		# Default: no caching
+				'db.resourceCacheSize'					: config.getint('database', 'resourceCacheSize', 					fallback = 1000),
+				'db.identifierCacheSize'				: config.getint('database', 'identifierCacheSize', 					fallback = 10000),
 				'db.resetOnStartup' 					: config.getboolean('database', 'resetOnStartup',					fallback = False),
+				'db.journal'							: config.getboolean('database', 'journal',							fallback = False),
+				'db.journalSyncInterval'				: config.getfloat('database', 'journalSyncInterval',				fallback = 1.0),
+				'db.journalCompactionInterval'			: config.getfloat('database', 'journalCompactionInterval',			fallback = 300.0),
 
 				#
 				#	Logging
@@ -441,6 +464,20 @@ class Configuration(object):
 			# 	Configuration._configuration['cse.registrar.address'] = Configuration._configuration['cse.registrar.address'].replace('https:', 'http:')
 
 
+		# Database
+		Configuration._configuration['db.backend'] = (backend := Configuration._configuration['db.backend'].lower())
+		if backend not in [ 'tinydb', 'sqlite' ]:
+			return False, f'Configuration Error: \[database]:backend must be "tinydb" or "sqlite"'
+		if Configuration._configuration['db.resourceCacheSize'] < 0:
+			return False, 'Configuration Error: \[database]:resourceCacheSize must be 0 or greater'
+		if Configuration._configuration['db.identifierCacheSize'] < 0:
+			return False, 'Configuration Error: \[database]:identifierCacheSize must be 0 or greater'
+		if Configuration._configuration['db.journalSyncInterval'] <= 0.0:
+			return False, 'Configuration Error: \[database]:journalSyncInterval must be greater than 0.0'
+		if Configuration._configuration['db.journalCompactionInterval'] <= 0.0:
+			return False, 'Configuration Error: \[database]:journalCompactionInterval must be greater than 0.0'
+
+
 		# Operation
 		if Configuration._configuration['cse.operation.jobBalanceTarget'] <= 0.0:
 			return False, f'Configuration Error: \[cse.operation]:jobBalanceTarget must be > 0.0'
@@ -472,6 +509,12 @@ class Configuration(object):
 			if not os.path.exists(val):
 				return False, f'Configuration Error: \[http.security]:caPrivateKeyFile does not exists or is not accessible: {val}'
 		
+		# HTTP client connections
+		if Configuration._configuration['http.connectionPoolSize'] < 0:
+			return False, 'Configuration Error: \[server.http]:connectionPoolSize must be >= 0'
+		if Configuration._configuration['http.connectionIdleTimeout'] <= 0.0:
+			return False, 'Configuration Error: \[server.http]:connectionIdleTimeout must be > 0.0'
+
 		#
 		#	MQTT client
 		#
@@ -512,6 +555,28 @@ class Configuration(object):
 		# if any([s for s in srv if str(rvi) < s]):
 		#	return False, f'Configuration Error: \[cse]:releaseVersion: {rvi} less than highest value in \[cse].supportedReleaseVersions: {srv}. Either increase the [i]releaseVersion[/i] or reduce the set of [i]supportedReleaseVersions[/i].'
 
+		# Check security settings
+		if Configuration._configuration['cse.security.accessDecisionCacheSize'] < 0:
+			return False, 'Configuration Error: \[cse.security]:accessDecisionCacheSize must be 0 or greater'
+
+		# Check notification settings
+		if Configuration._configuration['cse.notification.deliveryWorkers'] < 0:
+			return False, 'Configuration Error: \[cse.notification]:deliveryWorkers must be 0 or greater'
+		if Configuration._configuration['cse.notification.deliveryQueueSize'] <= 0:
+			return False, 'Configuration Error: \[cse.notification]:deliveryQueueSize must be > 0'
+		if Configuration._configuration['cse.notification.maxParallelTargets'] <= 0:
+			return False, 'Configuration Error: \[cse.notification]:maxParallelTargets must be > 0'
+		if Configuration._configuration['cse.notification.retryAttempts'] < 0:
+			return False, 'Configuration Error: \[cse.notification]:retryAttempts must be 0 or greater'
+		if Configuration._configuration['cse.notification.retryInterval'] <= 0.0:
+			return False, 'Configuration Error: \[cse.notification]:retryInterval must be > 0.0'
+		if Configuration._configuration['cse.notification.failureThreshold'] <= 0:
+			return False, 'Configuration Error: \[cse.notification]:failureThreshold must be > 0'
+		if Configuration._configuration['cse.notification.maxRetryInterval'] < Configuration._configuration['cse.notification.retryInterval']:
+			return False, 'Configuration Error: \[cse.notification]:maxRetryInterval must be >= retryInterval'
+		if Configuration._configuration['cse.notification.deadLetterSize'] < 0:
+			return False, 'Configuration Error: \[cse.notification]:deadLetterSize must be 0 or greater'
+
 		# Check various intervals
 		if Configuration._configuration['cse.checkExpirationsInterval'] <= 0:
 			return False, 'Configuration Error: \[cse]:checkExpirationsInterval must be greater than 0'
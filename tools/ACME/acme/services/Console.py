@@ -123,6 +123,7 @@ class Console(object):
 			'k'		: self.katalogScripts,
 			'l'     : self.toggleScreenLogging,
 			'L'     : self.toggleLogging,
+			'N'		: self.notifications,
 			'Q'		: self.shutdownCSE,		# See handler below
 			'r'		: self.cseRegistrations,
 			'R'		: self.runScript,
@@ -188,6 +189,7 @@ class Console(object):
 			('k', 'Catalog of scripts'),
 			('l', 'Toggle screen logging on/off'),
 			('L', 'Toggle through log levels'),
+			('N', 'Show notification targets and dead letters'),
 			('r', 'Show CSE registrations'),
 			('s', 'Show statistics'),
 			('^S', 'Show & refresh statistics continuously'),
@@ -302,6 +304,30 @@ Available under the BSD 3-Clause License
 
 
 
+	def notifications(self, key:str) -> None:
+		"""	Print the delivery state of failing notification targets and the dead letters.
+		"""
+		L.console('Notification Targets', isHeader=True)
+		table = Table(row_styles = [ '', L.tableRowStyle])
+		table.add_column('Target', no_wrap = True)
+		table.add_column('Failures', no_wrap = True, justify = 'right')
+		table.add_column('Suspended', no_wrap = True, justify = 'center')
+		table.add_column('Next Attempt', no_wrap = True)
+		for uri, target in sorted(CSE.notification.getNotificationTargets().items()):
+			table.add_row(uri, str(target.failures), '✔︎' if target.circuitOpen else '', DateUtils.toISO8601Date(target.nextAttempt) if target.circuitOpen else '')
+		L.console(table, nl = True)
+
+		L.console('Dead Letters', isHeader=True)
+		table = Table(row_styles = [ '', L.tableRowStyle])
+		table.add_column('Timestamp', no_wrap = True)
+		table.add_column('Subscription', no_wrap = True)
+		table.add_column('Target', no_wrap = True)
+		table.add_column('Reason', no_wrap = False)
+		for each in CSE.notification.getDeadLetters():
+			table.add_row(DateUtils.toISO8601Date(each['ts']), each['sub'], each['nu'], str(each['dbg']))
+		L.console(table, nl = True)
+
+
 	def configuration(self, key:str) -> None:
 		"""	Print the configuration.
 		"""
@@ -786,7 +812,46 @@ Available under the BSD 3-Clause License
 		result.add_column()
 		result.add_row(Panel(resourceTypes, style = style), rightGrid )
 
-		return result
+		delivery = CSE.notification.notificationQueueStatistics()
+		notifications  = '[underline]Notification Delivery[/underline]\n'
+		notifications += '\n'
+		notifications += f'Workers   : {delivery["workers"] if delivery["workers"] else "none (synchronous)"}\n'
+		notifications += f'Queued    : {delivery["queued"]}\n'
+		notifications += f'Held back : {delivery["held"]}\n'
+		notifications += f'Retries   : {delivery["retries"]}\n'
+
+		deliveries  = '\n'
+		deliveries += '\n'
+		deliveries += f'Delivered    : {delivery["delivered"]}\n'
+		deliveries += f'Avg Latency  : {delivery["avgLatency"] * 1000.0:.1f} ms\n'
+		deliveries += f'Max Latency  : {delivery["maxLatency"] * 1000.0:.1f} ms\n'
+		deliveries += f'Suspended    : {delivery["suspended"]}\n'
+		deliveries += f'Dead Letters : {delivery["deadLetters"]}\n'
+
+		def _cacheStatistics(name:str, statistics:tuple[int, int, int], maxSize:int) -> str:
+			size, hits, misses = statistics
+			if not maxSize:
+				return f'{name}\n  [dim]disabled[/dim]\n'
+			hitRate = f' ({hits * 100.0 / (hits + misses):.1f} %)' if hits + misses else ''
+			return f'{name}\n  Size   : {size} / {maxSize}\n  Hits   : {hits}{hitRate}\n  Misses : {misses}\n'
+
+		caches  = '[underline]Caches[/underline]\n'
+		caches += '\n'
+		caches += _cacheStatistics('Resources', CSE.storage.resourceCacheStatistics(), CSE.storage.resourceCacheSize)
+		caches += _cacheStatistics('Access Decisions', CSE.security.accessDecisionCacheStatistics(), CSE.security.accessDecisionCacheSize)
+
+		servicesGrid = Table.grid(expand = True)
+		servicesGrid.add_column(ratio = 25)
+		servicesGrid.add_column(ratio = 40)
+		servicesGrid.add_column(ratio = 35)
+		servicesGrid.add_row(notifications, deliveries, caches)
+
+		statistics = Table.grid(expand = True)
+		statistics.add_column()
+		statistics.add_row(result)
+		statistics.add_row(Panel(servicesGrid, style = style))
+
+		return statistics
 
 
 	def getResourceTreeRich(self, maxLevel:int=0, parent:str=None, style:Style=Style()) -> Tree:
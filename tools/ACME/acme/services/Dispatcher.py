@@ -9,10 +9,11 @@
 
 from __future__ import annotations
 from cgitb import reset
-import operator
 import sys
 from copy import deepcopy
-from typing import Any, List, Tuple, Dict, cast
+from typing import Any, Iterator, List, Tuple, Dict, cast
+from itertools import islice
+from threading import local
 
 from ..helpers import TextTools as TextTools
 from ..etc.Constants import Constants as C
@@ -21,6 +22,7 @@ from ..etc.Types import FilterOperation
 from ..etc.Types import Permission
 from ..etc.Types import DesiredIdentifierResultType as DRT
 from ..etc.Types import ResultContentType as RCN
+from ..etc.Types import ContentStatus
 from ..etc.Types import ResponseStatusCode as RC
 from ..etc.Types import Result
 from ..etc.Types import CSERequest
@@ -34,11 +36,144 @@ from ..resources import Factory as Factory
 from ..resources.Resource import Resource
 
 
+class FilterPlan(object):
+	"""	A discovery filter, compiled from the filter criteria of a request.
+
+		The plan determines the index lookups that can be used to find candidate resources,
+		and it evaluates the filter criteria on the raw resource documents. Only resources
+		that match need to be instantiated.
+	"""
+
+	def __init__(self, conditions:Conditions, attributes:Parameters, fo:int) -> None:
+		"""	Compile a filter plan.
+
+			Args:
+				conditions: Filter conditions.
+				attributes: Attribute filter.
+				fo: Filter operation.
+		"""
+		self.conditions = conditions if conditions else {}
+		self.attributes = attributes
+		self.fo = fo
+
+		# a bit of optimization. This length stays the same.
+		self.allLen = len(attributes) if attributes else 0
+		if conditions:
+			self.allLen += ( len(conditions) +
+			  (len(conditions.get('ty'))-1 if 'ty' in conditions else 0) +		# -1 : compensate for len(conditions) in line 1
+			  (len(conditions.get('cty'))-1 if 'cty' in conditions else 0) +		# -1 : compensate for len(conditions) in line 1 
+			  (len(conditions.get('lbl'))-1 if 'lbl' in conditions else 0) 		# -1 : compensate for len(conditions) in line 1 
+			)
+
+		# Resource types that can be looked up in the type index. This is only possible for
+		# the AND filter operation, because for OR other criteria might match as well.
+		self.types:list[int] = None
+		if fo == FilterOperation.AND and (tys := self.conditions.get('ty')):
+			self.types = sorted(set([ int(ty) for ty in tys if isinstance(ty, int) or str(ty).isdigit() ]))
+
+		# Labels that can be looked up in the label index. Multiple labels are always OR'ed. This is
+		# possible for the AND filter operation, or when the labels are the only filter criteria.
+		self.labels:list[str] = None
+		if (lbls := self.conditions.get('lbl')) and (fo == FilterOperation.AND or (len(self.conditions) == 1 and not attributes)):
+			self.labels = lbls
+
+
+	def matches(self, doc:JSON) -> bool:
+		""" Match the filter against a raw resource document.
+
+			Args:
+				doc: The resource document.
+			Return:
+				True if the resource matches the filter.
+		"""
+		ty = doc.get('ty')
+		conditions = self.conditions
+
+		# The matching works like this: go through all the conditions, compare them, and
+		# increment 'found' when matching. For fo=AND found must equal all conditions.
+		# For fo=OR found must be > 0.
+		found = 0
+
+		# check conditions
+		if conditions:
+
+			# Types
+			# Multiple occurences of ty is always OR'ed. Therefore we add the count of
+			# ty's to found (to indicate that the whole set matches)
+			if tys := conditions.get('ty'):
+				found += len(tys) if ty in tys or str(ty) in tys else 0	# TODO simplify after refactoring requests. ty should only be an int
+			if ct := doc.get('ct'):
+				found += 1 if (c_crb := conditions.get('crb')) and (ct < c_crb) else 0
+				found += 1 if (c_cra := conditions.get('cra')) and (ct > c_cra) else 0
+
+			if lt := doc.get('lt'):
+				found += 1 if (c_ms := conditions.get('ms')) and (lt > c_ms) else 0
+				found += 1 if (c_us := conditions.get('us')) and (lt < c_us) else 0
+
+			if (st := doc.get('st')) is not None:	# st is an int
+				found += 1 if (c_sts := conditions.get('sts')) is not None and (st > c_sts) else 0	# st is an int
+				found += 1 if (c_stb := conditions.get('stb')) is not None and (st < c_stb) else 0
+
+			if et := doc.get('et'):
+				found += 1 if (c_exb := conditions.get('exb')) and (et < c_exb) else 0
+				found += 1 if (c_exa := conditions.get('exa')) and (et > c_exa) else 0
+
+			# Check labels similar to types
+			resourceLbl = doc.get('lbl')
+			if resourceLbl and (lbls := conditions.get('lbl')):
+				for l in lbls:
+					if l in resourceLbl:
+						found += len(lbls)
+						break
+
+			if ty in [ T.CIN, T.FCNT ]:	# special handling for CIN, FCNT
+				if (cs := doc.get('cs')) is not None:	# cs is an int
+					found += 1 if (sza := conditions.get('sza')) is not None and (int(cs) >= int(sza)) else 0	# sizes ares ints
+					found += 1 if (szb := conditions.get('szb')) is not None and (int(cs) < int(szb)) else 0
+
+			# ContentFormats
+			# Multiple occurences of cnf is always OR'ed. Therefore we add the count of
+			# cnf's to found (to indicate that the whole set matches)
+			# Similar to types.
+			if ty in [ T.CIN ]:	# special handling for CIN
+				if cnfs := conditions.get('cty'):
+					found += len(cnfs) if doc.get('cnf') in cnfs else 0
+
+		# TODO childLabels
+		# TODO parentLabels
+		# TODO childResourceType
+		# TODO parentResourceType
+
+
+		# Attributes:
+		if attributes := self.attributes:
+			for name in attributes:
+				val = attributes[name]
+				if isinstance(val, str) and '*' in val:
+					found += 1 if (rval := Utils.findXPath(doc, name)) is not None and TextTools.simpleMatch(str(rval), val) else 0
+				else:
+					found += 1 if (rval := Utils.findXPath(doc, name)) is not None and str(val) == str(rval) else 0
+
+		# TODO childAttribute
+		# TODO parentAttribute
+
+
+		# Test whether the OR or AND criteria is fullfilled
+		if not ((self.fo == FilterOperation.OR  and found > 0) or 		# OR and found something
+				(self.fo == FilterOperation.AND and self.allLen == found)	# AND and found everything
+			   ): 
+			return False
+
+		return True
+
+
+
 class Dispatcher(object):
 
 	def __init__(self) -> None:
 		self.csiSlashLen 				= len(CSE.cseCsiSlash)
 		self.sortDiscoveryResources 	= Configuration.get('cse.sortDiscoveredResources')
+		self.bulkDeletionContext		= local()	# Holds the ri of the resources that are currently removed as part of a subtree by this thread
 		L.isInfo and L.log('Dispatcher initialized')
 
 
@@ -159,14 +294,14 @@ class Dispatcher(object):
 		# TODO simplify arguments
 		if not (res := self.discoverResources(id, originator, request.args.handling, request.args.fo, request.args.conditions, request.args.attributes, permission=permission)).status:	# not found?
 			return res.errorResultCopy()				
+		contentRequest = res.request	# Carries the content status and offset if only a part of the result is returned
 
-		# check and filter by ACP. After this allowedResources only contains the resources that are allowed
+		# The discovered resources are already filtered by ACP. 
 		allowedResources = []
 		for r in cast(List[Resource], res.data):
-			if CSE.security.hasAccess(originator, r, permission):
-				if not r.willBeRetrieved(originator, request).status:	# resource instance may be changed in this call
-					continue
-				allowedResources.append(r)
+			if not r.willBeRetrieved(originator, request).status:	# resource instance may be changed in this call
+				continue
+			allowedResources.append(r)
 
 
 		#
@@ -175,26 +310,26 @@ class Dispatcher(object):
 
 		if request.args.rcn == RCN.attributesAndChildResources:
 			self.resourceTreeDict(allowedResources, resource)	# the function call add attributes to the target resource
-			return Result(status = True, rsc = RC.OK, resource = resource)
+			return Result(status = True, rsc = RC.OK, resource = resource, request = contentRequest)
 
 		elif request.args.rcn == RCN.attributesAndChildResourceReferences:
 			self._resourceTreeReferences(allowedResources, resource, request.args.drt, 'ch')	# the function call add attributes to the target resource
-			return Result(status = True, rsc = RC.OK, resource = resource)
+			return Result(status = True, rsc = RC.OK, resource = resource, request = contentRequest)
 
 		elif request.args.rcn == RCN.childResourceReferences: 
 			#childResourcesRef:JSON = { resource.tpe: {} }  # Root resource with no attribute
 			#childResourcesRef = self._resourceTreeReferences(allowedResources,  None, request.args.drt, 'm2m:rrl')
 			# self._resourceTreeReferences(allowedResources, childResourcesRef[resource.tpe], request.args.drt, 'm2m:rrl')
 			childResourcesRef = self._resourceTreeReferences(allowedResources, None, request.args.drt, 'm2m:rrl')
-			return Result(status = True, rsc = RC.OK, resource = childResourcesRef)
+			return Result(status = True, rsc = RC.OK, resource = childResourcesRef, request = contentRequest)
 
 		elif request.args.rcn == RCN.childResources:
 			childResources:JSON = { resource.tpe : {} } #  Root resource as a dict with no attribute
 			self.resourceTreeDict(allowedResources, childResources[resource.tpe]) # Adding just child resources
-			return Result(status = True, rsc = RC.OK, resource = childResources)
+			return Result(status = True, rsc = RC.OK, resource = childResources, request = contentRequest)
 
 		elif request.args.rcn == RCN.discoveryResultReferences: # URIList
-			return Result(status = True, rsc = RC.OK, resource = self._resourcesToURIList(allowedResources, request.args.drt))
+			return Result(status = True, rsc = RC.OK, resource = self._resourcesToURIList(allowedResources, request.args.drt), request = contentRequest)
 
 		else:
 			return Result.errorResult(dbg = 'wrong rcn for RETRIEVE')
@@ -251,6 +386,25 @@ class Dispatcher(object):
 						  attributes:Parameters = None, 
 						  rootResource:Resource = None, 
 						  permission:Permission = Permission.DISCOVERY) -> Result:
+		"""	Discover resources in the resource tree below a root resource.
+
+			The resource tree is walked lazily, and only until the page of the result set that
+			is requested by the *ofst* and *lim* handling parameters is complete. If there are
+			more results then the returned Result's *request* carries the content status (partial content)
+			and the content offset, which can be used as *ofst* for retrieving the next page.
+
+			Args:
+				id: ID of the root resource.
+				originator: The request originator.
+				handling: Filter handling parameters (lim, lvl, ofst, arp).
+				fo: Filter operation.
+				conditions: Filter conditions.
+				attributes: Attribute filter.
+				rootResource: The root resource. If not given then it is retrieved by *id*.
+				permission: The permission that is checked for the discovered resources.
+			Return:
+				Result object with the list of discovered resources in *data*.
+		"""
 		L.isDebug and L.logDebug('Discovering resources')
 
 		if not rootResource:
@@ -258,30 +412,20 @@ class Dispatcher(object):
 				return Result.errorResult(rsc = RC.notFound, dbg = res.dbg)
 			rootResource = res.resource
 
-		# get all direct children
-		dcrs = self.directChildResources(id)
-
-		# Slice the page (offset and limit)
-		offset = handling['ofst'] if 'ofst' in handling else 1			# default: 1 (first resource
-		limit = handling['lim'] if 'lim' in handling else sys.maxsize	# default: system max size or "maxint"
-		dcrs = dcrs[offset-1:offset-1+limit]							# now dcrs only contains the desired child resources for ofst and lim
+		# Get the page (offset and limit) of the result set
+		offset = handling['ofst'] if 'ofst' in handling else 1			# default: 1 (first resource)
+		limit = handling['lim'] if 'lim' in handling else None			# default: no limit
 
 		# Get level
 		level = handling['lvl'] if 'lvl' in handling else sys.maxsize	# default: system max size or "maxint"
 
-		# a bit of optimization. This length stays the same.
-		allLen = len(attributes) if attributes else 0
-		if conditions:
-			allLen += ( len(conditions) +
-			  (len(conditions.get('ty'))-1 if 'ty' in conditions else 0) +		# -1 : compensate for len(conditions) in line 1
-			  (len(conditions.get('cty'))-1 if 'cty' in conditions else 0) +		# -1 : compensate for len(conditions) in line 1 
-			  (len(conditions.get('lbl'))-1 if 'lbl' in conditions else 0) 		# -1 : compensate for len(conditions) in line 1 
-			)
+		# Compile the filter criteria
+		plan = FilterPlan(conditions, attributes, fo)
 
-		# Discover the resources
-		discoveredResources = self._discoverResources(rootResource, originator, level, fo, allLen, dcrs=dcrs, conditions=conditions, attributes=attributes, permission=permission)
+		# Discover the resources. This is a generator, nothing is retrieved yet
+		discoveredResources = self._discoverResources(rootResource, originator, level, plan, permission = permission)
 
-		# NOTE: this list contains all results in the order they could be found while
+		# NOTE: the results are produced in the order they could be found while
 		#		walking the resource tree.
 		#		DON'T CHANGE THE ORDER. DON'T SORT.
 		#		Because otherwise the tree cannot be correctly re-constructed otherwise
@@ -289,144 +433,124 @@ class Dispatcher(object):
 		# Apply ARP if provided
 		if 'arp' in handling:
 			arp = handling['arp']
-			result = []
-			for resource in discoveredResources:
-				# Check existence and permissions for the .../{arp} resource
-				srn = f'{resource[Resource._srn]}/{arp}'
-				if (res := self.retrieveResource(srn)).resource and CSE.security.hasAccess(originator, res.resource, permission):
-					result.append(res.resource)
-			discoveredResources = result	# re-assign the new resources to discoveredResources
-
-		return Result(status = True, data = discoveredResources)
+			# Check existence and permissions for the .../{arp} resource
+			discoveredResources = CSE.security.hasAccessMany(originator, 
+															 ( res.resource	for resource in discoveredResources
+																			if (res := self.retrieveResource(f'{resource[Resource._srn]}/{arp}')).resource ),
+															 permission)
+
+		# Only walk the tree until the page is complete. One more resource is taken to determine whether there are more results
+		result = list(islice(discoveredResources, offset - 1, None if limit is None else offset - 1 + limit + 1))
+		if limit is not None and len(result) > limit:
+			del result[limit:]
+			L.isDebug and L.logDebug(f'Partial discovery result. Next offset: {offset + limit}')
+			return Result(status = True, data = result, request = CSERequest(parameters = { C.hfCTS : int(ContentStatus.partialContent),
+																							 C.hfCTO : offset + limit }))
+		return Result(status = True, data = result)
 
 
 	def _discoverResources(self, rootResource:Resource,
 								 originator:str, 
 								 level:int, 
-								 fo:int, 
-								 allLen:int, 
-								 dcrs:list[Resource] = None, 
-								 conditions:Conditions = None, 
-								 attributes:Parameters = None, 
-								 permission:Permission = Permission.DISCOVERY) -> list[Resource]:
+								 plan:FilterPlan, 
+								 permission:Permission = Permission.DISCOVERY) -> Iterator[Resource]:
+		"""	Yield the resources below *rootResource* that match the filter plan and that
+			the *originator* has access to. The filter is evaluated on the raw resource documents,
+			and only the matching resources are instantiated.
+		"""
 		if not rootResource or level == 0:		# no resource or level == 0
-			return []
+			return
 
-		# get all direct children, if not provided
-		if not dcrs:
-			if len(dcrs := self.directChildResources(rootResource.ri)) == 0:
-				return []
+		# The candidates for a label filter are looked up in the label index. When discovering the whole
+		# resource tree then the candidates for a type filter are looked up in the type index. 
+		# Otherwise the subtree is walked.
+		if plan.labels:
+			docs = self._resourcesByLabels(plan.labels, rootResource, level)
+		elif plan.types and rootResource.ty == T.CSEBase:
+			docs = self._resourcesByType(plan.types, rootResource, level)
+		else:
+			docs = self._walkResourceTree(rootResource.ri, level)
+
+		# check permissions and filter. Only then add a resource
+		# First match then access. bc if no match then we don't need to check permissions (with all the overhead)
+		yield from CSE.security.hasAccessMany(originator,
+											  ( r for doc in docs if plan.matches(doc) and (r := Factory.resourceFromDict(doc).resource) ),
+											  permission)
 
-		# Filter and add those left to the result
-		discoveredResources = []
-		for r in dcrs:
 
+	def _walkResourceTree(self, ri:str, level:int) -> Iterator[JSON]:
+		"""	Walk the resource tree below a resource depth-first and yield the raw resource documents.
+			Child resources are only retrieved when the walk reaches them, so that the walk can stop early.
+			Virtual resources are skipped.
+		"""
+		if level == 0:
+			return
+		for doc in CSE.storage.directChildResources(ri, raw = True):
 			# Exclude virtual resources
-			if r.isVirtual():
+			if T.isVirtualResource(doc['ty']):
 				continue
-
-			# check permissions and filter. Only then add a resource
-			# First match then access. bc if no match then we don't need to check permissions (with all the overhead)
-			if self._matchResource(r, conditions, attributes, fo, allLen) and CSE.security.hasAccess(originator, r, permission):
-				discoveredResources.append(r)
+			yield doc
 
 			# Iterate recursively over all (not only the filtered) direct child resources
-			discoveredResources.extend(self._discoverResources(r, originator, level-1, fo, allLen, conditions=conditions, attributes=attributes))
-
-		return discoveredResources
-
-
-	def _matchResource(self, r:Resource, conditions:Conditions, attributes:Parameters, fo:int, allLen:int) -> bool:	
-		""" Match a filter to a resource. """
-
-		# TODO: Implement a couple of optimizations. Can we determine earlier that a match will fail?
-
-		ty = r.ty
-
-		# get the parent resource
-		#
-		#	TODO when determines how the parentAttribute is actually encoded
-		#
-		# pr = None
-		# if (pi := r.get('pi')) is not None:
-		# 	pr = storage.retrieveResource(ri=pi)
-
-		# The matching works like this: go through all the conditions, compare them, and
-		# increment 'found' when matching. For fo=AND found must equal all conditions.
-		# For fo=OR found must be > 0.
-		found = 0
-
-		# check conditions
-		if conditions:
-
-			# Types
-			# Multiple occurences of ty is always OR'ed. Therefore we add the count of
-			# ty's to found (to indicate that the whole set matches)
-			if tys := conditions.get('ty'):
-				found += len(tys) if ty in tys or str(ty) in tys else 0	# TODO simplify after refactoring requests. ty should only be an int
-			if ct := r.ct:
-				found += 1 if (c_crb := conditions.get('crb')) and (ct < c_crb) else 0
-				found += 1 if (c_cra := conditions.get('cra')) and (ct > c_cra) else 0
-
-			if lt := r.lt:
-				found += 1 if (c_ms := conditions.get('ms')) and (lt > c_ms) else 0
-				found += 1 if (c_us := conditions.get('us')) and (lt < c_us) else 0
-
-			if (st := r.st) is not None:	# st is an int
-				found += 1 if (c_sts := conditions.get('sts')) is not None and (st > c_sts) else 0	# st is an int
-				found += 1 if (c_stb := conditions.get('stb')) is not None and (st < c_stb) else 0
-
-			if et := r.et:
-				found += 1 if (c_exb := conditions.get('exb')) and (et < c_exb) else 0
-				found += 1 if (c_exa := conditions.get('exa')) and (et > c_exa) else 0
-
-			# Check labels similar to types
-			resourceLbl = r.lbl
-			if resourceLbl and (lbls := conditions.get('lbl')):
-				for l in lbls:
-					if l in resourceLbl:
-						found += len(lbls)
-						break
-
-			if ty in [ T.CIN, T.FCNT ]:	# special handling for CIN, FCNT
-				if (cs := r.cs) is not None:	# cs is an int
-					found += 1 if (sza := conditions.get('sza')) is not None and (int(cs) >= int(sza)) else 0	# sizes ares ints
-					found += 1 if (szb := conditions.get('szb')) is not None and (int(cs) < int(szb)) else 0
+			yield from self._walkResourceTree(doc['ri'], level - 1)
 
-			# ContentFormats
-			# Multiple occurences of cnf is always OR'ed. Therefore we add the count of
-			# cnf's to found (to indicate that the whole set matches)
-			# Similar to types.
-			if ty in [ T.CIN ]:	# special handling for CIN
-				if cnfs := conditions.get('cty'):
-					found += len(cnfs) if r.cnf in cnfs else 0
 
-		# TODO childLabels
-		# TODO parentLabels
-		# TODO childResourceType
-		# TODO parentResourceType
+	def _resourcesByLabels(self, labels:list[str], rootResource:Resource, level:int) -> Iterator[JSON]:
+		"""	Yield the raw documents of all resources that have at least one of the labels, that are in the
+			resource tree below *rootResource* and up to a level below it, in the order of the resource tree walk.
+			Resources outside of this part of the tree are not retrieved.
+		"""
+		rootSrn = rootResource[Resource._srn]
+		prefix = f'{rootSrn}/'
+		rootLevel = rootSrn.count('/')
+		srns = set([ srn	for srn in CSE.storage.structuredPathsByLabels(labels)
+							if srn and srn.startswith(prefix) and srn.count('/') - rootLevel <= level ])
+		yield from self._walkResourceBranches(rootResource, srns, level)
 
 
-		# Attributes:
-		if attributes:
-			for name in attributes:
-				val = attributes[name]
-				if isinstance(val, str) and '*' in val:
-					found += 1 if (rval := r[name]) is not None and TextTools.simpleMatch(str(rval), val) else 0
-				else:
-					found += 1 if (rval := r[name]) is not None and str(val) == str(rval) else 0
+	def _resourcesByType(self, tys:list[int], rootResource:Resource, level:int) -> Iterator[JSON]:
+		"""	Yield the raw documents of all resources of the given types, up to a level below the *rootResource*
+			(the CSEBase), in the order of the resource tree walk.
+		"""
+		srns = set([ srn	for ty in tys if not T.isVirtualResource(ty)
+							for doc in CSE.storage.retrieveResourcesByType(ty)
+							if 0 < (srn := doc.get(Resource._srn, '')).count('/') <= level ])	# the CSEBase's srn has no '/'
+		yield from self._walkResourceBranches(rootResource, srns, level)
 
-		# TODO childAttribute
-		# TODO parentAttribute
 
+	def _walkResourceBranches(self, rootResource:Resource, srns:set[str], level:int) -> Iterator[JSON]:
+		"""	Walk the resource tree below a resource depth-first, like *_walkResourceTree()*, but only
+			into the branches that lead to one of the resources in *srns*. Only the raw documents of
+			those resources are yielded, in the same order as the full tree walk would produce them.
 
-		# Test whether the OR or AND criteria is fullfilled
-		if not ((fo == FilterOperation.OR  and found > 0) or 		# OR and found something
-				(fo == FilterOperation.AND and allLen == found)		# AND and found everything
-			   ): 
-			return False
+			Args:
+				rootResource: The root resource of the walk.
+				srns: Structured resource names of the resources to yield. They must be below *rootResource*.
+				level: Maximum level of the walk below *rootResource*.
+			Return:
+				Iterator of raw resource documents.
+		"""
+		if not srns:
+			return
+		rootLevel = rootResource[Resource._srn].count('/')
+		branches = set()	# srn of all resources on the path to one of the resources
+		for srn in srns:
+			while (srn := srn.rpartition('/')[0]).count('/') > rootLevel and srn not in branches:
+				branches.add(srn)
+
+		def walk(ri:str, level:int) -> Iterator[JSON]:
+			if level == 0:
+				return
+			for doc in CSE.storage.directChildResources(ri, raw = True):
+				# Exclude virtual resources
+				if T.isVirtualResource(doc['ty']):
+					continue
+				if (srn := doc.get(Resource._srn)) in srns:
+					yield doc
+				if srn in branches:
+					yield from walk(doc['ri'], level - 1)
 
-		return True
+		yield from walk(rootResource.ri, level)
 
 
 	#########################################################################
@@ -650,7 +774,7 @@ class Dispatcher(object):
 		if resource.isVirtual():
 			return resource.handleUpdateRequest(request, id, originator)	# type: ignore[no-any-return]
 
-		dictOrg = deepcopy(resource.dict)	# Save for later
+		dictOrg = resource.dict.snapshot()	# Save for later
 
 
 		if not (res := self.updateResource(resource, deepcopy(request.pc), originator=originator)).resource:
@@ -669,7 +793,7 @@ class Dispatcher(object):
 		if request.args.rcn is None or request.args.rcn == RCN.attributes:	# rcn is an int
 			return res
 		elif request.args.rcn == RCN.modifiedAttributes:
-			dictNew = deepcopy(resource.dict)
+			dictNew = resource.dict.snapshot()
 			requestPC = request.pc[tpe]
 			# return only the modified attributes. This does only include those attributes that are updated differently, or are
 			# changed by the CSE, then from the original request. Luckily, all key/values that are touched in the update request
@@ -899,8 +1023,8 @@ class Dispatcher(object):
 	def retrieveLatestOldestInstance(self, pi:str, ty:T, oldest:bool = False) -> Resource:
 		"""	Get the latest or oldest x-Instance resource for a parent.
 
-			This is done by searching through all resources once to find the fitting resource 
-			(parent + type)	with the latest or oldest `ct` attribute.
+			This is done by looking up the parent's instances in the storage's
+			instance index, which is ordered by the `ct` attribute.
 
 			Args:
 				pi: parent resourceIdentifier
@@ -910,39 +1034,34 @@ class Dispatcher(object):
 			Return:
 				Resource
 		"""
-		hit:Tuple[JSON, str] = None
-		op = operator.gt if oldest else operator.lt
-
-		# This function used as a mapper to search through all resources and
-		# determines the newest CIN resource for this parent
-		# This should be a bit faster than getting all the CIN, instantiating them, 
-		# and throwig them all away etc
-		def determineLatest(res:JSON) -> bool:
-			nonlocal hit
-			if res['pi'] == pi and res['ty'] == ty:
-				ct = res['ct']
-				if not hit or op(hit[1], ct):
-					hit = ( res, ct )
-			return False
+		return CSE.storage.latestOldestInstance(pi, ty, oldest)
 
-		# Search through the resources with the mapping functions
-		CSE.storage.searchByFilter(filter = determineLatest)
-		if not hit:
-			return None
-		# Instantiate and return resource
-		return Factory.resourceFromDict(hit[0]).resource
+
+	def removeOldestInstance(self, container:Resource, ty:T, reason:str) -> bool:
+		"""	Remove the oldest x-Instance resource of a container-like resource, e.g. when
+			its maximum number of instances or its maximum size is exceeded.
+
+			Deleting the instance doesn't cause a notification for 'deleteDirectChild', because
+			no delete check is done and therefore the container's `childRemoved()` is not called.
+
+			Args:
+				container: The parent <cnt>, <fcnt> or <ts> resource.
+				ty: Resource type of the instances.
+				reason: Reason for the removal, used for logging.
+			Return:
+				Boolean indicating whether an instance was removed.
+		"""
+		if not (instance := CSE.storage.latestOldestInstance(container.ri, ty, oldest = True)):
+			return False
+		L.isDebug and L.logDebug(f'{reason}: Removing instance: {instance.ri}')
+		return self.deleteResource(instance, parentResource = container, doDeleteCheck = False).status
 
 
 	def discoverChildren(self, id:str, resource:Resource, originator:str, handling:JSON, permission:Permission) -> list[Resource]:
 		# TODO documentation
 		if not (res := self.discoverResources(id, originator, handling, rootResource=resource, permission=permission)).status:
 			return None
-		# check and filter by ACP
-		children = []
-		for r in cast(List[Resource], res.data):
-			if CSE.security.hasAccess(originator, r, permission):
-				children.append(r)
-		return children
+		return cast(List[Resource], res.data)	# already filtered by ACP
 
 
 	def countResources(self, ty:T|Tuple[T, ...]=None) -> int:
@@ -975,16 +1094,61 @@ class Dispatcher(object):
 		return result
 	
 
-	def deleteChildResources(self, parentResource:Resource, originator:str, ty:T=None) -> None:
+	def deleteChildResources(self, parentResource:Resource, originator:str, ty:T = None, parentDeleted:bool = False) -> None:
 		"""	Remove all child resources of a parent recursively. 
-			If `ty` is set only the resources of this type are removed.
+			If `ty` is set only the direct child resources of this type (and their own
+			child resources) are removed.
+
+			The whole subtree is collected first and each resource is deactivated. The resources,
+			their identifiers and subscriptions are then removed from the database in bulk,
+			and the delete events are raised in bulk as well.
+
+			Args:
+				parentResource: The parent resource.
+				originator: The request originator.
+				ty: Optional type of the direct child resources to remove.
+				parentDeleted: Indicates that the parent resource is deleted as well. It is then not notified about the removed child resources.
 		"""
-		# Remove directChildResources
-		rs = self.directChildResources(parentResource.ri)
-		for r in rs:
-			if ty is None or r.ty == ty:	# ty is an int
-				parentResource.childRemoved(r, originator)	# recursion here
-				self.deleteResource(r, originator, parentResource=parentResource)
+		# Nothing to do if the parent is part of a subtree that is already being removed by this thread.
+		# A concurrent request in another thread must still remove the child resources itself.
+		if not hasattr(self.bulkDeletionContext, 'ris'):
+			self.bulkDeletionContext.ris = set()
+		bulkDeletions:set[str] = self.bulkDeletionContext.ris
+		if parentResource.ri in bulkDeletions:
+			return
+
+		# Collect the subtree. Parents are always listed before their own child resources
+		docs = [ each for each in CSE.storage.directChildResources(parentResource.ri, raw = True) if ty is None or each['ty'] == ty ]	# ty is an int
+		i = 0
+		while i < len(docs):
+			docs.extend(CSE.storage.directChildResources(docs[i]['ri'], raw = True))
+			i += 1
+		if not docs:
+			return
+		resources = [ Factory.resourceFromDict(each).resource for each in docs ]
+		L.isDebug and L.logDebug(f'Removing {len(resources)} child resources of: {parentResource.ri}')
+
+		ris = [ each.ri for each in resources ]
+		bulkDeletions.update(ris)
+		try:
+			# Deactivate the resources, parents before their children. This doesn't 
+			# recurse, because the child resources are already part of the subtree.
+			for resource in resources:
+				resource.deactivate(originator)
+
+			# Remove everything from the DB in bulk
+			CSE.storage.deleteResources(resources)
+		finally:
+			bulkDeletions.difference_update(ris)
+
+		# send the delete events
+		CSE.event.deleteResource.callBulk(resources) 	# type: ignore
+
+		# Now notify the parent resource
+		if not parentDeleted:
+			for resource in resources:
+				if resource.pi == parentResource.ri:
+					parentResource.childRemoved(resource, originator)
 
 
 	#########################################################################
@@ -12,6 +12,9 @@ import logging, sys, urllib3
 from sqlite3 import Date
 from copy import deepcopy
 from typing import Any, Callable, cast, Tuple
+from threading import Lock
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
 
 
 import flask
@@ -58,10 +61,19 @@ class HttpServer(object):
 		self.webuiRoot 			= Configuration.get('cse.webui.root')
 		self.webuiDirectory 	= f'{Configuration.get("packageDirectory")}/webui'
 		self.isStopped			= False
+		self.connectionPoolSize	= Configuration.get('http.connectionPoolSize')
+		self.connectionIdleTimeout = Configuration.get('http.connectionIdleTimeout')
 
 
 		self.backgroundActor:BackgroundWorker = None
 
+		# Client sessions for outgoing requests, one per target host
+		self.lockSessions								= Lock()
+		self.sessions:dict[str, requests.Session]		= {}
+		self.sessionsLastUsed:dict[str, float]			= {}
+		self.sessionsInUse:dict[str, int]				= {}	# host -> number of requests that are currently sent with the session
+		self.sessionIdleWorker:BackgroundWorker			= None
+
 		self.serverID			= f'ACME {C.version}' 			# The server's ID for http response headers
 		self._responseHeaders	= {'Server' : self.serverID}	# Additional headers for other requests
 
@@ -117,6 +129,10 @@ class HttpServer(object):
 		logging.getLogger("urllib3").setLevel(LogLevel.WARNING)
 		if not CSE.security.verifyCertificateHttp:	# only when we also verify  certificates
 			urllib3.disable_warnings()
+
+		# Start the worker that closes idle client connections
+		if self.connectionPoolSize > 0:
+			self.sessionIdleWorker = BackgroundWorkerPool.newWorker(self.connectionIdleTimeout, self._closeIdleSessions, 'httpSessionIdle').start()
 		L.isInfo and L.log('HTTP Server initialized')
 
 
@@ -132,6 +148,9 @@ class HttpServer(object):
 		"""
 		L.isInfo and L.log('HttpServer shut down')
 		self.isStopped = True
+		if self.sessionIdleWorker:
+			self.sessionIdleWorker.stop()
+		self._closeIdleSessions(0.0)	# close all client connections
 		return True
 	
 
@@ -344,11 +363,11 @@ class HttpServer(object):
 	#
 
 	operation2method = {
-		Operation.CREATE	: requests.post,
-		Operation.RETRIEVE	: requests.get,
-		Operation.UPDATE 	: requests.put,
-		Operation.DELETE 	: requests.delete,
-		Operation.NOTIFY 	: requests.post
+		Operation.CREATE	: 'post',
+		Operation.RETRIEVE	: 'get',
+		Operation.UPDATE 	: 'put',
+		Operation.DELETE 	: 'delete',
+		Operation.NOTIFY 	: 'post'
 	}
 
 	def _prepContent(self, content:bytes|str|Any, ct:CST) -> str:
@@ -372,7 +391,7 @@ class HttpServer(object):
 			The result is returned in *Result.data*.
 		"""
 		# Set the request method
-		method:Callable = self.operation2method[operation]
+		method:str = self.operation2method[operation]
 
 		# Make the URL a valid http URL (escape // and ///)
 		url = RequestUtils.toHttpUrl(url)
@@ -454,14 +473,21 @@ class HttpServer(object):
 		# ! Don't forget: requests are done through the request library, not flask.
 		# ! The attribute names are different
 		try:
-			L.isDebug and L.logDebug(f'Sending request: {method.__name__.upper()} {url}')
+			L.isDebug and L.logDebug(f'Sending request: {method.upper()} {url}')
 			if ct == CST.CBOR:
 				L.isDebug and L.logDebug(f'HTTP Request ==>:\nHeaders: {hds}\nBody: \n{self._prepContent(content, ct)}\n=>\n{str(data) if data else ""}\n')
 			else:
 				L.isDebug and L.logDebug(f'HTTP Request ==>:\nHeaders: {hds}\nBody: \n{self._prepContent(content, ct)}\n')
 			
-			# Actual sending the request
-			r = method(url, data = content, headers = hds, verify = CSE.security.verifyCertificateHttp)
+			# Actual sending the request. Re-use the open connections to the target host, if enabled
+			if self.connectionPoolSize > 0:
+				host, session = self._acquireSession(url)
+				try:
+					r = session.request(method, url, data = content, headers = hds, verify = CSE.security.verifyCertificateHttp)
+				finally:
+					self._releaseSession(host)
+			else:
+				r = requests.request(method, url, data = content, headers = hds, verify = CSE.security.verifyCertificateHttp)
 
 			# Construct CSERequest object from the result
 			resp = CSERequest(isResponse = True)
@@ -490,6 +516,71 @@ class HttpServer(object):
 		return res
 		
 
+	def _acquireSession(self, url:str) -> Tuple[str, requests.Session]:
+		"""	Return the client session for the target host of a URL. A new session is created if
+			there is no session for the host yet. The session is in use until `_releaseSession()`
+			is called for the host, and it is not closed in the meantime.
+
+			A session keeps up to *connectionPoolSize* connections to its host open for re-use. This
+			also means that a TLS connection is only established once and then re-used for further
+			requests.
+
+			Args:
+				url: The URL of the request.
+			Return:
+				Tuple (target host, client session for the target host).
+		"""
+		u = urlparse(url)
+		host = f'{u.scheme}://{u.netloc}'
+		with self.lockSessions:
+			if not (session := self.sessions.get(host)):
+				L.isDebug and L.logDebug(f'Creating client session for: {host}')
+				session = requests.Session()
+				session.cookies.set_policy(DefaultCookiePolicy(allowed_domains = []))	# Don't keep cookies between requests
+				adapter = requests.adapters.HTTPAdapter(pool_connections = 1, pool_maxsize = self.connectionPoolSize)
+				session.mount('http://', adapter)
+				session.mount('https://', adapter)
+				self.sessions[host] = session
+			self.sessionsInUse[host] = self.sessionsInUse.get(host, 0) + 1
+			self.sessionsLastUsed[host] = DateUtils.utcTime()
+			return host, session
+
+
+	def _releaseSession(self, host:str) -> None:
+		"""	Mark the end of a request that was sent with the client session for a host. The idle
+			time of the session starts when its last request has finished.
+
+			Args:
+				host: The target host, as returned by `_acquireSession()`.
+		"""
+		with self.lockSessions:
+			if (inUse := self.sessionsInUse.get(host, 0)) > 1:
+				self.sessionsInUse[host] = inUse - 1
+			else:
+				self.sessionsInUse.pop(host, None)
+			if host in self.sessions:
+				self.sessionsLastUsed[host] = DateUtils.utcTime()
+
+
+	def _closeIdleSessions(self, idleTimeout:float = None) -> bool:
+		"""	Close the client sessions and their connections that were not used for some time.
+			Sessions that are currently used for a request are not closed.
+
+			Args:
+				idleTimeout: Close sessions that were not used for this number of seconds. The default is *connectionIdleTimeout*.
+			Return:
+				Always True (to continue a background worker).
+		"""
+		idleTimeout = self.connectionIdleTimeout if idleTimeout is None else idleTimeout
+		now = DateUtils.utcTime()
+		with self.lockSessions:
+			for host in [ h for h, lastUsed in self.sessionsLastUsed.items() if now - lastUsed >= idleTimeout and h not in self.sessionsInUse ]:
+				L.isDebug and L.logDebug(f'Closing idle client session for: {host}')
+				del self.sessionsLastUsed[host]
+				self.sessions.pop(host).close()
+		return True
+
+
 	#########################################################################
 
 	def _prepareResponse(self, result:Result, originalRequest:CSERequest = None) -> Response:
@@ -545,6 +636,10 @@ class HttpServer(object):
 			headers[C.hfRVI] = rvi
 		if vsi := Utils.findXPath(cast(JSON, outResult.data), 'vsi'):
 			headers[C.hfVSI] = vsi
+		if cnst := Utils.findXPath(cast(JSON, outResult.data), 'cnst'):
+			headers[C.hfCTS] = str(cnst)
+		if cnot := Utils.findXPath(cast(JSON, outResult.data), 'cnot'):
+			headers[C.hfCTO] = str(cnot)
 		headers[C.hfOT] = DateUtils.getResourceDate()
 
 		# HTTP status code
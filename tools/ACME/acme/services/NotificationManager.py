@@ -8,14 +8,18 @@
 #
 
 from __future__ import annotations
-import sys
+import sys, heapq
 import isodate
-from typing import Callable, Union
-from threading import Lock
+from copy import deepcopy
+from collections import deque
+from typing import Callable, Tuple, Union
+from threading import Condition, Event, Lock, RLock, local
+from queue import Queue, Empty
 from tinydb.utils import V
 
 from ..etc.Constants import Constants as C
 from ..etc.Types import CSERequest, ContentSerializationType, MissingData, ResourceTypes, Result, NotificationContentType, NotificationEventType
+from ..etc.Types import NotificationTarget
 from ..etc.Types import ResponseStatusCode as RC, EventCategory
 from ..etc.Types import JSON, Parameters
 from ..etc import Utils, DateUtils
@@ -23,26 +27,129 @@ from ..services.Logging import Logging as L
 from ..services.Configuration import Configuration
 from ..services import CSE
 from ..resources.Resource import Resource
-from ..helpers.BackgroundWorker import BackgroundWorkerPool
+from ..helpers.BackgroundWorker import BackgroundWorker, BackgroundWorkerPool
 
 # TODO: removal policy (e.g. unsuccessful tries)
 
 SenderFunction = Callable[[str], bool]	# type:ignore[misc] # bc cyclic definition 
 """ Type definition for sender callback function. """
 
+DeliveryJob = Callable[[], bool]
+""" Type definition for a job in a delivery queue. """
+
 
 class NotificationManager(object):
 
+	batchNotificationIdleInterval = 60.0
+	""" Interval (in seconds) in which the batch notification timer runs when no batch is waiting. """
+
+	notificationRetryIdleInterval = 60.0
+	""" Interval (in seconds) in which the notification retry worker runs when no retry is waiting. """
 
 	def __init__(self) -> None:
-		self.lockBatchNotification = Lock()	# Lock for batchNotifications
+		self.lockBatchNotification = Lock()	# Lock for sending batchNotifications
+		self.lockExpirationCounters = RLock()	# Lock for decrementing the expirationCounters of subscriptions
+
+		# Get the configuration settings
+		self.deliveryWorkers	= Configuration.get('cse.notification.deliveryWorkers')
+		self.deliveryQueueSize	= Configuration.get('cse.notification.deliveryQueueSize')
+		self.maxParallelTargets	= Configuration.get('cse.notification.maxParallelTargets')
+		self.retryAttempts		= Configuration.get('cse.notification.retryAttempts')
+		self.retryInterval		= Configuration.get('cse.notification.retryInterval')
+		self.failureThreshold	= Configuration.get('cse.notification.failureThreshold')
+		self.maxRetryInterval	= Configuration.get('cse.notification.maxRetryInterval')
+
+		# Queues and workers for sending subscription notifications in the background. There is
+		# a queue for each pair of subscription and target, so that the notifications to a target
+		# are sent in the order in which they were raised. A queue is served by one worker at a
+		# time, and a slow target doesn't delay the notifications to other targets
+		self.lockDeliveries								= Condition()	# Guards the delivery queues, and signals free space in them
+		self.deliveryQueues:dict[Tuple[str, str], deque[Tuple[DeliveryJob, float, bool]]]	= {}	# (subscription ri, target) -> (job, raised time, is retry)
+		self.readyDeliveries:Queue[Tuple[str, str]]	= Queue()	# Delivery queues that are ready to be served by a worker
+		self.activeDeliveries:set[Tuple[str, str]]		= set()	# Delivery queues that are ready or currently served by a worker
+		self.retryingDeliveries:set[Tuple[str, str]]	= set()	# Delivery queues that are held back until a retry to their target is sent
+		self.removedSubscriptions:set[str]				= set()	# Subscriptions that are being removed. No retries are scheduled for them
+		self.queuedDeliveries							= 0		# Number of queued notifications, without retries
+		self.deliveryCapacity							= self.deliveryWorkers * self.deliveryQueueSize	# Maximum number of queued notifications
+		self.deliveryActors:list[BackgroundWorker]		= []
+		self.deliveryRunning							= False
+		self.deliveryContext							= local()	# Marks the threads of the delivery workers
+		self.pendingDeliveriesChanged					= Condition()	# Guards and signals the pending deliveries
+		self.pendingDeliveries:dict[str, int]			= {}	# subscription ri -> number of its queued notifications that are not sent yet
+
+		# Failed notifications that wait for their next attempt. A single worker puts them
+		# back into the delivery queues when they are due
+		self.lockNotificationRetries					= Lock()
+		self.notificationRetries:list[Tuple[float, int, str, str, DeliveryJob]]	= []	# heap of (time, sequence, subscription ri, target, job)
+		self.notificationRetrySequence					= 0		# Orders retries with the same time
+		self.notificationRetryWorker:BackgroundWorker	= None
+
+		# Delivery statistics
+		self.lockDeliveryStatistics						= Lock()
+		self.deliveredNotifications						= 0
+		self.deliveryLatencyTotal						= 0.0
+		self.deliveryLatencyMax							= 0.0
+
+		# Delivery state of the notification targets, and the notifications that could not be delivered
+		self.lockNotificationTargets					= Lock()
+		self.notificationTargets:dict[str, NotificationTarget]	= {}
+		self.deadLetters:deque[JSON]					= deque(maxlen = Configuration.get('cse.notification.deadLetterSize'))
+
+		# Buffers for the batch notifications, and the timers for the batch notifications' durations.
+		# A single worker sends the batches whose duration has passed.
+		self.persistBatchNotifications					= Configuration.get('cse.notification.persistBatchNotifications')
+		self.lockBatchBuffers							= Lock()
+		self.batchNotifications:dict[Tuple[str, str], list[JSON]]	= {}	# (ri, nu) -> notifications in the order they were raised
+		self.batchNotificationDue:dict[Tuple[str, str], float]		= {}	# (ri, nu) -> time when the batch must be sent
+		self.batchNotificationTimers:list[Tuple[float, str, str]]	= []	# heap of (time, ri, nu). May contain outdated entries
+		self.batchNotificationWorker = BackgroundWorkerPool.newWorker(self.batchNotificationIdleInterval, self._batchNotificationTimerWorker, 'batchNotificationTimer', startWithDelay = True, runOnTime = False).start()
+		self._restoreBatchNotifications()
+
+		self._startDeliveryWorkers()
+		CSE.event.addHandler(CSE.event.cseReset, self.restart)		# type: ignore
 		L.isInfo and L.log('NotificationManager initialized')
 
 
 	def shutdown(self) -> bool:
+		self._stopDeliveryWorkers()
+		if self.batchNotificationWorker:
+			self.batchNotificationWorker.stop()
+		L.isDebug and L.logDebug(f'Notification delivery statistics: {self.notificationQueueStatistics()}')
 		L.isInfo and L.log('NotificationManager shut down')
 		return True
 
+
+	def restart(self) -> None:
+		"""	Restart the NotificationManager service. Notifications that are still waiting
+			in the delivery queues are discarded because their subscriptions don't exist anymore.
+			Also, the delivery state of the targets and the dead letters are cleared.
+		"""
+		with self.lockDeliveries:
+			for jobs in self.deliveryQueues.values():
+				jobs.clear()
+			self.deliveryQueues.clear()
+			self.retryingDeliveries.clear()
+			self.removedSubscriptions.clear()
+			self.queuedDeliveries = 0
+			self.lockDeliveries.notify_all()
+		with self.lockNotificationRetries:
+			self.notificationRetries.clear()
+		with self.pendingDeliveriesChanged:
+			self.pendingDeliveries.clear()
+			self.pendingDeliveriesChanged.notify_all()
+		with self.lockDeliveryStatistics:
+			self.deliveredNotifications	= 0
+			self.deliveryLatencyTotal	= 0.0
+			self.deliveryLatencyMax		= 0.0
+		with self.lockNotificationTargets:
+			self.notificationTargets.clear()
+			self.deadLetters.clear()
+		with self.lockBatchBuffers:
+			self.batchNotifications.clear()
+			self.batchNotificationDue.clear()
+			self.batchNotificationTimers.clear()
+		L.isDebug and L.logDebug('NotificationManager restarted')
+
 	###########################################################################
 	#
 	#	Subscriptions
@@ -60,6 +167,11 @@ class NotificationManager(object):
 		""" Remove a subscription. Send the deletion notifications, if possible. """
 		L.isDebug and L.logDebug('Removing subscription')
 
+		# Discard the retries of failed notifications, and the notifications that are held back 
+		# for them. Then wait until the other already raised notifications for this subscription are sent
+		self._cancelNotificationRetries(subscription.ri)
+		self._waitForDeliveries(subscription.ri)
+
 		# Send outstanding batchNotifications for a subscription
 		self._flushBatchNotifications(subscription)
 
@@ -72,7 +184,9 @@ class NotificationManager(object):
 			self._sendDeletionNotification([ nu for nu in acrs ], subscription.ri)
 		
 		# Finally remove subscriptions from storage
-		return Result.successResult() if CSE.storage.removeSubscription(subscription) else Result.errorResult(rsc = RC.internalServerError, dbg = 'cannot remove subscription from database')
+		result = CSE.storage.removeSubscription(subscription)
+		self._forgetRemovedSubscription(subscription.ri)
+		return Result.successResult() if result else Result.errorResult(rsc = RC.internalServerError, dbg = 'cannot remove subscription from database')
 
 
 	def updateSubscription(self, subscription:Resource, previousNus:list[str], originator:str) -> Result:
@@ -93,12 +207,12 @@ class NotificationManager(object):
 			Return:
 				List of storage subscription documents, NOT Subscription resources.
 			"""
-		if not (subs := CSE.storage.getSubscriptionsForParent(ri)):
+		if not net:
 			return []
-		result:list[JSON] = []
-		for each in subs:
-			if net and any(x in net for x in each['net']):
-				result.append(each)
+		if len(net) == 1:
+			result = CSE.storage.getSubscriptionsForParent(ri, net[0])
+		else:
+			result = list({ each['ri'] : each for n in net for each in CSE.storage.getSubscriptionsForParent(ri, n) }.values())	# without duplicates
 		
 		# filter by chty if set
 		if chty:
@@ -121,31 +235,27 @@ class NotificationManager(object):
 
 		# ATTN: The "subscription" returned here are NOT the <sub> resources,
 		# but an internal representation from the 'subscription' DB !!!
-		# Access to attributes is different bc the structure is flattened
-		if not (subs := CSE.storage.getSubscriptionsForParent(ri)):
+		# Access to attributes is different bc the structure is flattened.
+		# Only the subscriptions that include the reason in their enc/net are returned.
+		if not (subs := CSE.storage.getSubscriptionsForParent(ri, reason)):
 			return
+		contents:dict[int, JSON] = {}	# notification contents for this event, shared by all subscriptions
 		for sub in subs:
 			# Prevent own notifications for subscriptions 
 			if childResource and \
 				sub['ri'] == childResource.ri and \
 				reason in [ NotificationEventType.createDirectChild, NotificationEventType.deleteDirectChild ]:
 					continue
-			if reason not in sub['net']:	# check whether reason is actually included in the subscription
-				continue
 			if reason in [ NotificationEventType.createDirectChild, NotificationEventType.deleteDirectChild ]:	# reasons for child resources
 				chty = sub['chty']
 				if chty and not childResource.ty in chty:	# skip if chty is set and child.type is not in the list
 					continue
-				self._handleSubscriptionNotification(sub, reason, resource = childResource, modifiedAttributes = modifiedAttributes)
+				self._handleSubscriptionNotification(sub, reason, resource = childResource, modifiedAttributes = modifiedAttributes, contents = contents)
 			
 			# Check Update and enc/atr vs the modified attributes 
 			elif reason == NotificationEventType.resourceUpdate and (atr := sub['atr']) and modifiedAttributes:
-				found = False
-				for k in atr:
-					if k in modifiedAttributes:
-						found = True
-				if found:
-					self._handleSubscriptionNotification(sub, reason, resource = resource, modifiedAttributes = modifiedAttributes)
+				if not atr.isdisjoint(modifiedAttributes):
+					self._handleSubscriptionNotification(sub, reason, resource = resource, modifiedAttributes = modifiedAttributes, contents = contents)
 				else:
 					L.isDebug and L.logDebug('Skipping notification: No matching attributes found')
 			
@@ -157,7 +267,7 @@ class NotificationManager(object):
 					md.missingDataList = []	# delete only the sent missing data points
 
 			else: # all other reasons that target the resource
-				self._handleSubscriptionNotification(sub, reason, resource, modifiedAttributes = modifiedAttributes)
+				self._handleSubscriptionNotification(sub, reason, resource, modifiedAttributes = modifiedAttributes, contents = contents)
 
 
 	def checkPerformBlockingUpdate(self, resource:Resource, originator:str, updatedAttributes:JSON, finished:Callable = None) -> Result:
@@ -390,57 +500,126 @@ class NotificationManager(object):
 		return self._sendNotification(uri, sender) if uri else True	# Ignore if the uri is None
 
 
-	def _handleSubscriptionNotification(self, sub:JSON, reason:NotificationEventType, resource:Resource = None, modifiedAttributes:JSON = None, missingData:MissingData = None) ->  bool:
+	def _handleSubscriptionNotification(self, sub:JSON, 
+											  reason:NotificationEventType, 
+											  resource:Resource = None, 
+											  modifiedAttributes:JSON = None, 
+											  missingData:MissingData = None,
+											  contents:dict[int, JSON] = None) ->  bool:
 		"""	Send a subscription notification.
+
+			The content of the notification is assembled immediately. Sending the notification is
+			done by one of the delivery workers, or directly if no delivery workers are configured.
+
+			The notification is built only once and sent unchanged to all targets of the subscription. Its
+			serialization is also done only once for each content serialization type.
+
+			Args:
+				sub: The internal subscription structure, NOT the <sub> resource.
+				reason: The notification event type.
+				resource: The resource for the notification content.
+				modifiedAttributes: The modified attributes of an update.
+				missingData: The missing data points for time series notifications.
+				contents: Optional dictionary of already built notification contents for the same event, per notification content type value. New contents are added to it. These contents are shared and must not be modified.
+			Return:
+				True if the notification was sent or queued successfully.
 		"""
 		L.isDebug and L.logDebug(f'Handling notification for reason: {reason}')
 
-		def sender(uri:str) -> bool:
-			"""	Sender callback function for a single normal subscription notifications
-			"""
-			L.isDebug and L.logDebug(f'Sending notification to: {uri}, reason: {reason}	')
-			notificationRequest = {
-				'm2m:sgn' : {
-					'nev' : {
-						'rep' : {},
-						'net' : NotificationEventType.resourceUpdate
-					},
-					'sur' : Utils.spRelRI(sub['ri'])
-				}
-			}
-
-			nct = sub['nct']
-			creator = sub.get('cr')	# creator, might be None
-			# switch to poupate data
-			data = None
+		nct = sub['nct']
+		creator = sub.get('cr')	# creator, might be None
+		# switch to poupate data
+		data = None
+		if contents is not None and int(nct) in contents:
+			data = contents[int(nct)]
+		else:
 			nct == NotificationContentType.all						and (data := resource.asDict())
 			nct == NotificationContentType.ri 						and (data := { 'm2m:uri' : resource.ri })
-			nct == NotificationContentType.modifiedAttributes		and (data := { resource.tpe : modifiedAttributes })
-			nct == NotificationContentType.timeSeriesNotification	and (data := { 'm2m:tsn' : missingData.asDict() })
+			nct == NotificationContentType.modifiedAttributes		and (data := { resource.tpe : deepcopy(modifiedAttributes) })
+			nct == NotificationContentType.timeSeriesNotification	and (data := { 'm2m:tsn' : deepcopy(missingData.asDict()) })
 			# TODO nct == NotificationContentType.triggerPayload
+			if contents is not None and nct != NotificationContentType.timeSeriesNotification:	# missing data is different for each subscription
+				contents[int(nct)] = data
+
+		notificationRequest = {
+			'm2m:sgn' : {
+				'nev' : {
+					'rep' : {},
+					'net' : NotificationEventType.resourceUpdate
+				},
+				'sur' : Utils.spRelRI(sub['ri'])
+			}
+		}
+
+		# Add some values to the notification
+		reason is not None and Utils.setXPath(notificationRequest, 'm2m:sgn/nev/net', reason)
+		data is not None and Utils.setXPath(notificationRequest, 'm2m:sgn/nev/rep', data)
+		creator is not None and Utils.setXPath(notificationRequest, 'm2m:sgn/cr', creator)	# Set creator in notification if it was present in subscription
 
-			# Add some values to the notification
-			reason is not None and Utils.setXPath(notificationRequest, 'm2m:sgn/nev/net', reason)
-			data is not None and Utils.setXPath(notificationRequest, 'm2m:sgn/nev/rep', data)
-			creator is not None and Utils.setXPath(notificationRequest, 'm2m:sgn/cr', creator)	# Set creator in notification if it was present in subscription
+		serializations:dict[int, str|bytes|JSON] = {}	# serialized notification per content serialization type value
+
+		def sender(uri:str) -> bool:
+			"""	Sender callback function for a single normal subscription notifications
+			"""
+			L.isDebug and L.logDebug(f'Sending notification to: {uri}, reason: {reason}	')
 
 			# Check for batch notifications
 			if sub['bn']:
 				return self._storeBatchNotification(uri, sub, notificationRequest)
 			else:
-				if not self._sendRequest(uri, notificationRequest).status:
+				if not self._sendSubscriptionRequest(uri, notificationRequest, sub['ri'], serializations = serializations):
 					L.isDebug and L.logDebug(f'Notification failed for: {uri}')
 					return False
 				return True
 
+		if self.deliveryRunning and not self._isDeliveryWorker():
+			self._queueSubscriptionNotification(sub, sender)
+			return True
+		return self._deliverSubscriptionNotification(sub, sender)
+
+
+	def _deliverSubscriptionNotification(self, sub:JSON, sender:SenderFunction) -> bool:
+		"""	Send a subscription notification to all its targets and handle the
+			subscription's expiration counter.
+
+			Args:
+				sub: The internal subscription structure, NOT the <sub> resource.
+				sender: The sender callback function for a single target.
+			Return:
+				True if the notification was sent successfully to all targets.
+		"""
+		# The subscription may have been removed in the meantime by an earlier notification.
+		if sub['exc'] and not CSE.storage.getSubscription(sub['ri']):
+			L.isDebug and L.logDebug(f'Subscription: {sub["ri"]} not found. Skipping notification')
+			return False
+
 		result = self._sendNotification(sub['nus'], sender)	# ! This is not a <sub> resource, but the internal data structure, therefore 'nus
 
 		# Handle subscription expiration in case of a successful notification
-		if result and (exc := sub['exc']):
+		if result and sub['exc']:
+			self._decrementExpirationCounter(sub['ri'])
+		return result								
+
+
+	def _decrementExpirationCounter(self, ri:str) -> None:
+		"""	Decrement the expirationCounter of a subscription after a successful notification,
+			and remove the subscription when the counter expires.
+
+			Args:
+				ri: Resource ID of the subscription.
+		"""
+		with self.lockExpirationCounters:
+			# Get the current expirationCounter from the resource. The subscription may also have
+			# been removed in the meantime by an earlier notification.
+			if not (res := CSE.storage.retrieveResource(ri = ri)).status:
+				L.isDebug and L.logDebug(f'Subscription: {ri} not found. Skipping expirationCounter')
+				return
+			subResource = res.resource
+			if not (exc := subResource.exc):
+				return
 			L.isDebug and L.logDebug(f'Decrement expirationCounter: {exc} -> {exc-1}')
 
 			exc -= 1
-			subResource = CSE.storage.retrieveResource(ri=sub['ri']).resource
 			if exc < 1:
 				L.isDebug and L.logDebug(f'expirationCounter expired. Removing subscription: {subResource.ri}')
 				CSE.dispatcher.deleteResource(subResource)	# This also deletes the internal sub
@@ -448,26 +627,73 @@ class NotificationManager(object):
 				subResource.setAttribute('exc', exc)		# Update the exc attribute
 				subResource.dbUpdate()						# Update the real subscription
 				CSE.storage.updateSubscription(subResource)	# Also update the internal sub
-		return result								
 
 
 	def _sendNotification(self, uris:Union[str, list[str]], senderFunction:SenderFunction) -> bool:
 		"""	Send a notification to a single or to multiple targets if necessary. 
 		
 			Call the infividual callback functions to do the resource preparation and the the actual sending.
+			Multiple targets are notified in parallel, and a failure for one target doesn't prevent
+			the notification of the other targets.
 
-			Returns True, even when nothing was sent.
+			Returns True, even when nothing was sent, or False if the notification failed for at least one target.
 		"""
 		#	Event when notification is happening, not sent
 		CSE.event.notification() # type: ignore
 
 		if isinstance(uris, str):
 			return senderFunction(uris)
-		else:
-			for uri in uris:
-				if not senderFunction(uri):
-					return False
-		return True
+		if len(uris) > 1 and self.maxParallelTargets > 1:
+			return self._sendNotificationParallel(uris, senderFunction)
+		return all([ senderFunction(uri) for uri in uris ])	# list, so that all targets are notified
+
+
+	def _sendNotificationParallel(self, uris:list[str], senderFunction:SenderFunction) -> bool:
+		"""	Send a notification to multiple targets in parallel. At most *maxParallelTargets* targets
+			are notified at the same time. The calling thread takes part in sending and returns when
+			all targets were notified.
+
+			Args:
+				uris: List of notification targets.
+				senderFunction: The sender callback function for a single target.
+			Return:
+				True if the notification was sent successfully to all targets.
+		"""
+		pending = list(uris)
+		results:list[bool] = []
+		lock = Lock()
+		isDeliveryWorker = self._isDeliveryWorker()	# Retries depend on this, so pass it on to the helper threads
+
+		def _sender() -> None:
+			while True:
+				with lock:
+					if not pending:
+						return
+					uri = pending.pop(0)
+				try:
+					result = senderFunction(uri)
+				except Exception as e:
+					L.logErr(f'Error sending notification to: {uri}', exc = e)
+					result = False
+				with lock:
+					results.append(result)
+
+		def _job(finished:Event) -> None:
+			self.deliveryContext.isDeliveryWorker = isDeliveryWorker
+			try:
+				_sender()
+			finally:
+				self.deliveryContext.isDeliveryWorker = False	# The thread may be re-used for other jobs
+				finished.set()
+
+		jobsFinished:list[Event] = []
+		for _ in range(min(len(uris), self.maxParallelTargets) - 1):
+			jobsFinished.append(finished := Event())
+			BackgroundWorkerPool.runJob(lambda finished = finished: _job(finished), name = 'notificationFanOut')	# type: ignore[misc]
+		_sender()
+		for finished in jobsFinished:
+			finished.wait()
+		return len(results) == len(uris) and all(results)
 
 
 	def _sendRequest(self, uri:str, 
@@ -475,7 +701,8 @@ class NotificationManager(object):
 						   parameters:Parameters = None, 
 						   originator:str = None,
 						   noAccessIsError:bool = False,
-						   ct:ContentSerializationType = None) -> Result:
+						   ct:ContentSerializationType = None,
+						   serializations:dict[int, str|bytes|JSON] = None) -> Result:
 		"""	Send a Notification request to a single target.
 		"""
 		return CSE.request.sendNotifyRequest(	uri, 
@@ -483,7 +710,451 @@ class NotificationManager(object):
 												data = notificationRequest,
 												parameters = parameters,
 												ct = ct,
-												noAccessIsError = noAccessIsError)
+												noAccessIsError = noAccessIsError,
+												serializations = serializations)
+
+
+	##########################################################################
+	#
+	#	Notification delivery
+	#
+
+	def notificationQueueStatistics(self) -> JSON:
+		"""	Return statistics about the background delivery of subscription notifications.
+
+			Return:
+				Dictionary with the number of delivery workers, the number of notifications currently waiting in the queues,
+				the number of these notifications that are held back until a retry to the same target is sent, the number
+				of scheduled retries, the number of delivered notifications, the average and maximum latency (in seconds)
+				between raising and sending a notification, the number of suspended targets, and the number of dead letters.
+		"""
+		with self.lockNotificationTargets:
+			suspendedTargets = len([ target for target in self.notificationTargets.values() if target.circuitOpen ])
+			deadLetters = len(self.deadLetters)
+		with self.lockDeliveries:
+			queued = self.queuedDeliveries
+			held = sum([ len(self.deliveryQueues.get(key, [])) for key in self.retryingDeliveries ])
+		with self.lockNotificationRetries:
+			retries = len(self.notificationRetries)
+		with self.lockDeliveryStatistics:
+			return {
+				'workers'		: len(self.deliveryActors),
+				'queued'		: queued,
+				'held'			: held,
+				'retries'		: retries,
+				'delivered'		: self.deliveredNotifications,
+				'avgLatency'	: self.deliveryLatencyTotal / self.deliveredNotifications if self.deliveredNotifications else 0.0,
+				'maxLatency'	: self.deliveryLatencyMax,
+				'suspended'		: suspendedTargets,
+				'deadLetters'	: deadLetters
+			}
+
+
+	def _startDeliveryWorkers(self) -> None:
+		"""	Start the delivery workers. Nothing is started if notifications are configured to be sent synchronously.
+		"""
+		if self.deliveryWorkers <= 0:
+			L.isDebug and L.logDebug('Sending subscription notifications synchronously')
+			return
+		L.isDebug and L.logDebug(f'Starting {self.deliveryWorkers} notification delivery workers')
+		self.deliveryRunning = True
+		for index in range(self.deliveryWorkers):
+			worker = BackgroundWorkerPool.newActor(self._deliveryActor, name = f'notificationDelivery_{index}', ignoreException = True)
+			self.deliveryActors.append(worker)
+			worker.start()
+		self.notificationRetryWorker = BackgroundWorkerPool.newWorker(self.notificationRetryIdleInterval, self._notificationRetryWorker, 'notificationRetry', startWithDelay = True, runOnTime = False).start()
+
+
+	def _stopDeliveryWorkers(self) -> None:
+		"""	Send the remaining queued notifications (if possible within a short time) and stop the delivery workers.
+			Notifications that are held back until a retry is sent are not waited for.
+		"""
+		if not self.deliveryRunning:
+			return
+		DateUtils.waitFor(5.0, lambda: not self.activeDeliveries)
+		with self.lockDeliveries:
+			self.deliveryRunning = False
+			self.lockDeliveries.notify_all()	# Don't block callers that wait for free space in the queues
+		if self.notificationRetryWorker:
+			self.notificationRetryWorker.stop()
+			self.notificationRetryWorker = None
+		for worker in self.deliveryActors:
+			worker.stop()
+		self.deliveryActors.clear()
+
+
+	def _deliveryActor(self) -> bool:
+		"""	Actor that sends the subscription notifications, and the retries of failed notifications. 
+		
+			Each time it takes the next notification from one of the delivery queues that are ready. A queue
+			is served by only one worker at a time, and it is not ready while a retry of a failed notification 
+			to its target is pending.
+
+			Return:
+				True when the worker is stopped.
+		"""
+		self.deliveryContext.isDeliveryWorker = True
+		try:
+			while self.deliveryRunning:
+				try:
+					key = self.readyDeliveries.get(block = True, timeout = 1.0)
+				except Empty:
+					continue
+				with self.lockDeliveries:
+					if not (jobs := self.deliveryQueues.get(key)):	# Discarded in the meantime
+						self.activeDeliveries.discard(key)
+						continue
+					job, raisedAt, isRetry = jobs.popleft()
+					if not isRetry:
+						self.queuedDeliveries -= 1
+						self.lockDeliveries.notify_all()
+				ri, uri = key
+				try:
+					if isRetry and self._isSubscriptionRemoved(ri):
+						L.isDebug and L.logDebug(f'Subscription: {ri} not found. Skipping notification retry to: {uri}')
+					else:
+						self._runDelivery(ri, job, raisedAt)
+				finally:
+					isRetry or self._finishPendingDelivery(ri)
+					with self.lockDeliveries:
+						self.activeDeliveries.discard(key)
+						if jobs:
+							self._readyDeliveryQueue(key)
+						elif self.deliveryQueues.get(key) is jobs:
+							del self.deliveryQueues[key]
+		finally:
+			self.deliveryContext.isDeliveryWorker = False	# The thread may be re-used for other jobs
+		return True
+
+
+	def _runDelivery(self, ri:str, job:DeliveryJob, raisedAt:float) -> None:
+		"""	Run a delivery job and record its latency.
+
+			Args:
+				ri: Resource ID of the subscription.
+				job: The job that sends the notification.
+				raisedAt: Time when the notification was raised or its retry became due.
+		"""
+		try:
+			job()
+		except Exception as e:
+			L.logErr(f'Error sending notification for subscription: {ri}', exc = e)
+		latency = DateUtils.utcTime() - raisedAt
+		with self.lockDeliveryStatistics:
+			self.deliveredNotifications += 1
+			self.deliveryLatencyTotal += latency
+			self.deliveryLatencyMax = max(self.deliveryLatencyMax, latency)
+
+
+	def _readyDeliveryQueue(self, key:Tuple[str, str]) -> None:
+		"""	Hand a delivery queue to the workers if it has notifications to send, and if it is not served
+			by a worker already and no retry to its target is pending. This must be called while holding
+			*lockDeliveries*.
+
+			Args:
+				key: Tuple (subscription ri, target) of the delivery queue.
+		"""
+		if key not in self.activeDeliveries and key not in self.retryingDeliveries and self.deliveryQueues.get(key):
+			self.activeDeliveries.add(key)
+			self.readyDeliveries.put(key)
+
+
+	def _queueSubscriptionNotification(self, sub:JSON, sender:SenderFunction) -> None:
+		"""	Add a subscription notification to the delivery queues of the subscription's targets.
+			The targets are notified independently of each other, and the subscription's expiration
+			counter is handled when the notification was sent to all of them.
+			This blocks the caller when too many notifications are waiting to be sent.
+
+			Args:
+				sub: The internal subscription structure, NOT the <sub> resource.
+				sender: The sender callback function for a single target.
+		"""
+		ri = sub['ri']
+		nus = sub['nus']
+		results:list[bool] = []
+		lockResults = Lock()
+
+		def _job(uri:str) -> bool:
+			result = False
+			try:
+				if sub['exc'] and not CSE.storage.getSubscription(ri):	# The subscription may have been removed by an earlier notification
+					L.isDebug and L.logDebug(f'Subscription: {ri} not found. Skipping notification')
+				else:
+					result = sender(uri)
+			finally:
+				with lockResults:
+					results.append(result)
+					sentToAll = len(results) == len(nus) and all(results)
+				if sentToAll and sub['exc']:
+					self._decrementExpirationCounter(ri)
+			return result
+
+		#	Event when notification is happening, not sent
+		CSE.event.notification() # type: ignore
+		raisedAt = DateUtils.utcTime()
+		for uri in nus:
+			self._addPendingDelivery(ri)
+			with self.lockDeliveries:
+				self.lockDeliveries.wait_for(lambda: self.queuedDeliveries < self.deliveryCapacity or not self.deliveryRunning)
+				self.deliveryQueues.setdefault(key := (ri, uri), deque()).append((lambda uri = uri: _job(uri), raisedAt, False))	# type: ignore[misc]
+				self.queuedDeliveries += 1
+				self._readyDeliveryQueue(key)
+
+
+	def _addPendingDelivery(self, ri:str) -> None:
+		"""	Count a queued notification of a subscription as not sent yet.
+
+			Args:
+				ri: Resource ID of the subscription.
+		"""
+		with self.pendingDeliveriesChanged:
+			self.pendingDeliveries[ri] = self.pendingDeliveries.get(ri, 0) + 1
+
+
+	def _finishPendingDelivery(self, ri:str) -> None:
+		"""	Count a queued notification of a subscription as sent, and wake up the threads
+			that wait for the subscription's notifications.
+
+			Args:
+				ri: Resource ID of the subscription.
+		"""
+		with self.pendingDeliveriesChanged:
+			if (pending := self.pendingDeliveries.get(ri, 0)) > 1:
+				self.pendingDeliveries[ri] = pending - 1
+			else:
+				self.pendingDeliveries.pop(ri, None)
+				self.pendingDeliveriesChanged.notify_all()
+
+
+	def _waitForDeliveries(self, ri:str) -> None:
+		"""	Wait until all queued notifications of a subscription have been sent. Notifications of
+			other subscriptions, and retries of failed notifications, are not waited for.
+
+			Args:
+				ri: Resource ID of the subscription.
+		"""
+		if not self.deliveryRunning or self._isDeliveryWorker():	# A worker must not wait for itself
+			return
+		with self.pendingDeliveriesChanged:
+			self.pendingDeliveriesChanged.wait_for(lambda: ri not in self.pendingDeliveries, timeout = CSE.request.requestExpirationDelta)
+
+
+	def _isDeliveryWorker(self) -> bool:
+		"""	Check whether the current thread is one of the delivery workers. Notifications raised
+			by a delivery worker are sent directly to avoid waiting for the (full) queues.
+		"""
+		return getattr(self.deliveryContext, 'isDeliveryWorker', False)
+
+
+	##########################################################################
+	#
+	#	Notification retries and dead letters
+	#
+
+	def getNotificationTargets(self) -> dict[str, NotificationTarget]:
+		"""	Return the delivery state of the notification targets that recently failed.
+
+			Return:
+				Dictionary of target URIs and copies of their delivery states.
+		"""
+		with self.lockNotificationTargets:
+			return { uri: NotificationTarget(target.failures, target.nextAttempt, target.circuitOpen, target.probing) for uri, target in self.notificationTargets.items() }
+
+
+	def getDeadLetters(self) -> list[JSON]:
+		"""	Return the notifications that could not be delivered, the oldest first.
+
+			Return:
+				List of dictionaries with the timestamp (*ts*), subscription (*sub*), target (*nu*), reason (*dbg*),
+				and the notification request (*request*).
+		"""
+		with self.lockNotificationTargets:
+			return list(self.deadLetters)
+
+
+	def _sendSubscriptionRequest(self, uri:str, 
+										notificationRequest:JSON, 
+										ri:str, 
+										parameters:Parameters = None, 
+										serializations:dict[int, str|bytes|JSON] = None,
+										attempt:int = 0) -> bool:
+		"""	Send a subscription notification to a single target. A failed notification that is sent by a
+			delivery worker is scheduled to be sent again after an exponential backoff time. The worker
+			doesn't wait for this, but continues with the next notifications in its queue.
+			
+			Notifications to a target that failed repeatedly are not sent until the target's next attempt 
+			time is reached, but are added to the dead letters instead. Then only a single notification
+			is sent to check whether the target is reachable again.
+
+			Args:
+				uri: The notification target.
+				notificationRequest: The notification to send.
+				ri: Resource ID of the subscription.
+				parameters: Optional request parameters.
+				serializations: Optional dictionary of already serialized notifications, per content serialization type value.
+				attempt: Number of the previous attempts to send this notification.
+			Return:
+				True if the notification was sent successfully. False if it failed, even if it is sent again later.
+		"""
+		probing = False
+		with self.lockNotificationTargets:
+			if (target := self.notificationTargets.get(uri)) and target.circuitOpen:
+				if target.probing or DateUtils.utcTime() < target.nextAttempt:
+					L.isDebug and L.logDebug(f'Notifications to target: {uri} are suspended')
+					self._addDeadLetter(ri, uri, notificationRequest, 'notifications to target are suspended')
+					return False
+				target.probing = probing = True	# Only this notification checks whether the target is reachable again
+
+		try:
+			res = self._sendRequest(uri, notificationRequest, parameters = parameters, serializations = serializations)
+		except Exception:
+			if probing:
+				with self.lockNotificationTargets:
+					target.probing = False
+			raise
+		if res.status:
+			with self.lockNotificationTargets:
+				self.notificationTargets.pop(uri, None)	# Target is (again) reachable
+			return True
+
+		# Send the notification again later. Notifications that are sent synchronously are not retried
+		if not probing and attempt < self.retryAttempts and self.deliveryRunning and self._isDeliveryWorker() and \
+		   self._scheduleNotificationRetry(ri, 
+										   uri,
+										   lambda: self._sendSubscriptionRequest(uri, notificationRequest, ri, parameters, serializations, attempt + 1),
+										   self.retryInterval * 2 ** attempt):
+			L.isDebug and L.logDebug(f'Retrying notification to: {uri} ({attempt + 1}/{self.retryAttempts})')
+			return False
+
+		with self.lockNotificationTargets:
+			target = self.notificationTargets.setdefault(uri, NotificationTarget())
+			target.probing = False
+			target.failures += 1
+			if target.failures >= self.failureThreshold:
+				target.circuitOpen = True
+				target.nextAttempt = DateUtils.utcTime() + min(self.retryInterval * 2 ** (target.failures - self.failureThreshold), self.maxRetryInterval)
+				if target.failures == self.failureThreshold:
+					L.isWarn and L.logWarn(f'Suspending notifications to target: {uri} after {target.failures} failed notifications')
+			self._addDeadLetter(ri, uri, notificationRequest, res.dbg)
+		return False
+
+
+	def _scheduleNotificationRetry(self, ri:str, uri:str, job:DeliveryJob, delay:float) -> bool:
+		"""	Schedule a failed notification to be put into the delivery queue of its subscription and target
+			again. Until then, later notifications to the target are held back.
+			A retry doesn't count as a pending notification of the subscription, so removing the
+			subscription doesn't wait for it.
+
+			Args:
+				ri: Resource ID of the subscription.
+				uri: The notification target.
+				job: The job that sends the notification again.
+				delay: Time in seconds after which the notification is sent again.
+			Return:
+				True if the retry is scheduled, or False if the subscription is being removed.
+		"""
+		with self.lockDeliveries:
+			if ri in self.removedSubscriptions:
+				return False
+			self.retryingDeliveries.add((ri, uri))
+		with self.lockNotificationRetries:
+			heapq.heappush(self.notificationRetries, (due := DateUtils.utcTime() + delay, self.notificationRetrySequence, ri, uri, job))
+			self.notificationRetrySequence += 1
+		if (worker := self.notificationRetryWorker):
+			worker.runEarlier(due)
+		return True
+
+
+	def _notificationRetryWorker(self) -> bool:
+		"""	Worker that puts the failed notifications whose retry time has come back into the front of their
+			delivery queues.
+		"""
+		now = DateUtils.utcTime()
+		dueRetries:list[Tuple[float, int, str, str, DeliveryJob]] = []
+		with self.lockNotificationRetries:
+			while self.notificationRetries and self.notificationRetries[0][0] <= now:
+				dueRetries.append(heapq.heappop(self.notificationRetries))
+		with self.lockDeliveries:
+			for _, _, ri, uri, job in dueRetries:
+				self.retryingDeliveries.discard(key := (ri, uri))
+				self.deliveryQueues.setdefault(key, deque()).appendleft((job, now, True))
+				self._readyDeliveryQueue(key)
+
+		# Run again when the next retry is due
+		with self.lockNotificationRetries:
+			delay = self.notificationRetryIdleInterval
+			if self.notificationRetries:
+				delay = min(delay, max(self.notificationRetries[0][0] - DateUtils.utcTime(), 0.0) + 0.01)	# add a bit to make sure the retry is due
+		if (worker := self.notificationRetryWorker):
+			worker.interval = delay
+		return True
+
+
+	def _cancelNotificationRetries(self, ri:str) -> None:
+		"""	Discard the scheduled retries of the failed notifications of a subscription that is being
+			removed, and the notifications that are held back until these retries are sent. No new
+			retries are scheduled for the subscription until `_forgetRemovedSubscription()` is called.
+			Retries that are already put back into a delivery queue are skipped.
+
+			Args:
+				ri: Resource ID of the subscription.
+		"""
+		held = 0
+		with self.lockDeliveries:
+			self.removedSubscriptions.add(ri)
+			for key in [ key for key in self.retryingDeliveries if key[0] == ri ]:
+				self.retryingDeliveries.discard(key)
+				if (jobs := self.deliveryQueues.pop(key, None)):
+					held += len([ job for job in jobs if not job[2] ])
+			self.queuedDeliveries -= held
+			self.lockDeliveries.notify_all()
+		if held:
+			L.isDebug and L.logDebug(f'Discarding {held} held back notifications for subscription: {ri}')
+			for _ in range(held):
+				self._finishPendingDelivery(ri)
+		with self.lockNotificationRetries:
+			if len(retries := [ retry for retry in self.notificationRetries if retry[2] != ri ]) < len(self.notificationRetries):
+				L.isDebug and L.logDebug(f'Discarding {len(self.notificationRetries) - len(retries)} notification retries for subscription: {ri}')
+				heapq.heapify(retries)
+				self.notificationRetries = retries
+
+
+	def _forgetRemovedSubscription(self, ri:str) -> None:
+		"""	Forget a subscription that was removed. Retries that may still be queued for it are
+			skipped because the subscription doesn't exist anymore.
+
+			Args:
+				ri: Resource ID of the subscription.
+		"""
+		with self.lockDeliveries:
+			self.removedSubscriptions.discard(ri)
+
+
+	def _isSubscriptionRemoved(self, ri:str) -> bool:
+		"""	Check whether a subscription is being removed or doesn't exist anymore.
+
+			Args:
+				ri: Resource ID of the subscription.
+			Return:
+				True if the subscription is being removed or doesn't exist.
+		"""
+		with self.lockDeliveries:
+			if ri in self.removedSubscriptions:
+				return True
+		return not CSE.storage.getSubscription(ri)
+
+
+	def _addDeadLetter(self, ri:str, uri:str, notificationRequest:JSON, dbg:str) -> None:
+		"""	Add a notification that could not be delivered to the dead letters. The oldest dead
+			letter is removed when the maximum number is reached. This must be called while holding
+			*lockNotificationTargets*.
+		"""
+		self.deadLetters.append({	'ts'		: DateUtils.utcTime(),
+									'sub'		: ri,
+									'nu'		: uri,
+									'dbg'		: dbg,
+									'request'	: notificationRequest
+								})
 
 
 	##########################################################################
@@ -503,8 +1174,7 @@ class NotificationManager(object):
 		if sub := CSE.storage.getSubscription(ri):
 			ln = sub['ln'] if 'ln' in sub else False
 			for nu in sub['nus']:
-				self._stopNotificationBatchWorker(ri, nu)						# Stop a potential worker for that particular batch
-				self._sendSubscriptionAggregatedBatchNotification(ri, nu, ln)	# Send all remaining notifications
+				self._sendSubscriptionAggregatedBatchNotification(ri, nu, ln)	# Send all remaining notifications. This also stops the timer
 
 
 	def _storeBatchNotification(self, nu:str, sub:JSON, notificationRequest:JSON) -> bool:
@@ -512,29 +1182,34 @@ class NotificationManager(object):
 		"""
 		L.isDebug and L.logDebug(f'Store batch notification nu: {nu}')
 
-		# Rename key name
+		# Rename key name. The notification request itself is shared by all targets and must not be changed
 		if 'm2m:sgn' in notificationRequest:
-			notificationRequest['sgn'] = notificationRequest.pop('m2m:sgn')
+			notificationRequest = { 'sgn' : notificationRequest['m2m:sgn'] }
 
-		# Alway add the notification first before doing the other handling
+		# Alway add the notification first before doing the other handling. The buffer and the 
+		# stored notifications are changed together, so that a batch that is sent concurrently
+		# doesn't remove a stored notification that is not part of it
 		ri = sub['ri']
-		CSE.storage.addBatchNotification(ri, nu, notificationRequest)
+		with self.lockBatchBuffers:
+			if self.persistBatchNotifications:
+				CSE.storage.addBatchNotification(ri, nu, notificationRequest)
+			(batch := self.batchNotifications.setdefault((ri, nu), [])).append(notificationRequest)
+			cnt = len(batch)
 
 		#  Check for actions
-		if (num := Utils.findXPath(sub, 'bn/num')) and (cnt := CSE.storage.countBatchNotifications(ri, nu)) >= num:
+		if (num := Utils.findXPath(sub, 'bn/num')) and cnt >= num:
 			L.isDebug and L.logDebug(f'Sending batch notification: bn/num: {num}  countBatchNotifications: {cnt}')
 
 			ln = sub['ln'] if 'ln' in sub else False
-			self._stopNotificationBatchWorker(ri, nu)	# Stop the worker, not needed
-			self._sendSubscriptionAggregatedBatchNotification(ri, nu, ln)
+			self._sendSubscriptionAggregatedBatchNotification(ri, nu, ln)	# This also stops the timer
 
-		# Check / start Timer worker to guard the batch notification duration
+		# Check / start Timer to guard the batch notification duration
 		else:
 			try:
 				dur = isodate.parse_duration(Utils.findXPath(sub, 'bn/dur')).total_seconds()
 			except Exception:
 				return False
-			self._startNewBatchNotificationWorker(ri, nu, dur)
+			self._startBatchNotificationTimer(ri, nu, dur)
 		return True
 
 
@@ -544,14 +1219,18 @@ class NotificationManager(object):
 		with self.lockBatchNotification:
 			L.isDebug and L.logDebug(f'Sending aggregated subscription notifications for ri: {ri}')
 
-			# Collect the stored notifications for the batch and aggregate them
-			notifications = []
-			for notification in sorted(CSE.storage.getBatchNotifications(ri, nu), key = lambda x: x['tstamp']):	# type: ignore[no-any-return] # sort by timestamp added
-				if n := Utils.findXPath(notification['request'], 'sgn'):
-					notifications.append(n)
-			if len(notifications) == 0:	# This can happen when the subscription is deleted and there are no outstanding notifications
+			# Take the buffered notifications for the batch, stop its timer, and delete the stored notifications
+			with self.lockBatchBuffers:
+				batch = self.batchNotifications.pop((ri, nu), None)
+				self.batchNotificationDue.pop((ri, nu), None)
+				if batch and self.persistBatchNotifications and not CSE.storage.removeBatchNotifications(ri, nu):
+					L.isWarn and L.logWarn('Error removing aggregated batch notifications')
+			if not batch:	# This can happen when the subscription is deleted and there are no outstanding notifications
 				return False
 
+			# Aggregate the notifications
+			notifications = [ n for notification in batch if (n := notification.get('sgn')) ]
+
 			additionalParameters = None
 			if ln:
 				notifications = notifications[-1:]
@@ -568,13 +1247,8 @@ class NotificationManager(object):
 			#		 if it is a resource. only determine which poa and the ct later (ie here).
 			#
 
-			# Delete old notifications
-			if not CSE.storage.removeBatchNotifications(ri, nu):
-				L.isWarn and L.logWarn('Error removing aggregated batch notifications')
-				return False
-
 			# Send the request
-			if not self._sendRequest(nu, notificationRequest, parameters = additionalParameters).status:
+			if not self._sendSubscriptionRequest(nu, notificationRequest, ri, parameters = additionalParameters):
 				L.isWarn and L.logWarn('Error sending aggregated batch notifications')
 				return False
 
@@ -589,22 +1263,82 @@ class NotificationManager(object):
 	# 	return Result(status=True) if CSE.storage.updateSubscription(subscription) else Result(status=False, rsc=RC.internalServerError, dbg='cannot update subscription in database')
 
 
-	def _startNewBatchNotificationWorker(self, ri:str, nu:str, dur:float) -> bool:
+	def _startBatchNotificationTimer(self, ri:str, nu:str, dur:float) -> bool:
+		"""	Start the timer for the duration of a batch, if not already started.
+
+			Args:
+				ri: Resource ID of the subscription.
+				nu: The notification target.
+				dur: The batch duration in seconds.
+			Return:
+				True if the timer is running.
+		"""
 		if dur is None or dur < 1:	
 			L.logErr('BatchNotification duration is < 1')
 			return False
-		# Check and start a notification worker to send notifications after some time
-		if len(BackgroundWorkerPool.findWorkers(self._workerID(ri, nu))) > 0:	# worker started, return
-			return True
-		L.isDebug and L.logDebug(f'Starting new batchNotificationsWorker. Duration : {dur:f} seconds')
-		BackgroundWorkerPool.newActor(self._sendSubscriptionAggregatedBatchNotification, delay=dur, name=self._workerID(ri, nu)).start(ri=ri, nu=nu)
-		return True
+		# Check and start a timer to send notifications after some time
+		with self.lockBatchBuffers:
+			if (ri, nu) in self.batchNotificationDue:	# timer started, return
+				return True
+			L.isDebug and L.logDebug(f'Starting new batchNotification timer. Duration : {dur:f} seconds')
+			self.batchNotificationDue[(ri, nu)] = (due := DateUtils.utcTime() + dur)
+			heapq.heappush(self.batchNotificationTimers, (due, ri, nu))
 
+		# Run the timer worker earlier if this batch is due before its next scheduled run
+		if (worker := self.batchNotificationWorker):
+			worker.runEarlier(due + 0.01)	# add a bit to make sure the batch is due
+		return True
 
-	def _stopNotificationBatchWorker(self, ri:str, nu:str) -> None:
-		BackgroundWorkerPool.stopWorkers(self._workerID(ri, nu))
 
+	def _batchNotificationTimerWorker(self) -> bool:
+		"""	Worker that sends the batch notifications whose batch duration has passed.
+		"""
+		now = DateUtils.utcTime()
+		dueBatches:list[Tuple[str, str]] = []
+		with self.lockBatchBuffers:
+			while self.batchNotificationTimers and self.batchNotificationTimers[0][0] <= now:
+				due, ri, nu = heapq.heappop(self.batchNotificationTimers)
+				if self.batchNotificationDue.get((ri, nu)) == due:	# ignore timers of batches that were already sent
+					dueBatches.append((ri, nu))
+		for ri, nu in dueBatches:
+			self._sendSubscriptionAggregatedBatchNotification(ri, nu)
+
+		# Run again when the next batch is due
+		if self.batchNotificationWorker:
+			self.batchNotificationWorker.interval = self._nextBatchNotificationDelay()
+		return True
 
-	def _workerID(self, ri:str, nu:str) -> str:
-		return f'{ri};{nu}'
 
+	def _nextBatchNotificationDelay(self) -> float:
+		"""	Return the number of seconds until the next batch is due, limited by the
+			*batchNotificationIdleInterval*.
+		"""
+		with self.lockBatchBuffers:
+			timers = self.batchNotificationTimers
+			while timers and self.batchNotificationDue.get((timers[0][1], timers[0][2])) != timers[0][0]:
+				heapq.heappop(timers)	# remove outdated entries
+			if not timers:
+				return self.batchNotificationIdleInterval
+			return min(self.batchNotificationIdleInterval, max(timers[0][0] - DateUtils.utcTime(), 0.0) + 0.01)	# add a bit to make sure the batch is due
+
+
+	def _restoreBatchNotifications(self) -> None:
+		"""	Restore the batch notifications that were stored in the database, and restart
+			their timers. Stored batch notifications are removed from the database if they
+			are not persisted anymore.
+		"""
+		for notification in CSE.storage.getBatchNotifications():
+			with self.lockBatchBuffers:
+				self.batchNotifications.setdefault((notification['ri'], notification['nu']), []).append(notification['request'])
+		for ri, nu in list(self.batchNotifications.keys()):
+			if not self.persistBatchNotifications:
+				CSE.storage.removeBatchNotifications(ri, nu)
+			if not (sub := CSE.storage.getSubscription(ri)):	# subscription doesn't exist anymore
+				with self.lockBatchBuffers:
+					self.batchNotifications.pop((ri, nu), None)
+				CSE.storage.removeBatchNotifications(ri, nu)
+				continue
+			try:
+				self._startBatchNotificationTimer(ri, nu, isodate.parse_duration(Utils.findXPath(sub, 'bn/dur')).total_seconds())
+			except Exception:
+				pass
@@ -28,6 +28,8 @@ class RegistrationManager(object):
 
 		# Start expiration Monitor
 		self.expWorker:BackgroundWorker	= None
+		self.expirationRetries:set[str]	= set()		# ri of expired resources that could not be deleted
+		self.expirationRetryTime:float	= 0.0		# UTC timestamp when to try deleting them again
 		self.startExpirationMonitor()
 		
 		# Add handler for configuration updates
@@ -36,6 +38,10 @@ class RegistrationManager(object):
 		# Add a handler when the CSE is reset
 		CSE.event.addHandler(CSE.event.cseReset, self.restart)	# type: ignore
 
+		# Add handlers to reschedule the expiration monitor for resources that expire earlier
+		CSE.event.addHandler(CSE.event.createResource, self._scheduleExpiration)		# type: ignore
+		CSE.event.addHandler(CSE.event.updateResource, self._scheduleExpiration)		# type: ignore
+
 		L.isInfo and L.log('RegistrationManager initialized')
 
 
@@ -63,6 +69,7 @@ class RegistrationManager(object):
 		"""	Restart the registration services.
 		"""
 		self._getConfig()
+		self.expirationRetries.clear()
 		self.restartExpirationMonitor()
 		L.isDebug and L.logDebug('RegistrationManager restarted')
 
@@ -193,6 +200,7 @@ class RegistrationManager(object):
 	def handleAEDeRegistration(self, resource: Resource) -> bool:
 		# More De-registration functions happen in the AE's deactivate() method
 		L.isDebug and L.logDebug(f'DeRegistering AE. aei: {resource.aei}')
+		CSE.security.invalidateAccessDecisions(resource.aei)
 		return True
 
 
@@ -235,6 +243,7 @@ class RegistrationManager(object):
 
 	def handleCSRDeRegistration(self, csr:Resource) ->  bool:
 		L.isDebug and L.logDebug(f'DeRegistering CSR. csi: {csr.csi}')
+		CSE.security.invalidateAccessDecisions(csr.csi)
 		# send event
 		CSE.event.remoteCSEHasDeregistered(csr)	# type: ignore
 		return True
@@ -322,19 +331,54 @@ class RegistrationManager(object):
 	def expirationDBMonitor(self) -> bool:
 		# L.isDebug and L.logDebug('Looking for expired resources')
 		now = DateUtils.getResourceDate()
-		resources = CSE.storage.searchByFilter(lambda r: (et := r.get('et'))  and et < now)
+		resources = CSE.storage.expiredResources(now)
+
+		# Expired resources that could not be deleted are not in the expiration index anymore.
+		# Try them again, but only every checkExpirationsInterval seconds.
+		if self.expirationRetries and DateUtils.utcTime() >= self.expirationRetryTime:
+			ris = self.expirationRetries
+			self.expirationRetries = set()
+			resources.extend([ resource for ri in ris 
+										if (resource := CSE.storage.retrieveResource(ri = ri).resource) and (et := resource.et) and et < now ])
+
 		for resource in resources:
 			# try to retrieve the resource first bc it might have been deleted as a child resource
 			# of an expired resource
 			if not CSE.storage.hasResource(ri=resource.ri):
 				continue
 			L.isDebug and L.logDebug(f'Expiring resource (and child resouces): {resource.ri}')
-			CSE.dispatcher.deleteResource(resource, withDeregistration = True)	# ignore result
+			if not CSE.dispatcher.deleteResource(resource, withDeregistration = True).status and CSE.storage.hasResource(ri = resource.ri):
+				L.isDebug and L.logDebug(f'Cannot delete expired resource: {resource.ri}. Trying again later')
+				if not self.expirationRetries:
+					self.expirationRetryTime = DateUtils.utcTime() + self.checkExpirationsInterval
+				self.expirationRetries.add(resource.ri)
 			CSE.event.expireResource(resource) # type: ignore
-				
+
+		# Run again when the next resource expires, but at least every checkExpirationsInterval seconds
+		if self.expWorker:
+			self.expWorker.interval = self._nextExpirationDelay()
 		return True
 
 
+	def _nextExpirationDelay(self) -> float:
+		"""	Return the number of seconds until the next resource expires, limited by the
+			*checkExpirationsInterval*.
+		"""
+		if not (et := CSE.storage.nextExpiration()):
+			return self.checkExpirationsInterval
+		return min(self.checkExpirationsInterval, max(DateUtils.timeUntilAbsRelTimestamp(et), 0.0) + 0.01)	# add a bit to make sure the resource has expired
+
+
+	def _scheduleExpiration(self, resource:Resource) -> None:
+		"""	Run the expiration monitor earlier when a created or updated resource expires
+			before the monitor's next scheduled run. This doesn't wait for the monitor when it
+			is currently running.
+		"""
+		if not self.expWorker or not (et := resource.et):
+			return
+		self.expWorker.runEarlier(DateUtils.fromAbsRelTimestamp(et) + 0.01)	# add a bit to make sure the resource has expired
+
+
 
 	#########################################################################
 
@@ -938,8 +938,12 @@ class RequestManager(object):
 		return Result.errorResult(rsc = RC.notFound, dbg = f'No target found for uri: {uri}')
 
 
-	def sendNotifyRequest(self, uri:str, originator:str, data:Any = None, parameters:Parameters = None, ct:ContentSerializationType = None, appendID:str = '', noAccessIsError:bool = False, raw:bool = False) -> Result:
+	def sendNotifyRequest(self, uri:str, originator:str, data:Any = None, parameters:Parameters = None, ct:ContentSerializationType = None, appendID:str = '', noAccessIsError:bool = False, raw:bool = False, serializations:dict[int, str|bytes|JSON] = None) -> Result:
 		"""	Send a NOTIFY request via the appropriate channel or transport protocol.
+
+			If *serializations* is given then the serialized *data* for a content serialization type (value)
+			is taken from, or added to, this dictionary. This way the same notification is serialized only
+			once when it is sent to multiple targets via http.
 		"""
 		L.isDebug and L.logDebug(f'Sending NOTIFY request to: {uri} id: {appendID} for Originator: {originator}')
 
@@ -966,6 +970,10 @@ class RequestManager(object):
 
 			if Utils.isHttpUrl(url):
 				CSE.event.httpSendNotify() # type: ignore [attr-defined]
+				if serializations is not None and not raw and isinstance(data, dict):
+					if (content := serializations.get(ct.value)) is None:
+						content = serializations[ct.value] = RequestUtils.serializeData(data, ct)
+					data = content
 				return CSE.httpServer.sendHttpRequest(Operation.NOTIFY,
 													  url,
 													  originator,
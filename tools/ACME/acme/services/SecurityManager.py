@@ -10,7 +10,9 @@
 
 from __future__ import annotations
 import ssl
-from typing import List
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterable, Iterator, List, Tuple
 
 from ..etc.Types import ResourceTypes as T, Permission, Result, CSERequest, ResponseStatusCode as RC
 from ..etc import Utils as Utils
@@ -29,6 +31,14 @@ class SecurityManager(object):
 		self.enableACPChecks 			= Configuration.get('cse.security.enableACPChecks')
 		self.fullAccessAdmin			= Configuration.get('cse.security.fullAccessAdmin')
 
+		# Cache for access decisions: (originator, acpi, permission, ty) -> decision
+		self.accessDecisionCacheSize	= Configuration.get('cse.security.accessDecisionCacheSize')
+		self.lockAccessDecisions		= Lock()
+		self.accessDecisions:OrderedDict[Tuple[str, Tuple[str, ...], Permission, T], bool] = OrderedDict()
+		self.accessDecisionGeneration	= 0		# incremented for every invalidation
+		self.accessDecisionHits			= 0
+		self.accessDecisionMisses		= 0
+
 		L.isInfo and L.log('SecurityManager initialized')
 		if self.enableACPChecks:
 			L.isInfo and L.log('ACP checking ENABLED')
@@ -53,6 +63,8 @@ class SecurityManager(object):
 
 
 	def shutdown(self) -> bool:
+		if self.accessDecisionCacheSize:
+			L.isDebug and L.logDebug(f'Access decision cache hits: {self.accessDecisionHits}, misses: {self.accessDecisionMisses}')
 		L.isInfo and L.log('SecurityManager shut down')
 		return True
 
@@ -135,7 +147,7 @@ class SecurityManager(object):
 		if resource.ty == T.CSEBase and requestedPermission & Permission.RETRIEVE:
 
 			# Allow registered AEs to RETRIEVE the CSEBase
-			if CSE.storage.retrieveResource(aei = originator).resource:
+			if CSE.storage.hasRegisteredAE(originator):
 				L.isDebug and L.logDebug(f'Allow registered AE Orignator {originator} to RETRIEVE CSEBase. OK.')
 				return True
 			
@@ -171,16 +183,7 @@ class SecurityManager(object):
 				# FALLTHROUGH to the permission checks below
 			
 			else: # handle the permission checks here
-				for a in macp:
-					if not (acp := CSE.dispatcher.retrieveResource(a).resource):
-						L.isDebug and L.logDebug(f'ACP resource not found: {a}')
-						continue
-					else:
-						if acp.checkPermission(originator, requestedPermission, ty):
-							L.isDebug and L.logDebug('Permission granted')
-							return True
-				L.isDebug and L.logDebug('Permission NOT granted')
-				return False
+				return self._checkACPs(originator, macp, requestedPermission, ty)
 
 
 		# target is an ACP or ACPAnnc resource
@@ -233,6 +236,102 @@ class SecurityManager(object):
 			return False
 
 		# Finally check the acpi
+		return self._checkACPs(originator, acpi, requestedPermission, ty)
+
+
+	def hasAccessMany(self, originator:str, 
+							resources:Iterable[Resource], 
+							requestedPermission:Permission) -> Iterator[Resource]:
+		"""	Test whether an originator has access to each of a number of resources for the requested permission,
+			e.g. for the results of a discovery.
+
+			The resources are grouped by their effective access control, i.e. by their *acpi* or, for resources
+			that inherit the access control from their parent, by their parent resource. The access of each group 
+			is only evaluated once. Resources with a special access control handling are checked individually.
+
+			The resources are consumed lazily, so that *resources* may be a generator.
+
+			Args:
+				originator: The originator to check for.
+				resources: The resources to check.
+				requestedPermission: The permission to test.
+			Return:
+				Iterator over the resources the originator has access to, in the order of *resources*.
+		"""
+		decisions:dict[Tuple[str, Tuple[str, ...]|str], bool] = {}
+		for resource in resources:
+			if (group := self._accessGroup(resource, requestedPermission)) is None:
+				granted = self.hasAccess(originator, resource, requestedPermission)
+			elif (granted := decisions.get(group)) is None:
+				granted = decisions[group] = self.hasAccess(originator, resource, requestedPermission)
+			if granted:
+				yield resource
+
+
+	def _accessGroup(self, resource:Resource, requestedPermission:Permission) -> Tuple[str, Tuple[str, ...]|str]:
+		"""	Determine the group of resources that share the same access decision with a resource.
+
+			Args:
+				resource: The resource to check.
+				requestedPermission: The permission to test.
+			Return:
+				A key for the group, or None if the access to the resource must be checked individually.
+		"""
+		if not resource or resource.ty in [ T.CSEBase, T.PCH, T.GRP, T.ACP, T.ACPAnnc ] or resource.isAnnounced():
+			return None
+		if requestedPermission == Permission.UPDATE and resource.at is not None:
+			return None
+		if acpi := resource.acpi:
+			return ('acpi', tuple(acpi))
+		if not (resource._attributes and 'acpi' in resource._attributes) and resource.inheritACP and resource.pi:
+			return ('pi', resource.pi)
+		return None	# custodian or creator
+
+
+	def _checkACPs(self, originator:str, acpi:list[str], requestedPermission:Permission, ty:T) -> bool:
+		"""	Check whether any of the referenced <ACP> resources grants the requested permission 
+			to an originator. 
+			
+			The decision is taken from the access decision cache if possible. Decisions are only
+			cached when all ACPs are hosted on this CSE, because changes to remote ACPs cannot be
+			noticed.
+
+			Args:
+				originator: The originator to check for.
+				acpi: List of <ACP> resource IDs.
+				requestedPermission: The permission to test.
+				ty: The resource type, or the type of the resource that is about to be created.
+			Return:
+				Boolean indicating access.
+		"""
+		if not self.accessDecisionCacheSize or any(a.startswith('/') and not a.startswith(CSE.cseCsiSlash) for a in acpi):
+			return self._evaluateACPs(originator, acpi, requestedPermission, ty)
+
+		key = (originator, tuple(acpi), requestedPermission, ty)
+		with self.lockAccessDecisions:
+			if (decision := self.accessDecisions.get(key)) is not None:
+				self.accessDecisions.move_to_end(key)
+				self.accessDecisionHits += 1
+				L.isDebug and L.logDebug(f'Permission {"granted" if decision else "NOT granted"} (cached)')
+				return decision
+			self.accessDecisionMisses += 1
+			generation = self.accessDecisionGeneration
+
+		decision = self._evaluateACPs(originator, acpi, requestedPermission, ty)
+
+		# Only cache the decision if no ACP has changed in the meantime
+		with self.lockAccessDecisions:
+			if generation == self.accessDecisionGeneration:
+				self.accessDecisions[key] = decision
+				while len(self.accessDecisions) > self.accessDecisionCacheSize:
+					self.accessDecisions.popitem(last = False)
+		return decision
+
+
+	def _evaluateACPs(self, originator:str, acpi:list[str], requestedPermission:Permission, ty:T) -> bool:
+		"""	Retrieve the referenced <ACP> resources and check whether any of them grants the 
+			requested permission to an originator.
+		"""
 		for a in acpi:
 			if not (acp := CSE.dispatcher.retrieveResource(a).resource):
 				L.isDebug and L.logDebug(f'ACP resource not found: {a}')
@@ -257,6 +356,32 @@ class SecurityManager(object):
 		return False
 
 
+	def accessDecisionCacheStatistics(self) -> Tuple[int, int, int]:
+		"""	Return the statistics of the access decision cache.
+
+			Return:
+				Tuple (number of cached decisions, hits, misses).
+		"""
+		return len(self.accessDecisions), self.accessDecisionHits, self.accessDecisionMisses
+
+
+	def invalidateAccessDecisions(self, originator:str = None) -> None:
+		"""	Remove the cached access decisions for an originator, or clear the whole cache
+			if *originator* is None. This must be called whenever an <ACP> resource is created,
+			updated or deleted, and when an originator de-registers.
+
+			Args:
+				originator: Optional originator whose decisions are removed.
+		"""
+		with self.lockAccessDecisions:
+			self.accessDecisionGeneration += 1
+			if originator is None:
+				self.accessDecisions.clear()
+			else:
+				for key in [ k for k in self.accessDecisions if k[0] == originator ]:
+					del self.accessDecisions[key]
+
+
 	def hasAcpiUpdatePermission(self, request:CSERequest, targetResource:Resource, originator:str) -> Result:
 		"""	Check whether this is actually a correct update of the acpi attribute, and whether this is actually allowed.
 		"""
@@ -5,27 +5,30 @@
 #	License: BSD 3-Clause License. See the LICENSE file for further details.
 #
 #	Store, retrieve and manage resources in the database. It currently relies on
-#	the document database TinyDB. It is possible to store resources either on disc
-#	or just in memory.
+#	either the document database TinyDB or on SQLite. It is possible to store 
+#	resources either on disc or just in memory.
 #
 
 from __future__ import annotations
 
-import os, shutil
-from threading import Lock
-from typing import Callable, cast, List
+import os, shutil, json, sqlite3, heapq, bisect
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock, RLock
+from typing import Any, Callable, cast, List, TextIO, Tuple
 from tinydb import TinyDB, Query
 from tinydb.storages import MemoryStorage
-from tinydb.table import Document
+from tinydb.table import Document, Table
 from tinydb.operations import delete 
 
-from ..etc.Types import ResourceTypes as T, Result, ResponseStatusCode as RC, JSON
+from ..etc.Types import ResourceTypes as T, Result, ResponseStatusCode as RC, JSON, NotificationEventType
 from ..etc import DateUtils as DateUtils
 from ..services.Configuration import Configuration
 from ..services.Logging import Logging as L
 from ..services import CSE as CSE
 from ..resources.Resource import Resource
 from ..resources import Factory
+from ..helpers.BackgroundWorker import BackgroundWorkerPool
 
 
 class Storage(object):
@@ -37,6 +40,49 @@ class Storage(object):
 		self.dbPath 	= Configuration.get('db.path')
 		self.dbReset 	= Configuration.get('db.resetOnStartup') 
 
+		# Expiration index
+		self.lockExpirations 						= Lock()
+		self.expirationHeap:list[Tuple[str, str]]	= []	# min-heap of (et, ri). Entries may be outdated
+		self.expirationTimes:dict[str, str]			= {}	# ri -> et. The valid entries of the heap
+
+		# Instance index. It is filled per parent on first access
+		self.lockInstances							= Lock()
+		self.instanceIndex:dict[Tuple[str, int], list[Tuple[str, str]]] = {}	# (pi, ty) -> sorted [(ct, ri)]
+		self.instanceSizes:dict[Tuple[str, int], int] = {}					# (pi, ty) -> sum of the instances' cs
+
+		# Label index
+		self.lockLabels								= Lock()
+		self.labelIndex:dict[str, set[str]]			= {}	# lbl -> {ri}
+		self.resourceLabels:dict[str, list[str]]	= {}	# ri -> lbl. The indexed labels of a resource
+		self.labelSrns:dict[str, str]				= {}	# ri -> srn of the labelled resources
+
+		# AE-ID index of the registered <AE> and the <AEAnnc> resources
+		self.lockAEIs								= Lock()
+		self.aeiIndex:dict[str, set[str]]			= {}	# aei -> {ri}
+		self.resourceAEIs:dict[str, str]			= {}	# ri -> aei. The indexed AE-ID of a resource
+
+		# Subscription index. Holds the documents of all subscriptions
+		self.lockSubscriptionIndex					= Lock()
+		self.subscriptionIndex:dict[Tuple[str, int], dict[str, JSON]] = {}	# (pi, net) -> {ri -> subscription document}
+		self.subscriptionParents:dict[str, dict[str, JSON]]	= {}	# pi -> {ri -> subscription document}
+		self.subscriptionDocuments:dict[str, JSON]	= {}	# ri -> subscription document
+
+		# Resource cache. Instantiated resources in LRU order. Only copies are handed out
+		self.resourceCacheSize						= Configuration.get('db.resourceCacheSize')
+		self.lockResourceCache						= Lock()
+		self.resourceCache:OrderedDict[str, Resource] = OrderedDict()	# ri -> resource
+		self.resourceCacheSrns:dict[str, str]		= {}	# srn -> ri of the cached resources
+		self.resourceCacheGeneration				= 0		# incremented for every invalidation
+		self.resourceCacheHits						= 0
+		self.resourceCacheMisses					= 0
+
+		# Identifier cache. Structured resource names and resource IDs of the recently used resources in LRU order
+		self.identifierCacheSize					= Configuration.get('db.identifierCacheSize')
+		self.lockIdentifiers						= Lock()
+		self.identifierCache:OrderedDict[str, str]	= OrderedDict()	# ri -> srn
+		self.identifierCacheSrns:dict[str, str]		= {}	# srn -> ri
+		self.identifierCacheGeneration				= 0		# incremented for every invalidation
+
 		if not self.inMemory:
 			if self.dbPath:
 				L.isInfo and L.log('Using data directory: ' + self.dbPath)
@@ -46,7 +92,11 @@ class Storage(object):
 				raise RuntimeError('db.path not set')
 
 		# create DB object and open DB
-		self.db = TinyDBBinding(self.dbPath, postfix = f'-{CSE.cseCsi[1:]}') # add CSE CSI as postfix
+		self.db:DBBinding = None
+		if Configuration.get('db.backend') == 'sqlite':
+			self.db = SQLiteBinding(self.dbPath, postfix = f'-{CSE.cseCsi[1:]}') # add CSE CSI as postfix
+		else:
+			self.db = TinyDBBinding(self.dbPath, postfix = f'-{CSE.cseCsi[1:]}') # add CSE CSI as postfix
 
 		# Reset dbs?
 		if self.dbReset:
@@ -61,10 +111,18 @@ class Storage(object):
 		if not self.inMemory and not self.dbReset and not self._backupDB():
 			raise RuntimeError('DB Error')
 
+		# Build the expiration, label, AE-ID and subscription indexes
+		self._buildExpirationIndex()
+		self._buildLabelIndex()
+		self._buildAEIIndex()
+		self._buildSubscriptionIndex()
+
 		L.isInfo and L.log('Storage initialized')
 
 
 	def shutdown(self) -> bool:
+		if self.resourceCacheSize:
+			L.isDebug and L.logDebug(f'Resource cache hits: {self.resourceCacheHits}, misses: {self.resourceCacheMisses}')
 		self.db.closeDB()
 		self.db = None
 		L.isInfo and L.log('Storage shut down')
@@ -79,6 +137,16 @@ class Storage(object):
 		except Exception as e:
 			L.logErr(f'Exception during purge: {e}', exc=e)
 			quit()
+		self._buildExpirationIndex()
+		self._buildLabelIndex()
+		self._buildAEIIndex()
+		self._buildSubscriptionIndex()
+		self._invalidateResourceCache()
+		self._uncacheIdentifier()
+		CSE.security and CSE.security.invalidateAccessDecisions()
+		with self.lockInstances:
+			self.instanceIndex.clear()
+			self.instanceSizes.clear()
 
 
 	def _validateDB(self) -> bool:
@@ -92,7 +160,7 @@ class Storage(object):
 			dbFile = 'identifiers'
 			self.structuredIdentifier('_')
 			dbFile = 'subscription'
-			self.getSubscription('_')
+			self.db.searchSubscriptions(ri = '_')
 			dbFile = 'batch notification'
 			self.countBatchNotifications('_', '_')
 			dbFile = 'statistics'
@@ -125,6 +193,7 @@ class Storage(object):
 		if overwrite:
 			L.isDebug and L.logDebug('Resource enforced overwrite')
 			self.db.upsertResource(resource)
+			self._invalidateResourceCache(ri)
 		else: 
 			if not self.hasResource(ri, srn):	# Only when not resource does not exist yet
 				self.db.insertResource(resource)
@@ -134,6 +203,12 @@ class Storage(object):
 
 		# Add path to identifiers db
 		self.db.insertIdentifier(resource, ri, srn)
+		self._cacheIdentifier(ri, srn)
+		self._indexExpiration(ri, resource.et)
+		self._indexInstance(resource)
+		self._indexLabels(ri, resource.lbl, srn)
+		self._indexAEI(resource)
+		self._invalidateAccessDecisions(resource)
 		return Result(status = True, rsc = RC.created)
 
 
@@ -148,6 +223,12 @@ class Storage(object):
 		"""
 		resources = []
 
+		# Try the resource cache first
+		if not raw and self.resourceCacheSize and (ri or srn):
+			if (resource := self._cachedResource(ri, srn)):
+				return Result(status = True, rsc = RC.OK, resource = resource)
+			generation = self.resourceCacheGeneration
+
 		if ri:		# get a resource by its ri
 			# L.logDebug(f'Retrieving resource ri: {ri}')
 			resources = self.db.searchResources(ri = ri)
@@ -167,7 +248,12 @@ class Storage(object):
 		# L.logDebug(resources)
 		# return CSE.dispatcher.resourceFromDict(resources[0]) if len(resources) == 1 else None,
 		if (l := len(resources)) == 1:
-			return Result(status = True, resource = resources[0]) if raw else Factory.resourceFromDict(resources[0])
+			if raw:
+				return Result(status = True, resource = resources[0])
+			result = Factory.resourceFromDict(resources[0])
+			if self.resourceCacheSize and (ri or srn) and result.resource:
+				self._cacheResource(result.resource, generation)
+			return result
 		elif l == 0:
 			return Result.errorResult(rsc = RC.notFound, dbg = 'resource not found')
 
@@ -184,13 +270,51 @@ class Storage(object):
 	def updateResource(self, resource:Resource) -> Result:
 		# ri = resource.ri
 		# L.logDebug(f'Updating resource (ty: {resource.ty}, ri: {ri}, rn: {resource.rn})')
-		return Result(status = True, resource = self.db.updateResource(resource), rsc = RC.updated)
+		result = Result(status = True, resource = self.db.updateResource(resource), rsc = RC.updated)
+		self._invalidateResourceCache(resource.ri)
+		self._indexExpiration(resource.ri, resource.et)
+		self._indexLabels(resource.ri, resource.lbl, resource.__srn__)
+		self._indexAEI(resource)
+		self._invalidateAccessDecisions(resource)
+		return result
 
 
 	def deleteResource(self, resource:Resource) -> Result:
 		# L.logDebug(f'Removing resource (ty: {resource.ty}, ri: {ri}, rn: {resource.rn})'
 		self.db.deleteResource(resource)
+		self._invalidateResourceCache(resource.ri)
 		self.db.deleteIdentifier(resource)
+		self._uncacheIdentifier(resource.ri)
+		self._indexExpiration(resource.ri, None)
+		self._unindexInstance(resource)
+		self._indexLabels(resource.ri, None)
+		self._indexAEI(resource, delete = True)
+		self._invalidateAccessDecisions(resource)
+		return Result(status = True, rsc = RC.deleted)
+
+
+	def deleteResources(self, resources:list[Resource]) -> Result:
+		"""	Delete a list of resources, e.g. a whole resource subtree, together with
+			their identifiers and subscriptions. Each table is updated in a single operation.
+
+			Args:
+				resources: List of resources to delete.
+			Return:
+				Result object.
+		"""
+		# L.logDebug(f'Removing {len(resources)} resources')
+		self.db.deleteResources(resources)
+		self.db.deleteIdentifiers(resources)
+		self.db.removeSubscriptions(resources)
+		for resource in resources:
+			self._invalidateResourceCache(resource.ri)
+			self._uncacheIdentifier(resource.ri)
+			self._indexExpiration(resource.ri, None)
+			self._unindexInstance(resource)
+			self._indexLabels(resource.ri, None)
+			self._indexAEI(resource, delete = True)
+			self._unindexSubscription(resource.ri)
+			self._invalidateAccessDecisions(resource)
 		return Result(status = True, rsc = RC.deleted)
 
 
@@ -246,37 +370,496 @@ class Storage(object):
 				]
 
 
+	#########################################################################
+	##
+	##	Resource cache
+	##
+
+	def resourceCacheStatistics(self) -> Tuple[int, int, int]:
+		"""	Return the statistics of the resource cache.
+
+			Return:
+				Tuple (number of cached resources, hits, misses).
+		"""
+		return len(self.resourceCache), self.resourceCacheHits, self.resourceCacheMisses
+
+
+	def _cachedResource(self, ri:str, srn:str) -> Resource:
+		"""	Return a copy of a cached resource, or None if the resource is not in the cache.
+		"""
+		with self.lockResourceCache:
+			if ri is None:
+				ri = self.resourceCacheSrns.get(srn)
+			if ri is None or (resource := self.resourceCache.get(ri)) is None:
+				self.resourceCacheMisses += 1
+				return None
+			self.resourceCache.move_to_end(ri)
+			self.resourceCacheHits += 1
+		return resource.clone()
+
+
+	def _cacheResource(self, resource:Resource, generation:int) -> None:
+		"""	Add a copy of a resource that was read from the database to the cache. This is skipped 
+			when the cache was invalidated since the resource was read (*generation*), because the 
+			read resource might be outdated then. The least recently used resources are removed when
+			the cache is full.
+		"""
+		cached = resource.clone()
+		with self.lockResourceCache:
+			if generation != self.resourceCacheGeneration:
+				return
+			self.resourceCache[(ri := cached.ri)] = cached
+			self.resourceCache.move_to_end(ri)
+			if (srn := cached[Resource._srn]):
+				self.resourceCacheSrns[srn] = ri
+			while len(self.resourceCache) > self.resourceCacheSize:
+				_, evicted = self.resourceCache.popitem(last = False)
+				self.resourceCacheSrns.pop(evicted[Resource._srn], None)
+
+
+	def _invalidateResourceCache(self, ri:str = None) -> None:
+		"""	Remove a resource from the cache, or clear the whole cache if *ri* is None.
+		"""
+		with self.lockResourceCache:
+			self.resourceCacheGeneration += 1
+			if ri is None:
+				self.resourceCache.clear()
+				self.resourceCacheSrns.clear()
+			elif (resource := self.resourceCache.pop(ri, None)) is not None:
+				self.resourceCacheSrns.pop(resource[Resource._srn], None)
+
+
+	def _invalidateAccessDecisions(self, resource:Resource) -> None:
+		"""	Invalidate the SecurityManager's access decisions when an <ACP> resource was 
+			written to or removed from the database.
+		"""
+		if resource.ty in [ T.ACP, T.ACPAnnc ] and CSE.security:
+			CSE.security.invalidateAccessDecisions()
+
+
+	#########################################################################
+	##
+	##	Identifier cache
+	##
+
+	def structuredPathFromRI(self, ri:str) -> str:
+		"""	Return the structured resource name of a resource. The identifiers table is only
+			searched if the resource is not in the identifier cache.
+
+			Args:
+				ri: Resource ID.
+			Return:
+				The structured resource name, or None if the resource does not exist.
+		"""
+		with self.lockIdentifiers:
+			if (srn := self.identifierCache.get(ri)) is not None:
+				self.identifierCache.move_to_end(ri)
+				return srn
+			generation = self.identifierCacheGeneration
+		if not (identifiers := self.db.searchIdentifiers(ri = ri)):
+			return None
+		srn = identifiers[0]['srn']
+		self._cacheIdentifier(ri, srn, generation)
+		return srn
+
+
+	def riFromStructuredPath(self, srn:str) -> str:
+		"""	Return the resource ID of a resource. The identifiers table is only searched if the 
+			resource is not in the identifier cache.
+
+			Args:
+				srn: Structured resource name.
+			Return:
+				The resource ID, or None if the resource does not exist.
+		"""
+		with self.lockIdentifiers:
+			if (ri := self.identifierCacheSrns.get(srn)) is not None:
+				self.identifierCache.move_to_end(ri)
+				return ri
+			generation = self.identifierCacheGeneration
+		if not (identifiers := self.db.searchIdentifiers(srn = srn)):
+			return None
+		ri = identifiers[0]['ri']
+		self._cacheIdentifier(ri, srn, generation)
+		return ri
+
+
+	def _cacheIdentifier(self, ri:str, srn:str, generation:int = None) -> None:
+		"""	Add a resource's identifiers to the cache. If *generation* is given, then this is skipped when
+			the cache was invalidated since the identifiers were read, because they might be outdated then.
+			The least recently used identifiers are removed when the cache is full.
+		"""
+		if not self.identifierCacheSize or not ri or not srn:
+			return
+		with self.lockIdentifiers:
+			if generation is not None and generation != self.identifierCacheGeneration:
+				return
+			if (oldSrn := self.identifierCache.get(ri)) is not None and oldSrn != srn:
+				self.identifierCacheSrns.pop(oldSrn, None)
+			self.identifierCache[ri] = srn
+			self.identifierCache.move_to_end(ri)
+			self.identifierCacheSrns[srn] = ri
+			while len(self.identifierCache) > self.identifierCacheSize:
+				_, evicted = self.identifierCache.popitem(last = False)
+				self.identifierCacheSrns.pop(evicted, None)
+
+
+	def _uncacheIdentifier(self, ri:str = None) -> None:
+		"""	Remove a resource's identifiers from the cache, or clear the whole cache if *ri* is None.
+		"""
+		with self.lockIdentifiers:
+			self.identifierCacheGeneration += 1
+			if ri is None:
+				self.identifierCache.clear()
+				self.identifierCacheSrns.clear()
+			elif (srn := self.identifierCache.pop(ri, None)) is not None:
+				self.identifierCacheSrns.pop(srn, None)
+
+
+	#########################################################################
+	##
+	##	Expiration index
+	##
+
+	def expiredResources(self, now:str) -> list[Resource]:
+		"""	Return the resources whose expiration time lies before *now*, ordered by their
+			expiration times. The resources are removed from the expiration index. Resources that
+			cannot be deleted must be tried again by the caller.
+
+			Args:
+				now: ISO 8601 timestamp to compare the expiration times with.
+			Return:
+				List of expired resources, or an empty list.
+		"""
+		ris = []
+		with self.lockExpirations:
+			while self.expirationHeap and self.expirationHeap[0][0] < now:
+				et, ri = heapq.heappop(self.expirationHeap)
+				if self.expirationTimes.get(ri) == et:	# ignore outdated entries
+					del self.expirationTimes[ri]
+					ris.append(ri)
+		return [ res for ri in ris if (res := self.retrieveResource(ri = ri).resource) ]
+
+
+	def nextExpiration(self) -> str:
+		"""	Return the earliest expiration time of all resources, or None if there is none.
+		"""
+		with self.lockExpirations:
+			while self.expirationHeap:
+				et, ri = self.expirationHeap[0]
+				if self.expirationTimes.get(ri) == et:
+					return et
+				heapq.heappop(self.expirationHeap)	# remove outdated entries
+		return None
+
+
+	def _indexExpiration(self, ri:str, et:str) -> None:
+		"""	Add, update or remove (if *et* is None) a resource's expiration time in the index.
+		"""
+		with self.lockExpirations:
+			if self.expirationTimes.get(ri) == et:
+				return
+			if et:
+				self.expirationTimes[ri] = et
+				heapq.heappush(self.expirationHeap, (et, ri))
+			else:
+				self.expirationTimes.pop(ri, None)	# The heap entry becomes outdated
+
+
+	def _buildExpirationIndex(self) -> None:
+		"""	(Re)build the expiration index from the resources in the database.
+		"""
+		with self.lockExpirations:
+			self.expirationTimes = { doc['ri']: et for doc in self.db.discoverResourcesByFilter(lambda r: bool(r.get('et'))) if (et := doc['et']) }
+			self.expirationHeap = [ (et, ri) for ri, et in self.expirationTimes.items() ]
+			heapq.heapify(self.expirationHeap)
+
+
+	#########################################################################
+	##
+	##	Label index
+	##
+
+	def structuredPathsByLabels(self, labels:list[str]) -> set[str]:
+		"""	Return the structured resource names of all resources that have at least one of the given labels.
+			No resource is retrieved from the database for this.
+
+			Args:
+				labels: List of labels.
+			Return:
+				Set of structured resource names.
+		"""
+		with self.lockLabels:
+			return set([ self.labelSrns[ri] for lbl in labels for ri in self.labelIndex.get(lbl, ()) ])
+
+
+	def _indexLabels(self, ri:str, lbl:list[str], srn:str = None) -> None:
+		"""	Add, update or remove (if *lbl* is None or empty) a resource's labels in the index.
+			The resource's structured resource name *srn* must be given when labels are added.
+		"""
+		with self.lockLabels:
+			if (indexed := self.resourceLabels.get(ri)) == lbl or (not indexed and not lbl):
+				return
+			if indexed:
+				for l in indexed:
+					if (ris := self.labelIndex.get(l)) is not None:
+						ris.discard(ri)
+						if not ris:
+							del self.labelIndex[l]
+			if lbl:
+				self.resourceLabels[ri] = list(lbl)
+				self.labelSrns[ri] = srn
+				for l in lbl:
+					self.labelIndex.setdefault(l, set()).add(ri)
+			else:
+				del self.resourceLabels[ri]
+				del self.labelSrns[ri]
+
+
+	def _buildLabelIndex(self) -> None:
+		"""	(Re)build the label index from the resources in the database.
+		"""
+		with self.lockLabels:
+			self.labelIndex.clear()
+			self.resourceLabels.clear()
+			self.labelSrns.clear()
+		for doc in self.db.discoverResourcesByFilter(lambda r: bool(r.get('lbl'))):
+			if isinstance(lbl := doc['lbl'], list):
+				self._indexLabels(doc['ri'], lbl, doc.get(Resource._srn))
+
+
+	#########################################################################
+	##
+	##	AE-ID index
+	##
+
+	def hasRegisteredAE(self, aei:str) -> bool:
+		"""	Check whether an <AE> (or an <AEAnnc>) resource with an AE-ID exists.
+
+			Args:
+				aei: The AE-ID to check.
+			Return:
+				True if a resource with this AE-ID exists.
+		"""
+		with self.lockAEIs:
+			return aei in self.aeiIndex
+
+
+	def _indexAEI(self, resource:Resource, delete:bool = False) -> None:
+		"""	Add, update or remove (if *delete* is True) the AE-ID of an <AE> or <AEAnnc> resource 
+			in the index. Other resource types are ignored.
+		"""
+		if resource.ty not in [ T.AE, T.AEAnnc ]:
+			return
+		ri = resource.ri
+		aei = None if delete else resource.aei
+		with self.lockAEIs:
+			if (indexed := self.resourceAEIs.get(ri)) == aei:
+				return
+			if indexed is not None and (ris := self.aeiIndex.get(indexed)) is not None:
+				ris.discard(ri)
+				if not ris:
+					del self.aeiIndex[indexed]
+			if aei:
+				self.resourceAEIs[ri] = aei
+				self.aeiIndex.setdefault(aei, set()).add(ri)
+			else:
+				self.resourceAEIs.pop(ri, None)
+
+
+	def _buildAEIIndex(self) -> None:
+		"""	(Re)build the AE-ID index from the resources in the database.
+		"""
+		with self.lockAEIs:
+			self.aeiIndex.clear()
+			self.resourceAEIs.clear()
+			for ty in [ T.AE, T.AEAnnc ]:
+				for doc in self.db.searchResources(ty = int(ty)):
+					if (aei := doc.get('aei')):
+						self.resourceAEIs[doc['ri']] = aei
+						self.aeiIndex.setdefault(aei, set()).add(doc['ri'])
+
+
+	#########################################################################
+	##
+	##	Instance index
+	##
+
+	def latestOldestInstance(self, pi:str, ty:T, oldest:bool = False) -> Resource:
+		"""	Return the latest or oldest instance resource (e.g. <cin>) of a parent.
+
+			Args:
+				pi: Resource ID of the parent resource.
+				ty: Resource type of the instance resource.
+				oldest: Return the oldest instead of the latest instance.
+			Return:
+				The resource, or None if the parent has no instance of that type.
+		"""
+		with self.lockInstances:
+			if not (instances := self._instances(pi, ty)):
+				return None
+			ri = instances[0 if oldest else -1][1]
+		return self.retrieveResource(ri = ri).resource
+
+
+	def instanceStatistics(self, pi:str, ty:T) -> Tuple[int, int]:
+		"""	Return the number and the total content size of a parent's instances.
+
+			Args:
+				pi: Resource ID of the parent resource.
+				ty: Resource type of the instance resource.
+			Return:
+				Tuple (number of instances, sum of the instances' content sizes).
+		"""
+		with self.lockInstances:
+			return len(self._instances(pi, ty)), self.instanceSizes[(pi, ty)]
+
+
+	def _instances(self, pi:str, ty:T) -> list[Tuple[str, str]]:
+		"""	Return the ordered (ct, ri) list of a parent's instances. It is built
+			from the database on first access. Must be called with the instances lock held.
+		"""
+		if (instances := self.instanceIndex.get((pi, ty))) is None:
+			docs = self.db.searchResources(pi = pi, ty = int(ty))
+			instances = sorted([ (doc['ct'], doc['ri']) for doc in docs ])
+			self.instanceIndex[(pi, ty)] = instances
+			self.instanceSizes[(pi, ty)] = sum([ doc.get('cs') or 0 for doc in docs ])
+		return instances
+
+
+	def _indexInstance(self, resource:Resource) -> None:
+		"""	Add a new instance resource to the instance index, if its parent is indexed.
+		"""
+		if not T.isInstanceResource(resource.ty):
+			return
+		with self.lockInstances:
+			if (instances := self.instanceIndex.get((resource.pi, resource.ty))) is None:
+				return
+			entry = (resource.ct, resource.ri)
+			if (i := bisect.bisect_left(instances, entry)) == len(instances) or instances[i] != entry:	# might already be added when the index was built
+				instances.insert(i, entry)
+				self.instanceSizes[(resource.pi, resource.ty)] += resource.cs or 0
+
+
+	def _unindexInstance(self, resource:Resource) -> None:
+		"""	Remove a deleted instance resource, or a deleted parent's instances, from the instance index.
+		"""
+		with self.lockInstances:
+			if T.isInstanceResource(resource.ty):
+				if (instances := self.instanceIndex.get((resource.pi, resource.ty))) is not None:
+					entry = (resource.ct, resource.ri)
+					if (i := bisect.bisect_left(instances, entry)) < len(instances) and instances[i] == entry:
+						del instances[i]
+						self.instanceSizes[(resource.pi, resource.ty)] -= resource.cs or 0
+			else:
+				for ty in ( T.CIN, T.FCI, T.TSI ):
+					self.instanceIndex.pop((resource.ri, ty), None)
+					self.instanceSizes.pop((resource.ri, ty), None)
+
+
 	#########################################################################
 	##
 	##	Subscriptions
 	##
 
+	#	The subscriptions are served from an in-memory index. The returned subscription
+	#	documents are shared and must not be modified. In these documents the *chty* and
+	#	*atr* attributes are sets (or None).
+
 	def getSubscription(self, ri:str) -> JSON:
 		# L.logDebug(f'Retrieving subscription: {ri}')
-		subs = self.db.searchSubscriptions(ri = ri)
-		if not subs or len(subs) != 1:
-			return None
-		return subs[0]
+		with self.lockSubscriptionIndex:
+			return self.subscriptionDocuments.get(ri)
+
 
+	def getSubscriptionsForParent(self, pi:str, net:NotificationEventType = None) -> list[JSON]:
+		"""	Return the subscription documents for a parent resource.
 
-	def getSubscriptionsForParent(self, pi:str) -> list[Document]:
+			Args:
+				pi: Resource ID of the parent resource.
+				net: Optional notification event type. If given then only the subscriptions for this event type are returned.
+			Return:
+				List of subscription documents. The list may be empty.
+		"""
 		# L.logDebug(f'Retrieving subscriptions for parent: {pi}')
-		return self.db.searchSubscriptions(pi = pi)
+		with self.lockSubscriptionIndex:
+			subs = self.subscriptionParents.get(pi) if net is None else self.subscriptionIndex.get((pi, net))
+			return list(subs.values()) if subs else []
 
 
 	def addSubscription(self, subscription:Resource) -> bool:
 		# L.logDebug(f'Adding subscription: {ri}')
-		return self.db.upsertSubscription(subscription)
+		if (result := self.db.upsertSubscription(subscription)):
+			self._indexSubscription(DBBinding.subscriptionDocument(subscription))
+		return result
 
 
 	def removeSubscription(self, subscription:Resource) -> bool:
 		# L.logDebug(f'Removing subscription: {subscription.ri}')
-		return self.db.removeSubscription(subscription)
+		result = self.db.removeSubscription(subscription)
+		self._unindexSubscription(subscription.ri)
+		return result
 
 
 	def updateSubscription(self, subscription:Resource) -> bool:
 		# L.logDebug(f'Updating subscription: {ri}')
-		return self.db.upsertSubscription(subscription)
+		return self.addSubscription(subscription)
+
+
+	def _indexSubscription(self, document:JSON) -> None:
+		"""	Add or replace a subscription document in the subscription index. A copy of the
+			document is indexed, with the *chty* and *atr* lists converted to sets.
+		"""
+		document = deepcopy(dict(document))
+		for key in [ 'chty', 'atr' ]:
+			if (value := document.get(key)) is not None:
+				document[key] = frozenset(value)
+		ri = document['ri']
+		pi = document['pi']
+		nets = document.get('net') or []
+		with self.lockSubscriptionIndex:
+			if (indexed := self.subscriptionDocuments.get(ri)) and (indexed['pi'] != pi or set(indexed.get('net') or []) != set(nets)):
+				self._removeFromSubscriptionIndex(ri)	# Only remove if the index keys change. Otherwise keep the order
+			self.subscriptionDocuments[ri] = document
+			self.subscriptionParents.setdefault(pi, {})[ri] = document
+			for net in nets:
+				self.subscriptionIndex.setdefault((pi, net), {})[ri] = document
+
+
+	def _unindexSubscription(self, ri:str) -> None:
+		"""	Remove a subscription from the subscription index. Nothing happens if *ri* is not
+			a subscription.
+		"""
+		with self.lockSubscriptionIndex:
+			self._removeFromSubscriptionIndex(ri)
+
+
+	def _removeFromSubscriptionIndex(self, ri:str) -> None:
+		"""	Remove a subscription from the subscription index. The caller must hold *lockSubscriptionIndex*.
+		"""
+		if not (indexed := self.subscriptionDocuments.pop(ri, None)):
+			return
+		pi = indexed['pi']
+		if (subs := self.subscriptionParents.get(pi)) is not None:
+			subs.pop(ri, None)
+			if not subs:
+				del self.subscriptionParents[pi]
+		for net in indexed.get('net') or []:
+			if (subs := self.subscriptionIndex.get((pi, net))) is not None:
+				subs.pop(ri, None)
+				if not subs:
+					del self.subscriptionIndex[(pi, net)]
+
+
+	def _buildSubscriptionIndex(self) -> None:
+		"""	(Re)build the subscription index from the subscriptions in the database.
+		"""
+		with self.lockSubscriptionIndex:
+			self.subscriptionIndex.clear()
+			self.subscriptionParents.clear()
+			self.subscriptionDocuments.clear()
+		for document in self.db.searchSubscriptions():
+			self._indexSubscription(document)
 
 
 	#########################################################################
@@ -292,7 +875,10 @@ class Storage(object):
 		return self.db.countBatchNotifications(ri, nu)
 
 
-	def getBatchNotifications(self, ri:str, nu:str) -> list[Document]:
+	def getBatchNotifications(self, ri:str = None, nu:str = None) -> list[Document]:
+		"""	Return the stored batch notifications for a subscription and target, or all
+			stored batch notifications if neither *ri* nor *nu* is given.
+		"""
 		return self.db.getBatchNotifications(ri, nu)
 
 
@@ -324,6 +910,170 @@ class Storage(object):
 		self.db.purgeStatistics()
 
 
+#########################################################################
+#
+#	Interface for the DB bindings
+#
+#	Every storage backend must implement the following methods. Documents
+#	are exchanged as JSON dictionaries.
+
+
+class DBBinding(object):
+
+	def closeDB(self) -> None:
+		raise NotImplementedError('closeDB()')
+
+
+	def purgeDB(self) -> None:
+		raise NotImplementedError('purgeDB()')
+
+
+	def backupDB(self, dir:str) -> bool:
+		raise NotImplementedError('backupDB()')
+
+
+	#
+	#	Resources
+	#
+
+	def insertResource(self, resource:Resource) -> None:
+		raise NotImplementedError('insertResource()')
+
+
+	def upsertResource(self, resource:Resource) -> None:
+		raise NotImplementedError('upsertResource()')
+
+
+	def updateResource(self, resource:Resource) -> Resource:
+		raise NotImplementedError('updateResource()')
+
+
+	def deleteResource(self, resource:Resource) -> None:
+		raise NotImplementedError('deleteResource()')
+
+
+	def deleteResources(self, resources:list[Resource]) -> None:
+		raise NotImplementedError('deleteResources()')
+
+
+	def searchResources(self, ri:str = None, csi:str = None, srn:str = None, pi:str = None, ty:int = None, aei:str = None) -> list[JSON]:
+		raise NotImplementedError('searchResources()')
+
+
+	def discoverResourcesByFilter(self, func:Callable[[JSON], bool]) -> list[JSON]:
+		raise NotImplementedError('discoverResourcesByFilter()')
+
+
+	def hasResource(self, ri:str = None, csi:str = None, srn:str = None, ty:int = None) -> bool:
+		raise NotImplementedError('hasResource()')
+
+
+	def countResources(self) -> int:
+		raise NotImplementedError('countResources()')
+
+
+	def searchByFragment(self, dct:dict) -> list[JSON]:
+		raise NotImplementedError('searchByFragment()')
+
+
+	#
+	#	Identifiers
+	#
+
+	def insertIdentifier(self, resource:Resource, ri:str, srn:str) -> None:
+		raise NotImplementedError('insertIdentifier()')
+
+
+	def deleteIdentifier(self, resource:Resource) -> None:
+		raise NotImplementedError('deleteIdentifier()')
+
+
+	def deleteIdentifiers(self, resources:list[Resource]) -> None:
+		raise NotImplementedError('deleteIdentifiers()')
+
+
+	def searchIdentifiers(self, ri:str = None, srn:str = None) -> list[JSON]:
+		raise NotImplementedError('searchIdentifiers()')
+
+
+	#
+	#	Subscriptions
+	#
+
+	def searchSubscriptions(self, ri:str = None, pi:str = None) -> list[JSON]:
+		"""	Search for subscriptions by their resource ID or their parent's resource ID.
+			All subscriptions are returned if neither *ri* nor *pi* is given.
+		"""
+		raise NotImplementedError('searchSubscriptions()')
+
+
+	def upsertSubscription(self, subscription:Resource) -> bool:
+		raise NotImplementedError('upsertSubscription()')
+
+
+	def removeSubscription(self, subscription:Resource) -> bool:
+		raise NotImplementedError('removeSubscription()')
+
+
+	def removeSubscriptions(self, resources:list[Resource]) -> bool:
+		raise NotImplementedError('removeSubscriptions()')
+
+
+	#
+	#	BatchNotifications
+	#
+
+	def addBatchNotification(self, ri:str, nu:str, notificationRequest:JSON) -> bool:
+		raise NotImplementedError('addBatchNotification()')
+
+
+	def countBatchNotifications(self, ri:str, nu:str) -> int:
+		raise NotImplementedError('countBatchNotifications()')
+
+
+	def getBatchNotifications(self, ri:str = None, nu:str = None) -> list[JSON]:
+		raise NotImplementedError('getBatchNotifications()')
+
+
+	def removeBatchNotifications(self, ri:str, nu:str) -> bool:
+		raise NotImplementedError('removeBatchNotifications()')
+
+
+	#
+	#	Statistics
+	#
+
+	def searchStatistics(self) -> JSON:
+		raise NotImplementedError('searchStatistics()')
+
+
+	def upsertStatistics(self, stats:JSON) -> bool:
+		raise NotImplementedError('upsertStatistics()')
+
+
+	def purgeStatistics(self) -> None:
+		raise NotImplementedError('purgeStatistics()')
+
+
+	@staticmethod
+	def subscriptionDocument(subscription:Resource) -> JSON:
+		"""	Return the document that is stored for a subscription.
+		"""
+		return {	'ri'  : subscription.ri,
+					'pi'  : subscription.pi,
+					'nct' : subscription.nct,
+					'net' : subscription['enc/net'],	# TODO perhaps store enc as a whole?
+					'atr' : subscription['enc/atr'],
+					'chty': subscription['enc/chty'],
+					'exc' : subscription.exc,
+					'ln'  : subscription.ln,
+					'nus' : subscription.nu,
+					'bn'  : subscription.bn,
+					'cr'  : subscription.cr,
+					'ma'  : subscription.ma, # EXPERIMENTAL ma = maxAge
+				}
+
+
 #########################################################################
 #
 #	DB class that implements the TinyDB binding
@@ -331,7 +1081,7 @@ class Storage(object):
 #	This class may be moved later to an own module.
 
 
-class TinyDBBinding(object):
+class TinyDBBinding(DBBinding):
 
 	def __init__(self, path:str = None, postfix:str = '') -> None:
 		self.path = path
@@ -351,6 +1101,17 @@ class TinyDBBinding(object):
 		self.fileSubscriptions			= f'{self.path}/subscriptions{postfix}.json'
 		self.fileBatchNotifications		= f'{self.path}/batchNotifications{postfix}.json'
 		self.fileStatistics				= f'{self.path}/statistics{postfix}.json'
+		self.fileJournal				= f'{self.path}/journal{postfix}.jsonl'
+		self.fileJournalPrevious		= f'{self.path}/journal{postfix}.prev.jsonl'
+
+		# Journal mode is only used when the DB is stored in the file system
+		self.journalEnabled				= Configuration.get('db.journal') and not Configuration.get('db.inMemory')
+
+		# Whether the TinyDB storage is held in memory. Otherwise every read access to a table reads and parses its file
+		self.storageInMemory			= Configuration.get('db.inMemory') or self.journalEnabled
+		self.lockJournal				= Lock()
+		self.lockCompaction				= Lock()
+		self.journal:TextIO				= None
 
 		# All databases/tables will use the smart query cache
 		if Configuration.get('db.inMemory'):
@@ -360,6 +1121,16 @@ class TinyDBBinding(object):
 			self.dbSubscriptions 		= TinyDB(storage = MemoryStorage)
 			self.dbBatchNotifications	= TinyDB(storage = MemoryStorage)
 			self.dbStatistics			= TinyDB(storage = MemoryStorage)
+		elif self.journalEnabled:
+			# The DBs are held in memory. They are loaded from the last snapshot
+			# files and the journal of changes since that snapshot.
+			L.isInfo and L.log('DB in file system (journal mode)')
+			self.dbResources 			= TinyDB(storage = MemoryStorage)
+			self.dbIdentifiers 			= TinyDB(storage = MemoryStorage)
+			self.dbSubscriptions 		= TinyDB(storage = MemoryStorage)
+			self.dbBatchNotifications	= TinyDB(storage = MemoryStorage)
+			self.dbStatistics			= TinyDB(storage = MemoryStorage)
+			self._loadJournaledDBs()
 		else:
 			L.isInfo and L.log('DB in file system')
 			self.dbResources 			= TinyDB(self.fileResources)
@@ -381,9 +1152,35 @@ class TinyDBBinding(object):
 		self.subscriptionQuery			= Query()
 		self.batchNotificationQuery 	= Query()
 
+		# In-memory indexes that map attribute values to TinyDB document IDs.
+		# They are only accessed while holding the respective table lock.
+		self.riIndex:dict[str, int]						= {}	# ri -> doc_id
+		self.csiIndex:dict[str, set[int]]				= {}	# csi -> {doc_id}
+		self.aeiIndex:dict[str, set[int]]				= {}	# aei -> {doc_id}
+		self.tyIndex:dict[int, set[int]]				= {}	# ty -> {doc_id}
+		self.piIndex:dict[str, dict[int, set[int]]]		= {}	# pi -> ty -> {doc_id}
+		self.resourceIndexKeys:dict[int, tuple]			= {}	# doc_id -> (ri, csi, aei, pi, ty)
+		self.identifierRiIndex:dict[str, int]			= {}	# ri -> doc_id
+		self.identifierSrnIndex:dict[str, int]			= {}	# srn -> doc_id
+		self.identifierSrns:dict[int, str]				= {}	# doc_id -> srn
+		self._buildIndexes()
+
+		# Open the journal and start the workers that write it to disk and compact it
+		if self.journalEnabled:
+			self.compactDB()
+			BackgroundWorkerPool.newWorker(Configuration.get('db.journalSyncInterval'), self.syncJournal, 'dbJournalSync').start()
+			BackgroundWorkerPool.newWorker(Configuration.get('db.journalCompactionInterval'), self.compactDB, 'dbJournalCompaction', startWithDelay = True).start()
+
 
 	def closeDB(self) -> None:
 		L.isInfo and L.log('Closing DBs')
+		if self.journalEnabled:
+			BackgroundWorkerPool.stopWorkers('dbJournalSync')
+			BackgroundWorkerPool.stopWorkers('dbJournalCompaction')
+			self.compactDB()
+			with self.lockJournal:
+				self.journal.close()
+				self.journal = None
 		with self.lockResources:
 			self.dbResources.close()
 		with self.lockIdentifiers:
@@ -398,14 +1195,26 @@ class TinyDBBinding(object):
 
 	def purgeDB(self) -> None:
 		L.isInfo and L.log('Purging DBs')
-		self.tabResources.truncate()
-		self.tabIdentifiers.truncate()
-		self.tabSubscriptions.truncate()
-		self.tabBatchNotifications.truncate()
-		self.tabStatistics.truncate()
-	
+		locks = [ lock for (_, _, lock) in self._journaledDBs().values() ]
+		for lock in locks:
+			lock.acquire()
+		try:
+			self.tabResources.truncate()
+			self.tabIdentifiers.truncate()
+			self.tabSubscriptions.truncate()
+			self.tabBatchNotifications.truncate()
+			self.tabStatistics.truncate()
+			self._clearIndexes()
+		finally:
+			for lock in reversed(locks):
+				lock.release()
+		if self.journalEnabled:
+			self.compactDB()
+
 
 	def backupDB(self, dir:str) -> bool:
+		if self.journalEnabled:
+			self.compactDB()	# Make sure that the snapshot files are complete
 		shutil.copy2(self.fileResources, dir)
 		shutil.copy2(self.fileIdentifiers, dir)
 		shutil.copy2(self.fileSubscriptions, dir)
@@ -414,6 +1223,185 @@ class TinyDBBinding(object):
 		return True
 
 
+	#
+	#	Journal
+	#
+	#	In journal mode the DBs are held in memory. Every change is appended as
+	#	a single JSON line to the journal file, which is synced to disk in
+	#	intervals. The journal is regularly compacted into the snapshot files
+	#	(the normal TinyDB files), and replayed on top of them on startup.
+	#	While the snapshot files are written the previous journal is kept
+	#	and replayed before the current journal, in case the snapshot files
+	#	could not be written completely.
+	#
+
+	def _journaledDBs(self) -> dict[str, Tuple[TinyDB, str, Lock]]:
+		"""	Return the journaled DBs, their snapshot files and locks, indexed by the journal's table names.
+		"""
+		return {	'resources' 		: (self.dbResources, self.fileResources, self.lockResources),
+					'identifiers'		: (self.dbIdentifiers, self.fileIdentifiers, self.lockIdentifiers),
+					'subscriptions'		: (self.dbSubscriptions, self.fileSubscriptions, self.lockSubscriptions),
+					'batchNotifications': (self.dbBatchNotifications, self.fileBatchNotifications, self.lockBatchNotifications),
+					'statistics'		: (self.dbStatistics, self.fileStatistics, self.lockStatistics),
+				}
+
+
+	def _loadJournaledDBs(self) -> None:
+		"""	Load the snapshot files into the in-memory DBs and replay the journal on top of them.
+
+			An incomplete last line in the journal, e.g. after a crash, ends the replay.
+		"""
+		tableNames = {	'resources' 		: 'resources',
+						'identifiers'		: 'identifiers',
+						'subscriptions'		: 'subsriptions',
+						'batchNotifications': 'batchNotifications',
+						'statistics'		: 'statistics'
+					 }
+
+		# Load the snapshots
+		snapshots:dict[str, JSON] = {}
+		for name, (_, fileName, _) in self._journaledDBs().items():
+			snapshots[name] = {}
+			if os.path.exists(fileName) and os.path.getsize(fileName) > 0:
+				with open(fileName, 'r', encoding = 'utf-8') as file:
+					snapshots[name] = json.load(file)
+			snapshots[name].setdefault(tableNames[name], {})
+
+		# Replay the previous journal (if the last compaction was not finished) and the journal
+		count = 0
+		for fileName in [ self.fileJournalPrevious, self.fileJournal ]:
+			if not os.path.exists(fileName):
+				continue
+			with open(fileName, 'r', encoding = 'utf-8') as file:
+				for line in file:
+					try:
+						record = json.loads(line)
+					except Exception as e:
+						L.isWarn and L.logWarn(f'Incomplete DB journal entry. Ignoring the remaining journal: {line}')
+						break
+					table = snapshots[name := record['t']][tableNames[name]]
+					if record.get('truncate'):
+						table.clear()
+					elif 'd' in record:
+						table[str(record['id'])] = record['d']
+					else:
+						table.pop(str(record['id']), None)
+					count += 1
+		L.isInfo and L.log(f'DB journal replayed: {count} entries')
+
+		for name, (db, _, _) in self._journaledDBs().items():
+			db.storage.write(snapshots[name])
+
+
+	def _journalDocument(self, name:str, table:Table, docID:int) -> None:
+		"""	Append the current state of a document to the journal.
+			A document that doesn't exist anymore is journaled as removed.
+			Must be called with the respective table lock held.
+
+			Args:
+				name: Journal table name.
+				table: The TinyDB table of the document.
+				docID: Document ID.
+		"""
+		if not self.journalEnabled:
+			return
+		if (doc := table.get(doc_id = docID)) is not None:
+			self._writeJournal({ 't': name, 'id': docID, 'd': doc })
+		else:
+			self._writeJournal({ 't': name, 'id': docID })
+
+
+	def _journalRemovals(self, name:str, docIDs:list[int]) -> None:
+		"""	Append the removal of a list of documents to the journal in one write.
+			Must be called with the respective table lock held.
+
+			Args:
+				name: Journal table name.
+				docIDs: Document IDs of the removed documents.
+		"""
+		if not self.journalEnabled or not docIDs:
+			return
+		with self.lockJournal:
+			if self.journal:
+				self.journal.write(''.join([ json.dumps({ 't': name, 'id': docID }) + '\n' for docID in docIDs ]))
+				self.journal.flush()
+
+
+	def _journalTruncate(self, name:str) -> None:
+		"""	Append the truncation of a table to the journal.
+			Must be called with the respective table lock held.
+
+			Args:
+				name: Journal table name.
+		"""
+		if self.journalEnabled:
+			self._writeJournal({ 't': name, 'truncate': True })
+
+
+	def _writeJournal(self, record:JSON) -> None:
+		"""	Append a record to the journal. The record is handed to the OS immediately, 
+			but only synced to disk by `syncJournal()`.
+		"""
+		with self.lockJournal:
+			if self.journal:
+				self.journal.write(json.dumps(record) + '\n')
+				self.journal.flush()
+
+
+	def syncJournal(self) -> bool:
+		"""	Sync the journal to disk.
+			This is called regularly by a background worker.
+		"""
+		with self.lockJournal:
+			if self.journal:
+				os.fsync(self.journal.fileno())
+		return True
+
+
+	def compactDB(self) -> bool:
+		"""	Write the in-memory DBs to the snapshot files and empty the journal.
+			This is called regularly by a background worker.
+
+			Only taking a snapshot of the DBs and starting a new journal is done while holding
+			the table locks. Writing the snapshot files is done afterwards, so that other
+			DB operations are not blocked meanwhile.
+		"""
+		L.isDebug and L.logDebug('Compacting DB journal')
+		with self.lockCompaction:
+			dbs = self._journaledDBs()
+			locks = [ lock for (_, _, lock) in dbs.values() ]
+			for lock in locks:
+				lock.acquire()
+			try:
+				# Take a snapshot of the tables and their documents. TinyDB replaces changed values, 
+				# so copying the documents is sufficient.
+				snapshots = [ ({	tableName : { docID : dict(doc) for docID, doc in table.items() } 
+									for tableName, table in (db.storage.read() or {}).items() }, fileName)
+							  for (db, fileName, _) in dbs.values() ]
+
+				# Keep the current journal until the snapshot files are written, and start a new, empty journal
+				with self.lockJournal:
+					if self.journal:
+						self.journal.close()
+						os.replace(self.fileJournal, self.fileJournalPrevious)
+					self.journal = open(self.fileJournal, 'w', encoding = 'utf-8')
+			finally:
+				for lock in reversed(locks):
+					lock.release()
+
+			# Write the snapshot files
+			for (snapshot, fileName) in snapshots:
+				tmpFileName = f'{fileName}.tmp'
+				with open(tmpFileName, 'w', encoding = 'utf-8') as file:
+					json.dump(snapshot, file)
+					file.flush()
+					os.fsync(file.fileno())
+				os.replace(tmpFileName, fileName)
+			if os.path.exists(self.fileJournalPrevious):
+				os.remove(self.fileJournalPrevious)
+		return True
+
+
 	#
 	#	Resources
 	#
@@ -421,49 +1409,74 @@ class TinyDBBinding(object):
 
 	def insertResource(self, resource: Resource) -> None:
 		with self.lockResources:
-			self.tabResources.insert(resource.dict)
-	
+			docID = self.tabResources.insert(resource.dict)
+			self._indexResource(docID, resource.dict)
+			self._journalDocument('resources', self.tabResources, docID)
+
 
 	def upsertResource(self, resource: Resource) -> None:
 		#L.logDebug(resource)
 		with self.lockResources:
 			# Update existing or insert new when overwriting
-			self.tabResources.upsert(resource.dict, self.resourceQuery.ri == resource.ri)
-	
+			if (docID := self.riIndex.get(resource.ri)) is not None:
+				self.tabResources.update(resource.dict, doc_ids = [docID])
+			else:
+				docID = self.tabResources.insert(resource.dict)
+			self._indexResource(docID, resource.dict)
+			self._journalDocument('resources', self.tabResources, docID)
+
 
 	def updateResource(self, resource: Resource) -> Resource:
 		#L.logDebug(resource)
 		with self.lockResources:
-			ri = resource.ri
-			self.tabResources.update(resource.dict, self.resourceQuery.ri == ri)
+			if (docID := self.riIndex.get(resource.ri)) is None:
+				return resource
+			self.tabResources.update(resource.dict, doc_ids = [docID])
 			# remove nullified fields from db and resource
 			for k in list(resource.dict):
 				if resource.dict[k] is None:	# only remove the real None attributes, not those with 0
-					self.tabResources.update(delete(k), self.resourceQuery.ri == ri)	# type: ignore [no-untyped-call]
+					self.tabResources.update(delete(k), doc_ids = [docID])	# type: ignore [no-untyped-call]
 					del resource.dict[k]
+			self._indexResource(docID, resource.dict)
+			self._journalDocument('resources', self.tabResources, docID)
 			return resource
 
 
 	def deleteResource(self, resource: Resource) -> None:
 		with self.lockResources:
-			self.tabResources.remove(self.resourceQuery.ri == resource.ri)	
-	
+			if (docID := self.riIndex.get(resource.ri)) is not None:
+				self.tabResources.remove(doc_ids = [docID])
+				self._unindexResource(docID)
+				self._journalDocument('resources', self.tabResources, docID)
+
+
+	def deleteResources(self, resources:list[Resource]) -> None:
+		with self.lockResources:
+			if not (docIDs := [ docID for resource in resources if (docID := self.riIndex.get(resource.ri)) is not None ]):
+				return
+			self.tabResources.remove(doc_ids = docIDs)
+			for docID in docIDs:
+				self._unindexResource(docID)
+			self._journalRemovals('resources', docIDs)
+
 
 	def searchResources(self, ri:str = None, csi:str = None, srn:str = None, pi:str = None, ty:int = None, aei:str = None) -> list[Document]:
 		if not srn:
 			with self.lockResources:
 				if ri:
-					return self.tabResources.search(self.resourceQuery.ri == ri)
+					return self._getResources([ docID ] if (docID := self.riIndex.get(ri)) is not None else None)
 				elif csi:
-					return self.tabResources.search(self.resourceQuery.csi == csi)	
+					return self._getResources(self.csiIndex.get(csi))
 				elif pi:
+					if not (tys := self.piIndex.get(pi)):
+						return []
 					if ty is not None:	# ty is an int
-						return self.tabResources.search((self.resourceQuery.pi == pi) & (self.resourceQuery.ty == ty))
-					return self.tabResources.search(self.resourceQuery.pi == pi)
+						return self._getResources(tys.get(ty))
+					return self._getResources(set().union(*tys.values()))
 				elif ty is not None:	# ty is an int
-					return self.tabResources.search(self.resourceQuery.ty == ty)	
+					return self._getResources(self.tyIndex.get(ty))
 				elif aei:
-					return self.tabResources.search(self.resourceQuery.aei == aei)	
+					return self._getResources(self.aeiIndex.get(aei))
 		
 		else:
 			# for SRN find the ri first and then try again recursively (outside the lock!!)
@@ -482,11 +1495,11 @@ class TinyDBBinding(object):
 		if not srn:
 			with self.lockResources:
 				if ri:
-					return self.tabResources.contains(self.resourceQuery.ri == ri)	
+					return ri in self.riIndex
 				elif csi :
-					return self.tabResources.contains(self.resourceQuery.csi == csi)
+					return bool(self.csiIndex.get(csi))
 				elif ty is not None:	# ty is an int
-					return self.tabResources.contains(self.resourceQuery.ty == ty)
+					return bool(self.tyIndex.get(ty))
 		else:
 			# find the ri first and then try again recursively
 			if len((identifiers := self.searchIdentifiers(srn=srn))) == 1:
@@ -504,6 +1517,112 @@ class TinyDBBinding(object):
 		with self.lockResources:
 			return self.tabResources.search(self.resourceQuery.fragment(dct))
 
+
+	def _getResources(self, docIDs:set[int]|list[int]) -> list[Document]:
+		"""	Return the resource documents for a collection of document IDs.
+			The documents are returned in the order of their creation.
+			Must be called with the resources lock held.
+
+			When the DB is stored in the file system then the table is read only once,
+			instead of once for every document.
+
+			Args:
+				docIDs: Collection of document IDs, or None.
+			Return:
+				List of documents, or an empty list.
+		"""
+		if not docIDs:
+			return []
+		docIDs = sorted(docIDs)
+		if self.storageInMemory or len(docIDs) == 1:
+			return [ doc	for docID in docIDs
+							if (doc := self.tabResources.get(doc_id = docID)) is not None ]
+		ris = set([ self.resourceIndexKeys[docID][0] for docID in docIDs ])
+		return self.tabResources.search(lambda doc: doc.get('ri') in ris)	# type: ignore [arg-type]	# a single read of the file, in table order
+
+
+	def _indexResource(self, docID:int, dct:JSON) -> None:
+		"""	Add or refresh the index entries for a resource document.
+			Must be called with the resources lock held.
+
+			Args:
+				docID: TinyDB document ID of the resource.
+				dct: The resource's document.
+		"""
+		keys = (dct.get('ri'), dct.get('csi'), dct.get('aei'), dct.get('pi'), dct.get('ty'))
+		if self.resourceIndexKeys.get(docID) == keys:
+			return	# nothing changed
+		self._unindexResource(docID)
+		ri, csi, aei, pi, ty = keys
+		self.resourceIndexKeys[docID] = keys
+		if ri:
+			self.riIndex[ri] = docID
+		if csi:
+			self.csiIndex.setdefault(csi, set()).add(docID)
+		if aei:
+			self.aeiIndex.setdefault(aei, set()).add(docID)
+		if ty is not None:
+			self.tyIndex.setdefault(ty, set()).add(docID)
+		if pi:
+			self.piIndex.setdefault(pi, {}).setdefault(ty, set()).add(docID)
+
+
+	def _unindexResource(self, docID:int) -> None:
+		"""	Remove the index entries for a resource document.
+			Must be called with the resources lock held.
+
+			Args:
+				docID: TinyDB document ID of the resource.
+		"""
+
+		def _discard(index:dict, key:Any) -> None:
+			if (docIDs := index.get(key)) is not None:
+				docIDs.discard(docID)
+				if not docIDs:
+					del index[key]
+
+		if not (keys := self.resourceIndexKeys.pop(docID, None)):
+			return
+		ri, csi, aei, pi, ty = keys
+		if ri and self.riIndex.get(ri) == docID:
+			del self.riIndex[ri]
+		_discard(self.csiIndex, csi)
+		_discard(self.aeiIndex, aei)
+		_discard(self.tyIndex, ty)
+		if (tys := self.piIndex.get(pi)) is not None:
+			_discard(tys, ty)
+			if not tys:
+				del self.piIndex[pi]
+
+
+	def _clearIndexes(self) -> None:
+		"""	Clear all in-memory indexes.
+			Must be called with the resources and identifiers locks held.
+		"""
+		self.riIndex.clear()
+		self.csiIndex.clear()
+		self.aeiIndex.clear()
+		self.tyIndex.clear()
+		self.piIndex.clear()
+		self.resourceIndexKeys.clear()
+		self.identifierRiIndex.clear()
+		self.identifierSrnIndex.clear()
+		self.identifierSrns.clear()
+
+
+	def _buildIndexes(self) -> None:
+		"""	(Re)build all in-memory indexes from the resources and identifiers tables.
+		"""
+		with self.lockResources, self.lockIdentifiers:
+			self._clearIndexes()
+			for doc in self.tabResources.all():
+				self._indexResource(doc.doc_id, doc)
+			for doc in self.tabIdentifiers.all():
+				self.identifierRiIndex[doc['ri']] = doc.doc_id
+				if (srn := doc.get('srn')):
+					self.identifierSrnIndex[srn] = doc.doc_id
+					self.identifierSrns[doc.doc_id] = srn
+
 	#
 	#	Identifiers
 	#
@@ -512,18 +1631,52 @@ class TinyDBBinding(object):
 	def insertIdentifier(self, resource:Resource, ri:str, srn:str) -> None:
 		# L.isDebug and L.logDebug({'ri' : ri, 'rn' : resource.rn, 'srn' : srn, 'ty' : resource.ty})		
 		with self.lockIdentifiers:
-			self.tabIdentifiers.upsert(
-				{	'ri' : ri, 
-					'rn' : resource.rn, 
+			dct = {	'ri' : ri,
+					'rn' : resource.rn,
 					'srn' : srn,
-					'ty' : resource.ty 
-				}, 
-				self.identifierQuery.ri == ri)
+					'ty' : resource.ty
+				  }
+			if (docID := self.identifierRiIndex.get(ri)) is not None:
+				self._unindexIdentifierSrn(docID)
+				self.tabIdentifiers.update(dct, doc_ids = [docID])
+			else:
+				docID = self.tabIdentifiers.insert(dct)
+				self.identifierRiIndex[ri] = docID
+			if srn:
+				self.identifierSrnIndex[srn] = docID
+				self.identifierSrns[docID] = srn
+			self._journalDocument('identifiers', self.tabIdentifiers, docID)
 
 
 	def deleteIdentifier(self, resource:Resource) -> None:
 		with self.lockIdentifiers:
-			self.tabIdentifiers.remove(self.identifierQuery.ri == resource.ri)
+			if (docID := self.identifierRiIndex.pop(resource.ri, None)) is not None:
+				self._unindexIdentifierSrn(docID)
+				self.tabIdentifiers.remove(doc_ids = [docID])
+				self._journalDocument('identifiers', self.tabIdentifiers, docID)
+
+
+	def deleteIdentifiers(self, resources:list[Resource]) -> None:
+		with self.lockIdentifiers:
+			docIDs = []
+			for resource in resources:
+				if (docID := self.identifierRiIndex.pop(resource.ri, None)) is not None:
+					self._unindexIdentifierSrn(docID)
+					docIDs.append(docID)
+			if docIDs:
+				self.tabIdentifiers.remove(doc_ids = docIDs)
+				self._journalRemovals('identifiers', docIDs)
+
+
+	def _unindexIdentifierSrn(self, docID:int) -> None:
+		"""	Remove the structured name index entry for an identifier document.
+			Must be called with the identifiers lock held.
+
+			Args:
+				docID: TinyDB document ID of the identifier.
+		"""
+		if (srn := self.identifierSrns.pop(docID, None)) and self.identifierSrnIndex.get(srn) == docID:
+			del self.identifierSrnIndex[srn]
 
 
 	def searchIdentifiers(self, ri:str = None, srn:str = None) -> list[Document]:
@@ -540,10 +1693,14 @@ class TinyDBBinding(object):
 		 """
 		with self.lockIdentifiers:
 			if srn:
-				return self.tabIdentifiers.search(self.identifierQuery.srn == srn)
+				docID = self.identifierSrnIndex.get(srn)
 			elif ri:
-				return self.tabIdentifiers.search(self.identifierQuery.ri == ri)
-			return []
+				docID = self.identifierRiIndex.get(ri)
+			else:
+				return []
+			if docID is None or (doc := self.tabIdentifiers.get(doc_id = docID)) is None:
+				return []
+			return [ doc ]
 
 
 	#
@@ -557,32 +1714,32 @@ class TinyDBBinding(object):
 				return self.tabSubscriptions.search(self.subscriptionQuery.ri == ri)
 			if pi:
 				return self.tabSubscriptions.search(self.subscriptionQuery.pi == pi)
-			return None
+			return self.tabSubscriptions.all()
 
 
 	def upsertSubscription(self, subscription:Resource) -> bool:
 		with self.lockSubscriptions:
-			ri = subscription.ri
-			return self.tabSubscriptions.upsert(
-					{	'ri'  : ri, 
-						'pi'  : subscription.pi,
-						'nct' : subscription.nct,
-						'net' : subscription['enc/net'],	# TODO perhaps store enc as a whole?
-						'atr' : subscription['enc/atr'],
-						'chty': subscription['enc/chty'],
-						'exc' : subscription.exc,
-						'ln'  : subscription.ln,
-						'nus' : subscription.nu,
-						'bn'  : subscription.bn,
-						'cr'  : subscription.cr,
-						'ma'  : subscription.ma, # EXPERIMENTAL ma = maxAge
-					}, 
-					self.subscriptionQuery.ri == ri) is not None
+			docIDs = self.tabSubscriptions.upsert(self.subscriptionDocument(subscription), 
+												  self.subscriptionQuery.ri == subscription.ri)
+			for docID in docIDs:
+				self._journalDocument('subscriptions', self.tabSubscriptions, docID)
+			return docIDs is not None
 
 
 	def removeSubscription(self, subscription:Resource) -> bool:
 		with self.lockSubscriptions:
-			return len(self.tabSubscriptions.remove(self.subscriptionQuery.ri == subscription.ri)) > 0
+			docIDs = self.tabSubscriptions.remove(self.subscriptionQuery.ri == subscription.ri)
+			for docID in docIDs:
+				self._journalDocument('subscriptions', self.tabSubscriptions, docID)
+			return len(docIDs) > 0
+
+
+	def removeSubscriptions(self, resources:list[Resource]) -> bool:
+		ris = set([ resource.ri for resource in resources ])
+		with self.lockSubscriptions:
+			docIDs = self.tabSubscriptions.remove(self.subscriptionQuery.ri.test(lambda ri: ri in ris))	# type: ignore [no-untyped-call]
+			self._journalRemovals('subscriptions', docIDs)
+			return len(docIDs) > 0
 
 
 	#
@@ -591,12 +1748,14 @@ class TinyDBBinding(object):
 
 	def addBatchNotification(self, ri:str, nu:str, notificationRequest:JSON) -> bool:
 		with self.lockBatchNotifications:
-			return self.tabBatchNotifications.insert(
+			docID = self.tabBatchNotifications.insert(
 					{	'ri' 		: ri,
 						'nu' 		: nu,
 						'tstamp'	: DateUtils.utcTime(),
 						'request'	: notificationRequest
-					}) is not None
+					})
+			self._journalDocument('batchNotifications', self.tabBatchNotifications, docID)
+			return docID is not None
 
 
 	def countBatchNotifications(self, ri:str, nu:str) -> int:
@@ -604,14 +1763,19 @@ class TinyDBBinding(object):
 			return self.tabBatchNotifications.count((self.batchNotificationQuery.ri == ri) & (self.batchNotificationQuery.nu == nu))
 
 
-	def getBatchNotifications(self, ri:str, nu:str) -> list[Document]:
+	def getBatchNotifications(self, ri:str = None, nu:str = None) -> list[Document]:
 		with self.lockBatchNotifications:
+			if ri is None and nu is None:
+				return self.tabBatchNotifications.all()
 			return self.tabBatchNotifications.search((self.batchNotificationQuery.ri == ri) & (self.batchNotificationQuery.nu == nu))
 
 
 	def removeBatchNotifications(self, ri:str, nu:str) -> bool:
 		with self.lockBatchNotifications:
-			return len(self.tabBatchNotifications.remove((self.batchNotificationQuery.ri == ri) & (self.batchNotificationQuery.nu == nu))) > 0
+			docIDs = self.tabBatchNotifications.remove((self.batchNotificationQuery.ri == ri) & (self.batchNotificationQuery.nu == nu))
+			for docID in docIDs:
+				self._journalDocument('batchNotifications', self.tabBatchNotifications, docID)
+			return len(docIDs) > 0
 
 
 	#
@@ -628,9 +1792,11 @@ class TinyDBBinding(object):
 	def upsertStatistics(self, stats:JSON) -> bool:
 		with self.lockStatistics:
 			if len(self.tabStatistics) > 0:
-				return self.tabStatistics.update(stats, doc_ids = [1]) is not None
+				result = self.tabStatistics.update(stats, doc_ids = [1]) is not None
 			else:
-				return self.tabStatistics.insert(stats) is not None
+				result = self.tabStatistics.insert(stats) is not None
+			self._journalDocument('statistics', self.tabStatistics, 1)
+			return result
 
 
 	def purgeStatistics(self) -> None:
@@ -638,4 +1804,365 @@ class TinyDBBinding(object):
 		"""
 		with self.lockStatistics:
 			self.tabStatistics.truncate()
+			self._journalTruncate('statistics')
+
+
+
+#########################################################################
+#
+#	DB class that implements the SQLite binding
+#
+#	All tables are stored in a single database file. The attributes that are
+#	used for lookups are stored in indexed columns, the documents themselves
+#	are stored as JSON in the "body" column.
+
+
+class SQLiteBinding(DBBinding):
+
+	resourceColumns = ( 'ri', 'pi', 'ty', 'et', 'aei', 'csi' )
+	"""	Resource attributes that are stored in indexed columns. """
+
+
+	def __init__(self, path:str = None, postfix:str = '') -> None:
+		self.path = path
+		self.inMemory = Configuration.get('db.inMemory')
+
+		# create transaction lock. A single connection is shared between all threads
+		self.lockDB = RLock()
+
+		# file names
+		self.fileDB = f'{self.path}/acme{postfix}.db'
+
+		if self.inMemory:
+			L.isInfo and L.log('DB in memory')
+			self.connection = sqlite3.connect(':memory:', check_same_thread = False, isolation_level = None)
+		else:
+			L.isInfo and L.log(f'DB in file system: {self.fileDB}')
+			self.connection = sqlite3.connect(self.fileDB, check_same_thread = False, isolation_level = None)
+			self.connection.execute('PRAGMA journal_mode=WAL')
+			self.connection.execute('PRAGMA synchronous=NORMAL')
+
+		# Create tables and indexes
+		with self.lockDB:
+			self.connection.executescript('''
+				CREATE TABLE IF NOT EXISTS resources (ri TEXT PRIMARY KEY, pi TEXT, ty INTEGER, et TEXT, aei TEXT, csi TEXT, body TEXT NOT NULL);
+				CREATE INDEX IF NOT EXISTS resourcesPiTy ON resources (pi, ty);
+				CREATE INDEX IF NOT EXISTS resourcesTy ON resources (ty);
+				CREATE INDEX IF NOT EXISTS resourcesEt ON resources (et);
+				CREATE INDEX IF NOT EXISTS resourcesAei ON resources (aei);
+				CREATE INDEX IF NOT EXISTS resourcesCsi ON resources (csi);
+				CREATE TABLE IF NOT EXISTS identifiers (ri TEXT PRIMARY KEY, srn TEXT, body TEXT NOT NULL);
+				CREATE INDEX IF NOT EXISTS identifiersSrn ON identifiers (srn);
+				CREATE TABLE IF NOT EXISTS subscriptions (ri TEXT PRIMARY KEY, pi TEXT, body TEXT NOT NULL);
+				CREATE INDEX IF NOT EXISTS subscriptionsPi ON subscriptions (pi);
+				CREATE TABLE IF NOT EXISTS batchNotifications (id INTEGER PRIMARY KEY AUTOINCREMENT, ri TEXT, nu TEXT, body TEXT NOT NULL);
+				CREATE INDEX IF NOT EXISTS batchNotificationsRiNu ON batchNotifications (ri, nu);
+				CREATE TABLE IF NOT EXISTS statistics (id INTEGER PRIMARY KEY, body TEXT NOT NULL);
+			''')
+
+
+	def closeDB(self) -> None:
+		L.isInfo and L.log('Closing DBs')
+		with self.lockDB:
+			self.connection.close()
+
+
+	def purgeDB(self) -> None:
+		L.isInfo and L.log('Purging DBs')
+		with self.lockDB:
+			self.connection.executescript('''
+				DELETE FROM resources;
+				DELETE FROM identifiers;
+				DELETE FROM subscriptions;
+				DELETE FROM batchNotifications;
+				DELETE FROM statistics;
+			''')
+
+
+	def backupDB(self, dir:str) -> bool:
+		if self.inMemory:
+			return True
+		with self.lockDB:
+			backup = sqlite3.connect(f'{dir}/{os.path.basename(self.fileDB)}')
+			try:
+				self.connection.backup(backup)
+			finally:
+				backup.close()
+		return True
+
+
+	def _fetch(self, sql:str, parameters:tuple = ()) -> list[JSON]:
+		"""	Execute a query and return the JSON bodies of the result rows.
+
+			Args:
+				sql: SQL query that selects the *body* column.
+				parameters: Query parameters.
+			Return:
+				List of documents, or an empty list.
+		"""
+		with self.lockDB:
+			return [ json.loads(row[0]) for row in self.connection.execute(sql, parameters) ]
+
 
+	def _exists(self, sql:str, parameters:tuple = ()) -> bool:
+		with self.lockDB:
+			return self.connection.execute(sql, parameters).fetchone() is not None
+
+
+	def _executeMany(self, sql:str, parameters:list[tuple]) -> int:
+		"""	Execute a statement for a list of parameters in a single transaction.
+
+			Args:
+				sql: SQL statement.
+				parameters: List of statement parameters.
+			Return:
+				Number of affected rows.
+		"""
+		with self.lockDB:
+			self.connection.execute('BEGIN')
+			try:
+				count = self.connection.executemany(sql, parameters).rowcount
+			except:
+				self.connection.execute('ROLLBACK')
+				raise
+			self.connection.execute('COMMIT')
+			return count
+
+
+	def _resourceRow(self, dct:JSON) -> tuple:
+		"""	Return the column values plus the JSON body for a resource document.
+		"""
+		ty = dct.get('ty')
+		return (dct.get('ri'), dct.get('pi'), int(ty) if ty is not None else None, dct.get('et'), dct.get('aei'), dct.get('csi'), json.dumps(dct))
+
+
+	#
+	#	Resources
+	#
+
+
+	def insertResource(self, resource: Resource) -> None:
+		with self.lockDB:
+			self.connection.execute('INSERT INTO resources (ri, pi, ty, et, aei, csi, body) VALUES (?, ?, ?, ?, ?, ?, ?)', 
+									self._resourceRow(resource.dict))
+
+
+	def upsertResource(self, resource: Resource) -> None:
+		with self.lockDB:
+			# Update existing or insert new when overwriting
+			self.connection.execute('''INSERT INTO resources (ri, pi, ty, et, aei, csi, body) VALUES (?, ?, ?, ?, ?, ?, ?)
+									   ON CONFLICT (ri) DO UPDATE SET pi = excluded.pi, ty = excluded.ty, et = excluded.et, 
+									   aei = excluded.aei, csi = excluded.csi, body = excluded.body''', 
+									self._resourceRow(resource.dict))
+
+
+	def updateResource(self, resource: Resource) -> Resource:
+		with self.lockDB:
+			if (row := self.connection.execute('SELECT body FROM resources WHERE ri = ?', (resource.ri,)).fetchone()) is None:
+				return resource
+			# merge with the stored document and remove nullified fields from db and resource
+			dct = json.loads(row[0])
+			dct.update(resource.dict)
+			for k in list(resource.dict):
+				if resource.dict[k] is None:	# only remove the real None attributes, not those with 0
+					del dct[k]
+					del resource.dict[k]
+			self.connection.execute('UPDATE resources SET ri = ?, pi = ?, ty = ?, et = ?, aei = ?, csi = ?, body = ? WHERE ri = ?', 
+									self._resourceRow(dct) + (resource.ri, ))
+			return resource
+
+
+	def deleteResource(self, resource: Resource) -> None:
+		with self.lockDB:
+			self.connection.execute('DELETE FROM resources WHERE ri = ?', (resource.ri, ))
+
+
+	def deleteResources(self, resources:list[Resource]) -> None:
+		self._executeMany('DELETE FROM resources WHERE ri = ?', [ (resource.ri, ) for resource in resources ])
+
+
+	def searchResources(self, ri:str = None, csi:str = None, srn:str = None, pi:str = None, ty:int = None, aei:str = None) -> list[JSON]:
+		if not srn:
+			if ri:
+				return self._fetch('SELECT body FROM resources WHERE ri = ?', (ri, ))
+			elif csi:
+				return self._fetch('SELECT body FROM resources WHERE csi = ? ORDER BY rowid', (csi, ))
+			elif pi:
+				if ty is not None:	# ty is an int
+					return self._fetch('SELECT body FROM resources WHERE pi = ? AND ty = ? ORDER BY rowid', (pi, ty))
+				return self._fetch('SELECT body FROM resources WHERE pi = ? ORDER BY rowid', (pi, ))
+			elif ty is not None:	# ty is an int
+				return self._fetch('SELECT body FROM resources WHERE ty = ? ORDER BY rowid', (ty, ))
+			elif aei:
+				return self._fetch('SELECT body FROM resources WHERE aei = ? ORDER BY rowid', (aei, ))
+		else:
+			return self._fetch('SELECT r.body FROM identifiers i JOIN resources r ON r.ri = i.ri WHERE i.srn = ?', (srn, ))
+		return []
+
+
+	def discoverResourcesByFilter(self, func:Callable[[JSON], bool]) -> list[JSON]:
+		return [ doc for doc in self._fetch('SELECT body FROM resources ORDER BY rowid') if func(doc) ]
+
+
+	def hasResource(self, ri: str = None, csi: str = None, srn: str = None, ty: int = None) -> bool:
+		if not srn:
+			if ri:
+				return self._exists('SELECT 1 FROM resources WHERE ri = ?', (ri, ))
+			elif csi :
+				return self._exists('SELECT 1 FROM resources WHERE csi = ?', (csi, ))
+			elif ty is not None:	# ty is an int
+				return self._exists('SELECT 1 FROM resources WHERE ty = ?', (ty, ))
+		else:
+			return self._exists('SELECT 1 FROM identifiers i JOIN resources r ON r.ri = i.ri WHERE i.srn = ?', (srn, ))
+		return False
+
+
+	def countResources(self) -> int:
+		with self.lockDB:
+			return self.connection.execute('SELECT COUNT(*) FROM resources').fetchone()[0]
+
+
+	def searchByFragment(self, dct:dict) -> list[JSON]:
+		""" Search and return all resources that match the given dictionary/document. 
+			Attributes that are stored in indexed columns are matched by the database,
+			all others are matched against the documents.
+		"""
+		conditions = []
+		parameters = []
+		for k, v in dct.items():
+			if k in self.resourceColumns and isinstance(v, (str, int)):
+				conditions.append(f'{k} = ?')
+				parameters.append(v)
+		sql = 'SELECT body FROM resources'
+		if conditions:
+			sql += ' WHERE ' + ' AND '.join(conditions)
+		return [ doc	for doc in self._fetch(sql + ' ORDER BY rowid', tuple(parameters)) 
+						if all(k in doc and doc[k] == v for k, v in dct.items()) ]
+
+
+	#
+	#	Identifiers
+	#
+
+
+	def insertIdentifier(self, resource:Resource, ri:str, srn:str) -> None:
+		with self.lockDB:
+			self.connection.execute('INSERT OR REPLACE INTO identifiers (ri, srn, body) VALUES (?, ?, ?)', 
+									(ri, srn, json.dumps({	'ri' : ri, 
+															'rn' : resource.rn, 
+															'srn' : srn,
+															'ty' : resource.ty 
+														})))
+
+
+	def deleteIdentifier(self, resource:Resource) -> None:
+		with self.lockDB:
+			self.connection.execute('DELETE FROM identifiers WHERE ri = ?', (resource.ri, ))
+
+
+	def deleteIdentifiers(self, resources:list[Resource]) -> None:
+		self._executeMany('DELETE FROM identifiers WHERE ri = ?', [ (resource.ri, ) for resource in resources ])
+
+
+	def searchIdentifiers(self, ri:str = None, srn:str = None) -> list[JSON]:
+		"""	Search for an resource ID OR for a structured name in the identifiers DB.
+
+			Either *ri* or *srn* shall be given. If both are given then *srn*
+			is taken.
+		
+			Args:
+				ri: Resource ID to search for.
+				srn: Structured path to search for.
+			Return:
+				A list of found identifier documents (see `insertIdentifier`), or an empty list if not found.
+		 """
+		if srn:
+			return self._fetch('SELECT body FROM identifiers WHERE srn = ?', (srn, ))
+		elif ri:
+			return self._fetch('SELECT body FROM identifiers WHERE ri = ?', (ri, ))
+		return []
+
+
+	#
+	#	Subscriptions
+	#
+
+
+	def searchSubscriptions(self, ri:str = None, pi:str = None) -> list[JSON]:
+		if ri:
+			return self._fetch('SELECT body FROM subscriptions WHERE ri = ?', (ri, ))
+		if pi:
+			return self._fetch('SELECT body FROM subscriptions WHERE pi = ? ORDER BY rowid', (pi, ))
+		return self._fetch('SELECT body FROM subscriptions ORDER BY rowid')
+
+
+	def upsertSubscription(self, subscription:Resource) -> bool:
+		with self.lockDB:
+			self.connection.execute('''INSERT INTO subscriptions (ri, pi, body) VALUES (?, ?, ?)
+									   ON CONFLICT (ri) DO UPDATE SET pi = excluded.pi, body = excluded.body''', 
+									(subscription.ri, subscription.pi, json.dumps(self.subscriptionDocument(subscription))))
+			return True
+
+
+	def removeSubscription(self, subscription:Resource) -> bool:
+		with self.lockDB:
+			return self.connection.execute('DELETE FROM subscriptions WHERE ri = ?', (subscription.ri, )).rowcount > 0
+
+
+	def removeSubscriptions(self, resources:list[Resource]) -> bool:
+		return self._executeMany('DELETE FROM subscriptions WHERE ri = ?', [ (resource.ri, ) for resource in resources ]) > 0
+
+
+	#
+	#	BatchNotifications
+	#
+
+	def addBatchNotification(self, ri:str, nu:str, notificationRequest:JSON) -> bool:
+		with self.lockDB:
+			self.connection.execute('INSERT INTO batchNotifications (ri, nu, body) VALUES (?, ?, ?)',
+									(ri, nu, json.dumps({	'ri' 		: ri,
+															'nu' 		: nu,
+															'tstamp'	: DateUtils.utcTime(),
+															'request'	: notificationRequest
+														})))
+			return True
+
+
+	def countBatchNotifications(self, ri:str, nu:str) -> int:
+		with self.lockDB:
+			return self.connection.execute('SELECT COUNT(*) FROM batchNotifications WHERE ri = ? AND nu = ?', (ri, nu)).fetchone()[0]
+
+
+	def getBatchNotifications(self, ri:str = None, nu:str = None) -> list[JSON]:
+		if ri is None and nu is None:
+			return self._fetch('SELECT body FROM batchNotifications ORDER BY id')
+		return self._fetch('SELECT body FROM batchNotifications WHERE ri = ? AND nu = ? ORDER BY id', (ri, nu))
+
+
+	def removeBatchNotifications(self, ri:str, nu:str) -> bool:
+		with self.lockDB:
+			return self.connection.execute('DELETE FROM batchNotifications WHERE ri = ? AND nu = ?', (ri, nu)).rowcount > 0
+
+
+	#
+	#	Statistics
+	#
+
+	def searchStatistics(self) -> JSON:
+		stats = self._fetch('SELECT body FROM statistics WHERE id = 1')
+		return stats[0] if stats and stats[0] else None
+
+
+	def upsertStatistics(self, stats:JSON) -> bool:
+		with self.lockDB:
+			dct = self.searchStatistics() or {}
+			dct.update(stats)
+			self.connection.execute('INSERT OR REPLACE INTO statistics (id, body) VALUES (1, ?)', (json.dumps(dct), ))
+			return True
+
+
+	def purgeStatistics(self) -> None:
+		"""	Purge the statistics DB.
+		"""
+		with self.lockDB:
+			self.connection.execute('DELETE FROM statistics')
@@ -0,0 +1,94 @@
+#
+#	AccessControlBenchmark.py
+#
+#	License: BSD 3-Clause License. See the LICENSE file for further details.
+#
+#	Benchmark for the permission checks of <acp> resources with many originators.
+#	The check with the precompiled access control rules of an <acp> is compared with
+#	a check that interprets the raw *pv/acr* rules, as it was done before the rules
+#	were compiled.
+#
+
+from __future__ import annotations
+import argparse, sys, time
+
+import pathlib, os
+parent = pathlib.Path(os.path.abspath(os.path.dirname(__file__))).parent.parent
+sys.path.append(f'{parent}')
+from acme.services.Configuration import Configuration
+from acme.services import CSE	# import the CSE first to resolve the circular imports of the services
+from acme.resources import Factory
+from acme.resources.ACP import ACP, compileAccessControlRules
+from acme.helpers.TextTools import simpleMatch
+from acme.etc.Types import Permission, ResourceTypes as T
+
+
+def interpretPermission(acp:ACP, originator:str, requestedPermission:Permission, ty:T) -> bool:
+	"""	Check the permission by interpreting the raw *pv/acr* rules of the <acp>.
+	"""
+	for acr in acp['pv/acr']:
+		if requestedPermission & acr['acop'] == Permission.NONE:
+			continue
+		if acod := acr.get('acod'):
+			for eachAcod in acod:
+				if requestedPermission == Permission.CREATE:
+					if ty is None or ty not in eachAcod.get('chty'):
+						continue
+				else:
+					if ty not in eachAcod.get('ty'):
+						continue
+				break
+			else:
+				continue
+		if 'all' in acr['acor'] or originator in acr['acor'] or requestedPermission == Permission.NOTIFY:
+			return True
+		if any([ simpleMatch(originator, a) for a in acr['acor'] ]):
+			return True
+	return False
+
+
+def timeIt(func, count:int) -> float:
+	"""	Return the average time in us of *count* calls of *func(i)*.
+	"""
+	start = time.perf_counter()
+	for i in range(count):
+		func(i)
+	return (time.perf_counter() - start) / count * 1000000.0
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description = 'Benchmark the permission checks of <acp> resources')
+	parser.add_argument('--originators', type = int, default = 1000, help = 'number of originators per access control rule (default: 1000)')
+	parser.add_argument('--wildcards', type = int, default = 10, help = 'number of wildcard originators among them (default: 10)')
+	parser.add_argument('--count', type = int, default = 20, help = 'number of interpreted checks per measurement (default: 20)')
+	args = parser.parse_args()
+
+	# The resources are not stored, so no further configuration is needed
+	Configuration._configuration = { 'db.inMemory' : True, 'db.resetOnStartup' : False, 'db.backend' : 'tinydb', 'db.cacheSize' : 0,
+									 'db.journal' : False, 'db.resourceCacheSize' : 0, 'db.identifierCacheSize' : 0 }
+	CSE.cseCsi = '/id-benchmark'
+
+	# One rule for RETRIEVE/UPDATE/DELETE/DISCOVERY, and one rule for CREATE of some child resource types
+	literals = args.originators - args.wildcards
+	acor = [ f'Coriginator{i}' for i in range(literals) ] + [ f'Cwildcard{i}*' for i in range(args.wildcards) ]
+	doc = {	'ri' : 'acp1', 'pi' : 'cb', 'ty' : int(T.ACP), 'rn' : 'acp1', '__srn__' : 'cse-in/acp1',
+			'ct' : '20220101T000000', 'lt' : '20220101T000000', 'et' : '99991231T235959',
+			'pv' : { 'acr' : [	{ 'acor' : acor, 'acop' : Permission.RETRIEVE | Permission.UPDATE | Permission.DELETE | Permission.DISCOVERY },
+								{ 'acor' : acor, 'acop' : Permission.CREATE, 'acod' : [ { 'chty' : [ int(T.CNT), int(T.CIN), int(T.SUB), int(T.FCNT) ] } ] } ] },
+			'pvs' : { 'acr' : [ { 'acor' : acor, 'acop' : Permission.ALL } ] } }
+	acp = Factory.resourceFromDict(doc).resource
+
+	print(f'<acp> with {args.originators} originators per rule, {args.wildcards} of them wildcards (us per check)')
+	compileTime = timeIt(lambda i: compileAccessControlRules(acp['pv/acr']), args.count * 10)
+	print(f'  {"compile the pv/acr rules":40}  {compileTime:11.2f}')
+	for name, originator, permission, ty in [	('RETRIEVE, literal originator', f'Coriginator{literals // 2}', Permission.RETRIEVE, None),
+												('RETRIEVE, wildcard originator', f'Cwildcard{args.wildcards // 2}xyz', Permission.RETRIEVE, None),
+												('RETRIEVE, unknown originator', 'Cunknown', Permission.RETRIEVE, None),
+												('CREATE <cin>, literal originator', f'Coriginator{literals // 2}', Permission.CREATE, T.CIN),
+												('CREATE <ae>, literal originator', f'Coriginator{literals // 2}', Permission.CREATE, T.AE) ]:
+		assert (result := acp.checkPermission(originator, permission, ty)) == interpretPermission(acp, originator, permission, ty)
+		interpreted = timeIt(lambda i: interpretPermission(acp, originator, permission, ty), args.count)
+		compiled = timeIt(lambda i: acp.checkPermission(originator, permission, ty), args.count * 1000)
+		print(f'  {f"{name} ({result})":40}  interpreted: {interpreted:11.2f}   compiled: {compiled:9.2f}')
+	selfCheck = timeIt(lambda i: acp.checkSelfPermission(f'Coriginator{literals // 2}', Permission.UPDATE), args.count * 1000)
+	print(f'  {"self UPDATE, literal originator":40}  {"":28} compiled: {selfCheck:9.2f}')
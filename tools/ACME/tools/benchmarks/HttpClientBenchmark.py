@@ -0,0 +1,145 @@
+#
+#	HttpClientBenchmark.py
+#
+#	License: BSD 3-Clause License. See the LICENSE file for further details.
+#
+#	Benchmark for sending http requests, e.g. notifications, with re-used connections.
+#	A request with a new connection per request is compared with a request that is sent
+#	with a client session and its connection pool, as the CSE does with a
+#	*connectionPoolSize* > 0. Requests/s and the p50/p99 latencies are measured against
+#	a local stand-in receiver.
+#
+#	With the "--cse" argument the end-to-end notification throughput of a running CSE is
+#	measured as well. Start the CSE first, e.g. with "python -m acme --db-storage memory --headless",
+#	and run the benchmark with different *[server.http]:connectionPoolSize* settings.
+#
+
+from __future__ import annotations
+import argparse, json, sys, threading, time
+from typing import Callable
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import requests
+
+receiverURL:str = None
+received:list[float] = []					# arrival times of the notifications
+connections:set[tuple[str, int]] = set()	# client addresses of the connections to the receiver
+lockReceived = threading.Lock()
+
+
+class StandInReceiver(BaseHTTPRequestHandler):
+	"""	Stand-in notification receiver. It supports persistent connections.
+	"""
+	protocol_version = 'HTTP/1.1'
+
+	def do_POST(self) -> None:
+		body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+		if not (body and json.loads(body).get('m2m:sgn', {}).get('vrq')):
+			with lockReceived:
+				received.append(time.perf_counter())
+				connections.add(self.client_address)
+		self.send_response(200)
+		self.send_header('X-M2M-RSC', '2000')
+		self.send_header('X-M2M-RI', self.headers.get('X-M2M-RI', ''))
+		self.send_header('Content-Length', '0')
+		self.end_headers()
+
+
+	def log_message(self, *args:str) -> None:
+		pass
+
+
+def measure(send:Callable[[], None], count:int, warmup:int = 50) -> tuple[float, float, float]:
+	"""	Call *send* *count* times. Return the requests/s, and the p50 and p99 latencies in ms.
+	"""
+	for _ in range(warmup):
+		send()
+	latencies:list[float] = []
+	start = time.perf_counter()
+	for _ in range(count):
+		t = time.perf_counter()
+		send()
+		latencies.append(time.perf_counter() - t)
+	duration = time.perf_counter() - start
+	latencies.sort()
+	return count / duration, latencies[count // 2] * 1000.0, latencies[int(count * 0.99)] * 1000.0
+
+
+def benchmarkClient(count:int, poolSize:int) -> None:
+	"""	Compare requests with a new connection per request with requests sent by a pooled client session.
+	"""
+	body = json.dumps({ 'm2m:sgn' : { 'nev' : { 'rep' : { 'm2m:cin' : { 'con' : 'benchmark' } }, 'net' : 3 }, 'sur' : '/id-benchmark/sub' } })
+	headers = { 'X-M2M-Origin' : '/id-benchmark', 'X-M2M-RVI' : '3', 'Content-Type' : 'application/json' }
+	session = requests.Session()
+	adapter = requests.adapters.HTTPAdapter(pool_connections = 1, pool_maxsize = poolSize)
+	session.mount('http://', adapter)
+
+	print(f'Client: {count} requests to {receiverURL}')
+	for name, send in [	('new connection per request', lambda: requests.request('POST', f'{receiverURL}/n', data = body, headers = headers)),
+						(f'session, pool size {poolSize}', lambda: session.request('POST', f'{receiverURL}/n', data = body, headers = headers)) ]:
+		requestsPerSecond, p50, p99 = measure(send, count)
+		print(f'  {name:30} {requestsPerSecond:8.0f} req/s   p50: {p50:7.2f} ms   p99: {p99:7.2f} ms')
+	session.close()
+
+
+def benchmarkCSE(cseURL:str, csename:str, count:int) -> None:
+	"""	Measure the notifications/s of a running CSE, and the p50/p99 latencies of the <cin> CREATE
+		requests that raise the notifications.
+	"""
+	session = requests.Session()
+	originator = 'ChttpClientBenchmark'
+	ae = f'/{csename}/httpClientBenchmark'
+
+	def sendRequest(method:str, path:str, ty:int = None, body:dict = None) -> str:
+		headers = { 'X-M2M-Origin' : originator, 'X-M2M-RI' : str(time.time()), 'X-M2M-RVI' : '3', 'Accept' : 'application/json' }
+		if ty is not None:
+			headers['Content-Type'] = f'application/json;ty={ty}'
+		return session.request(method, f'{cseURL}{path}', headers = headers, data = json.dumps(body) if body is not None else None).headers.get('X-M2M-RSC')
+
+	sendRequest('DELETE', ae)	# from an earlier run
+	if (rsc := sendRequest('POST', f'/{csename}', 2, { 'm2m:ae' : { 'rn' : 'httpClientBenchmark', 'api' : 'NhttpClientBenchmark', 'rr' : True, 'srv' : [ '3' ] } })) != '2001':
+		print(f'Cannot register <AE> at {cseURL}: {rsc}')
+		sys.exit(1)
+	try:
+		sendRequest('POST', ae, 3, { 'm2m:cnt' : { 'rn' : 'cnt', 'mni' : 10 } })
+		sendRequest('POST', f'{ae}/cnt', 23, { 'm2m:sub' : { 'rn' : 'sub', 'nu' : [ f'{receiverURL}/n' ], 'enc' : { 'net' : [ 3 ] } } })
+		createInstance = lambda: sendRequest('POST', f'{ae}/cnt', 4, { 'm2m:cin' : { 'con' : 'benchmark' } })
+		for _ in range(50):		# warm up
+			createInstance()
+		time.sleep(1.0)
+		with lockReceived:
+			received.clear()
+			connections.clear()
+		start = time.perf_counter()
+		requestsPerSecond, p50, p99 = measure(createInstance, count, warmup = 0)
+		deadline = time.perf_counter() + 10.0
+		while len(received) < count and time.perf_counter() < deadline:
+			time.sleep(0.01)
+		with lockReceived:
+			notificationsPerSecond = len(received) / (max(received) - start) if received else 0.0
+			print(f'CSE: {count} <cin> CREATE requests with a notification each')
+			print(f'  CREATE requests              {requestsPerSecond:8.0f} req/s   p50: {p50:7.2f} ms   p99: {p99:7.2f} ms')
+			print(f'  notifications received       {notificationsPerSecond:8.0f} ntfy/s  ({len(received)} notifications over {len(connections)} connections)')
+	finally:
+		sendRequest('DELETE', ae)
+		session.close()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description = 'Benchmark sending http requests with re-used connections')
+	parser.add_argument('--cse', action = 'store', dest = 'cse', default = None, help = 'CSE base URL for the end-to-end notification benchmark, e.g. http://127.0.0.1:8080 (default: none)')
+	parser.add_argument('--csename', action = 'store', dest = 'csename', default = 'cse-in', help = 'resource name of the CSEBase (default: cse-in)')
+	parser.add_argument('--port', action = 'store', dest = 'port', default = 9997, type = int, help = 'port of the stand-in receiver (default: 9997)')
+	parser.add_argument('--count', action = 'store', dest = 'count', default = 2000, type = int, help = 'number of requests per measurement (default: 2000)')
+	parser.add_argument('--pool-size', action = 'store', dest = 'poolSize', default = 10, type = int, help = 'connection pool size of the client session (default: 10)')
+	args = parser.parse_args()
+
+	receiverURL = f'http://127.0.0.1:{args.port}'
+	server = ThreadingHTTPServer(('127.0.0.1', args.port), StandInReceiver)
+	server.daemon_threads = True
+	threading.Thread(target = server.serve_forever, daemon = True).start()
+	try:
+		benchmarkClient(args.count, args.poolSize)
+		if args.cse:
+			benchmarkCSE(args.cse, args.csename, args.count)
+	finally:
+		server.shutdown()
@@ -0,0 +1,77 @@
+#
+#	InstanceIndexBenchmark.py
+#
+#	License: BSD 3-Clause License. See the LICENSE file for further details.
+#
+#	Benchmark for the latest/oldest instance lookups (e.g. <cnt>/la and <cnt>/ol).
+#	The lookup through the storage's per-parent instance index is compared with
+#	a scan of all resources, as it was done before the index existed.
+#
+
+from __future__ import annotations
+import argparse, operator, sys, time
+
+import pathlib, os
+parent = pathlib.Path(os.path.abspath(os.path.dirname(__file__))).parent.parent
+sys.path.append(f'{parent}')
+from acme.services.Configuration import Configuration
+from acme.services import CSE	# import the CSE first to resolve the circular imports of the services
+from acme.services.Storage import Storage
+from acme.etc.Types import ResourceTypes as T
+
+
+def scanLatestOldest(storage:Storage, pi:str, ty:T, oldest:bool = False) -> str:
+	"""	Find the latest or oldest instance by scanning all resources. Return its resource ID.
+	"""
+	hit = None
+	op = operator.gt if oldest else operator.lt
+	def determineLatest(res:dict) -> bool:
+		nonlocal hit
+		if res['pi'] == pi and res['ty'] == ty and (not hit or op(hit['ct'], res['ct'])):
+			hit = res
+		return False
+	storage.db.discoverResourcesByFilter(determineLatest)
+	return hit['ri'] if hit else None
+
+
+def timeIt(func, count:int) -> float:
+	"""	Return the average time in ms of *count* calls of *func(i)*.
+	"""
+	start = time.perf_counter()
+	for i in range(count):
+		func(i)
+	return (time.perf_counter() - start) / count * 1000.0
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description = 'Benchmark the latest/oldest instance lookups')
+	parser.add_argument('--containers', type = int, default = 100, help = 'number of <cnt> resources')
+	parser.add_argument('--instances', type = int, default = 10000, help = 'number of <cin> resources per <cnt>')
+	parser.add_argument('--count', type = int, default = 10, help = 'number of scan lookups per measurement')
+	args = parser.parse_args()
+
+	# Only the storage configuration is needed. The DB is kept in memory
+	Configuration._configuration = { 'db.inMemory' : True, 'db.resetOnStartup' : False, 'db.backend' : 'tinydb', 'db.cacheSize' : 0,
+									 'db.journal' : False, 'db.resourceCacheSize' : 0, 'db.identifierCacheSize' : 0 }
+	CSE.cseCsi = '/id-benchmark'
+	storage = Storage()
+	containers, instances = args.containers, args.instances
+	storage.db.tabResources.insert_multiple([ {	'ri' : f'cin{c}_{i}', 'pi' : f'cnt{c}', 'ty' : int(T.CIN), 'rn' : f'cin_{i}',
+												'ct' : f'20220101T{i:06d}', 'lt' : f'20220101T{i:06d}', 'et' : '99991231T235959',
+												'st' : i, 'con' : 'x', 'cs' : 1 }
+											  for c in range(containers) for i in range(instances) ])
+	storage.db._buildIndexes()
+
+	print(f'{containers} <cnt> x {instances} <cin> (ms per lookup)')
+	scan = timeIt(lambda i: scanLatestOldest(storage, f'cnt{i % containers}', T.CIN), args.count)
+	start = time.perf_counter()
+	for c in range(containers):
+		storage.instanceStatistics(f'cnt{c}', T.CIN)
+	build = (time.perf_counter() - start) / containers * 1000.0
+	latest = timeIt(lambda i: storage.latestOldestInstance(f'cnt{i % containers}', T.CIN), containers * 10)
+	oldest = timeIt(lambda i: storage.latestOldestInstance(f'cnt{i % containers}', T.CIN, oldest = True), containers * 10)
+	assert storage.latestOldestInstance('cnt0', T.CIN).ri == scanLatestOldest(storage, 'cnt0', T.CIN)
+	print(f'  scan latest:                      {scan:9.3f}')
+	print(f'  index, first access per <cnt>:    {build:9.3f}')
+	print(f'  index latest:                     {latest:9.3f}')
+	print(f'  index oldest:                     {oldest:9.3f}')
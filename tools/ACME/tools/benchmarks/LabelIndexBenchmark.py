@@ -0,0 +1,95 @@
+#
+#	LabelIndexBenchmark.py
+#
+#	License: BSD 3-Clause License. See the LICENSE file for further details.
+#
+#	Benchmark for the label discovery (the *lbl* filter criterion). The discovery through
+#	the storage's label index is compared with a walk of the resource tree that checks the
+#	labels of every resource, as it was done before the index existed.
+#
+#	The defaults are a smaller version of the 1M resources / 10k labels scenario, which can
+#	be run with "--resources 1000000".
+#
+
+from __future__ import annotations
+import argparse, sys, time
+
+import pathlib, os
+parent = pathlib.Path(os.path.abspath(os.path.dirname(__file__))).parent.parent
+sys.path.append(f'{parent}')
+from acme.services.Configuration import Configuration
+from acme.services import CSE	# import the CSE first to resolve the circular imports of the services
+from acme.services.Storage import Storage
+from acme.services.Dispatcher import Dispatcher
+from acme.resources.Resource import Resource
+from acme.etc.Types import ResourceTypes as T
+
+
+def walkLabels(dispatcher:Dispatcher, root:Resource, labels:list[str], level:int) -> list[str]:
+	"""	Find the resources with at least one of the labels by walking the resource tree. Return their resource IDs.
+	"""
+	return [ doc['ri'] for doc in dispatcher._walkResourceTree(root.ri, level) if (lbl := doc.get('lbl')) and not set(lbl).isdisjoint(labels) ]
+
+
+def indexLabels(dispatcher:Dispatcher, root:Resource, labels:list[str], level:int) -> list[str]:
+	"""	Find the resources with at least one of the labels through the label index. Return their resource IDs.
+	"""
+	return [ doc['ri'] for doc in dispatcher._resourcesByLabels(labels, root, level) ]
+
+
+def timeIt(func, count:int) -> float:
+	"""	Return the average time in ms of *count* calls of *func(i)*.
+	"""
+	start = time.perf_counter()
+	for i in range(count):
+		func(i)
+	return (time.perf_counter() - start) / count * 1000.0
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description = 'Benchmark the label discovery')
+	parser.add_argument('--resources', type = int, default = 100000, help = 'number of labelled <cin> resources')
+	parser.add_argument('--labels', type = int, default = 10000, help = 'number of distinct labels')
+	parser.add_argument('--aes', type = int, default = 10, help = 'number of <ae> resources')
+	parser.add_argument('--containers', type = int, default = 100, help = 'number of <cnt> resources per <ae>')
+	parser.add_argument('--count', type = int, default = 3, help = 'number of tree walks per measurement')
+	args = parser.parse_args()
+
+	# Only the storage configuration is needed. The DB is kept in memory
+	Configuration._configuration = { 'db.inMemory' : True, 'db.resetOnStartup' : False, 'db.backend' : 'tinydb', 'db.cacheSize' : 0,
+									 'db.journal' : False, 'db.resourceCacheSize' : 0, 'db.identifierCacheSize' : 0 }
+	CSE.cseCsi = '/id-benchmark'
+	CSE.storage = storage = Storage()
+	dispatcher = Dispatcher.__new__(Dispatcher)	# Only the tree walks are used
+
+	# The <cin> resources are distributed over all <cnt>s, and each one has one of the labels
+	aes, containers, labels = args.aes, args.containers, args.labels
+	resources = (args.resources // (aes * containers)) * aes * containers
+	perContainer = resources // (aes * containers)
+	docs = [ { 'ri' : 'cb', 'pi' : '', 'ty' : int(T.CSEBase), 'rn' : 'cse-in', Resource._srn : 'cse-in', 'ct' : '20220101T000000', 'lt' : '20220101T000000', 'et' : '99991231T235959' } ]
+	for a in range(aes):
+		docs.append({ 'ri' : f'ae{a}', 'pi' : 'cb', 'ty' : int(T.AE), 'rn' : f'ae{a}', Resource._srn : f'cse-in/ae{a}', 'ct' : '20220101T000000', 'lt' : '20220101T000000', 'et' : '99991231T235959' })
+		for c in range(containers):
+			docs.append({ 'ri' : f'cnt{a}_{c}', 'pi' : f'ae{a}', 'ty' : int(T.CNT), 'rn' : f'cnt{c}', Resource._srn : f'cse-in/ae{a}/cnt{c}', 'ct' : '20220101T000000', 'lt' : '20220101T000000', 'et' : '99991231T235959' })
+			for i in range(perContainer):
+				n = (a * containers + c) * perContainer + i
+				docs.append({ 'ri' : f'cin{a}_{c}_{i}', 'pi' : f'cnt{a}_{c}', 'ty' : int(T.CIN), 'rn' : f'cin{i}', Resource._srn : f'cse-in/ae{a}/cnt{c}/cin{i}',
+							  'ct' : '20220101T000000', 'lbl' : [ f'label{n * 7919 % labels}' ], 'con' : 'x', 'cs' : 1 })
+	storage.db.tabResources.insert_multiple(docs)
+	del docs
+	storage.db._buildIndexes()
+	start = time.perf_counter()
+	storage._buildLabelIndex()
+	build = (time.perf_counter() - start) * 1000.0
+
+	cb = Resource(T.CSEBase, dict(storage.db.searchResources(ri = 'cb')[0]))	# plain resources, without the type specific initialization
+	ae = Resource(T.AE, dict(storage.db.searchResources(ri = 'ae0')[0]))
+	print(f'{resources} <cin> with {labels} distinct labels, under {aes} <ae> x {containers} <cnt> (ms per discovery)')
+	print(f'  build label index:                {build:12.3f}')
+	for name, root, lbls in [	('CSEBase, 1 label', cb, [ 'label1' ]),
+								('CSEBase, 3 labels', cb, [ 'label1', 'label2', 'label3' ]),
+								('<ae>, 1 label', ae, [ 'label1' ]) ]:
+		assert (found := indexLabels(dispatcher, root, lbls, sys.maxsize)) == walkLabels(dispatcher, root, lbls, sys.maxsize)
+		walk = timeIt(lambda i: walkLabels(dispatcher, root, lbls, sys.maxsize), args.count)
+		index = timeIt(lambda i: indexLabels(dispatcher, root, lbls, sys.maxsize), args.count * 100)
+		print(f'  {f"{name} ({len(found)} results)":32}  walk: {walk:12.3f}   index: {index:9.3f}')
@@ -0,0 +1,187 @@
+#
+#	NotificationFanOutHarness.py
+#
+#	License: BSD 3-Clause License. See the LICENSE file for further details.
+#
+#	Test harness for the parallel delivery of a notification to the multiple targets
+#	of a <sub> resource. It runs local stand-in receivers with an injected latency,
+#	and checks against a running CSE:
+#
+#	- fan-out: the targets of a notification are notified in parallel,
+#	- independence: a slow or failing target doesn't delay or prevent the others,
+#	- exc: the expirationCounter is only decremented when all targets were notified.
+#
+#	Start the CSE first, e.g. with "python -m acme --db-storage memory --headless".
+#
+
+from __future__ import annotations
+import argparse, json, sys, threading, time
+from typing import Any
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import requests
+
+cseURL:str = None
+receiverURL:str = None
+latency:dict[str, float] = {}				# target path -> injected latency in seconds
+failing:set[str] = set()					# target paths that drop the connection without a response
+received:dict[str, list[float]] = {}		# target path -> arrival times of the notifications
+lockReceived = threading.Lock()
+failures = 0
+
+
+class StandInReceiver(BaseHTTPRequestHandler):
+	"""	Stand-in notification receiver. The behaviour of a target depends on its path.
+	"""
+
+	def do_POST(self) -> None:
+		body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+		path = self.path.rstrip('/')
+		isVerification = bool(body and json.loads(body).get('m2m:sgn', {}).get('vrq'))
+		if not isVerification:
+			with lockReceived:
+				received.setdefault(path, []).append(time.time())
+			if path in latency:
+				time.sleep(latency[path])
+			if path in failing:
+				self.close_connection = True
+				return
+		self.send_response(200)
+		self.send_header('X-M2M-RSC', '2000')
+		self.send_header('X-M2M-RI', self.headers.get('X-M2M-RI', ''))
+		self.send_header('Content-Length', '0')
+		self.end_headers()
+
+
+	def log_message(self, *args:str) -> None:
+		pass
+
+
+def sendRequest(method:str, path:str, originator:str, ty:int = None, body:dict = None) -> tuple[str, dict]:
+	"""	Send a request to the CSE. Return the response status code and the response body.
+	"""
+	headers = { 'X-M2M-Origin' : originator, 'X-M2M-RI' : str(time.time()), 'X-M2M-RVI' : '3', 'Accept' : 'application/json' }
+	if ty is not None:
+		headers['Content-Type'] = f'application/json;ty={ty}'
+	response = requests.request(method, f'{cseURL}{path}', headers = headers, data = json.dumps(body) if body is not None else None)
+	return response.headers.get('X-M2M-RSC'), (response.json() if response.content else None)
+
+
+def check(name:str, condition:bool, info:Any = '') -> None:
+	global failures
+	if not condition:
+		failures += 1
+	print(f'  {"OK  " if condition else "FAIL"} {name}{"" if condition else f": {info}"}')
+
+
+def waitForNotifications(paths:list[str], count:int, timeout:float) -> None:
+	"""	Wait until each target received *count* notifications.
+	"""
+	deadline = time.time() + timeout
+	while time.time() < deadline:
+		with lockReceived:
+			if all([ len(received.get(path, [])) >= count for path in paths ]):
+				return
+		time.sleep(0.01)
+
+
+def subscribe(ae:str, originator:str, rn:str, paths:list[str], exc:int = None) -> str:
+	"""	Create a <cnt> with a <sub> that has the *paths* as notification targets. Return the <cnt>'s path.
+	"""
+	sendRequest('POST', ae, originator, 3, { 'm2m:cnt' : { 'rn' : rn } })
+	sub:dict = { 'rn' : 'sub', 'nu' : [ f'{receiverURL}{path}' for path in paths ], 'enc' : { 'net' : [ 3 ] } }
+	if exc:
+		sub['exc'] = exc
+	rsc, response = sendRequest('POST', f'{ae}/{rn}', originator, 23, { 'm2m:sub' : sub })
+	if rsc != '2001':
+		raise RuntimeError(f'Cannot create <sub>: {rsc} {response}')
+	return f'{ae}/{rn}'
+
+
+def createInstance(cnt:str, originator:str) -> None:
+	sendRequest('POST', cnt, originator, 4, { 'm2m:cin' : { 'con' : 'fan-out' } })
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description = 'Test harness for the parallel notification fan-out')
+	parser.add_argument('--cse', action = 'store', dest = 'cse', default = 'http://127.0.0.1:8080', help = 'CSE base URL (default: http://127.0.0.1:8080)')
+	parser.add_argument('--csename', action = 'store', dest = 'csename', default = 'cse-in', help = 'resource name of the CSEBase (default: cse-in)')
+	parser.add_argument('--port', action = 'store', dest = 'port', default = 9998, type = int, help = 'port of the stand-in receivers (default: 9998)')
+	parser.add_argument('--targets', action = 'store', dest = 'targets', default = 10, type = int, help = 'number of targets per <sub> (default: 10)')
+	parser.add_argument('--notifications', action = 'store', dest = 'notifications', default = 5, type = int, help = 'number of notifications for the fan-out test (default: 5)')
+	parser.add_argument('--latency', action = 'store', dest = 'latency', default = 0.1, type = float, help = 'latency of a target in seconds (default: 0.1)')
+	parser.add_argument('--slow-latency', action = 'store', dest = 'slowLatency', default = 2.0, type = float, help = 'latency of the slow target in seconds (default: 2.0)')
+	args = parser.parse_args()
+
+	cseURL = args.cse
+	receiverURL = f'http://127.0.0.1:{args.port}'
+	server = ThreadingHTTPServer(('127.0.0.1', args.port), StandInReceiver)
+	server.daemon_threads = True
+	threading.Thread(target = server.serve_forever, daemon = True).start()
+
+	originator = 'CfanOutHarness'
+	ae = f'/{args.csename}/fanOutHarness'
+	sendRequest('DELETE', ae, originator)	# from an earlier run
+	rsc, response = sendRequest('POST', f'/{args.csename}', originator, 2, { 'm2m:ae' : { 'rn' : 'fanOutHarness', 'api' : 'NfanOutHarness', 'rr' : True, 'srv' : [ '3' ] } })
+	if rsc != '2001':
+		print(f'Cannot register <AE> at {cseURL}: {rsc} {response}')
+		sys.exit(1)
+
+	try:
+		# Fan-out: all targets have the same latency
+		paths = [ f'/fanout/t{i}' for i in range(args.targets) ]
+		for path in paths:
+			latency[path] = args.latency
+		cnt = subscribe(ae, originator, 'fanout', paths)
+		start = time.time()
+		for _ in range(args.notifications):
+			createInstance(cnt, originator)
+		waitForNotifications(paths, args.notifications, args.targets * args.notifications * args.latency + 10.0)
+		duration = max([ max(received.get(path, [ 0.0 ])) for path in paths ]) - start
+		serial = args.targets * args.notifications * args.latency
+		print(f'Fan-out: {args.notifications} notifications to {args.targets} targets with {args.latency}s latency')
+		print(f'  last notification received after {duration:.3f}s (serial delivery: >= {serial:.3f}s)')
+		check('all targets notified', all([ len(received.get(path, [])) == args.notifications for path in paths ]), { path: len(received.get(path, [])) for path in paths })
+		check('targets notified in parallel', duration < serial / 2, f'{duration:.3f}s')
+
+		# Independence: one slow and one failing target
+		paths = [ f'/independent/t{i}' for i in range(args.targets) ]
+		latency[paths[0]] = args.slowLatency
+		failing.add(paths[1])
+		cnt = subscribe(ae, originator, 'independent', paths)
+		start = time.time()
+		createInstance(cnt, originator)
+		waitForNotifications(paths[2:], 1, 10.0)
+		duration = max([ received[path][0] for path in paths[2:] if path in received ] or [ float('inf') ]) - start
+		print(f'Independence: 1 target with {args.slowLatency}s latency and 1 failing target out of {args.targets}')
+		print(f'  other targets notified after {duration:.3f}s')
+		check('other targets notified', all([ path in received for path in paths[2:] ]))
+		check('other targets not delayed by the slow target', duration < args.slowLatency, f'{duration:.3f}s')
+		check('failing target was tried', paths[1] in received)
+
+		# exc: only decremented when all targets were notified
+		print('expirationCounter: exc = 2')
+		paths = [ f'/exc/t{i}' for i in range(args.targets) ]
+		cnt = subscribe(ae, originator, 'exc', paths, exc = 2)
+		for count in range(1, 3):
+			createInstance(cnt, originator)
+			waitForNotifications(paths, count, 10.0)
+		time.sleep(0.5)
+		rsc, _ = sendRequest('GET', f'{cnt}/sub', originator)
+		check('<sub> removed after 2 notifications to all targets', rsc == '4004', rsc)
+		paths = [ f'/excfailing/t{i}' for i in range(args.targets) ]
+		failing.add(paths[0])
+		cnt = subscribe(ae, originator, 'excfailing', paths, exc = 2)
+		for count in range(1, 3):
+			createInstance(cnt, originator)
+			waitForNotifications(paths[1:], count, 10.0)
+		time.sleep(0.5)
+		rsc, _ = sendRequest('GET', f'{cnt}/sub', originator)
+		check('<sub> kept when a target failed', rsc == '2000', rsc)
+		check('other targets notified twice', all([ len(received.get(path, [])) == 2 for path in paths[1:] ]))
+
+	finally:
+		sendRequest('DELETE', ae, originator)
+		server.shutdown()
+
+	print(f'Failures: {failures}')
+	sys.exit(1 if failures else 0)
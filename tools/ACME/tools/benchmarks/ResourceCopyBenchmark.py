@@ -0,0 +1,83 @@
+#
+#	ResourceCopyBenchmark.py
+#
+#	License: BSD 3-Clause License. See the LICENSE file for further details.
+#
+#	Benchmark for the copies of the resource attributes. A resource is instantiated from
+#	a database document with a large attribute, e.g. a 64 KB *con* string of a <cin> or
+#	a 64 KB *lbl* list of a <cnt>. The time per operation and the peak memory allocation
+#	(measured with tracemalloc) are printed for the instantiation, the instantiation plus
+#	asDict(), and the clone() of the resource cache.
+#
+#	The benchmark only uses interfaces that existed before the copy-on-write attribute
+#	dictionary, so it can be run on an older tree as well to compare the results.
+#
+
+from __future__ import annotations
+import argparse, json, sys, time, tracemalloc
+from typing import Callable
+
+import pathlib, os
+parent = pathlib.Path(os.path.abspath(os.path.dirname(__file__))).parent.parent
+sys.path.append(f'{parent}')
+from acme.services.Configuration import Configuration
+from acme.services import CSE	# import the CSE first to resolve the circular imports of the services
+from acme.resources import Factory
+from acme.etc.Types import JSON
+
+
+def timeIt(func, count:int) -> float:
+	"""	Return the average time in us of *count* calls of *func(i)*.
+	"""
+	start = time.perf_counter()
+	for i in range(count):
+		func(i)
+	return (time.perf_counter() - start) / count * 1000000.0
+
+
+def peakAllocation(func:Callable) -> int:
+	"""	Return the peak memory allocation in bytes of a single call of *func(0)*.
+	"""
+	func(0)		# warm up, e.g. for caches and lazily created structures
+	tracemalloc.start()
+	tracemalloc.reset_peak()
+	result = func(0)
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del result
+	return peak
+
+
+def databaseDocument(doc:JSON) -> JSON:
+	"""	Return a fresh copy of *doc*, as it is returned by the database.
+	"""
+	return json.loads(json.dumps(doc))
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description = 'Benchmark the copies of the resource attributes')
+	parser.add_argument('--size', type = int, default = 65536, help = 'size in bytes of the large attribute (default: 65536)')
+	parser.add_argument('--count', type = int, default = 2000, help = 'number of operations per measurement (default: 2000)')
+	args = parser.parse_args()
+
+	# The resources are not stored, so no further configuration is needed
+	Configuration._configuration = { 'db.inMemory' : True, 'db.resetOnStartup' : False, 'db.backend' : 'tinydb', 'db.cacheSize' : 0,
+									 'db.journal' : False, 'db.resourceCacheSize' : 0, 'db.identifierCacheSize' : 0 }
+	CSE.cseCsi = '/id-benchmark'
+
+	common = { 'ct' : '20220101T000000', 'lt' : '20220101T000000', 'et' : '99991231T235959', 'acpi' : [ 'acp1', 'acp2' ] }
+	labels = args.size // 64
+	scenarios = [	(f'<cin>, {args.size} bytes con', databaseDocument(common | {	'ri' : 'cin1', 'pi' : 'cnt1', 'ty' : 4, 'rn' : 'cin1', '__srn__' : 'cse-in/ae1/cnt1/cin1',
+																				'con' : 'x' * args.size, 'cnf' : 'text/plain:0', 'cs' : args.size, 'st' : 1, 'lbl' : [ 'a', 'b' ] })),
+					(f'<cnt>, {labels} x 64 bytes lbl', databaseDocument(common | {	'ri' : 'cnt1', 'pi' : 'ae1', 'ty' : 3, 'rn' : 'cnt1', '__srn__' : 'cse-in/ae1/cnt1',
+																				'cni' : 0, 'cbs' : 0, 'st' : 0, 'lbl' : [ f'label/{i:06d}'.ljust(64, 'x') for i in range(labels) ] })) ]
+
+	print(f'Time in us per operation / peak allocation in bytes')
+	for name, doc in scenarios:
+		resource = Factory.resourceFromDict(dict(doc)).resource
+		operations = [	('instantiate', lambda i: Factory.resourceFromDict(dict(doc)).resource),
+						('instantiate + asDict()', lambda i: Factory.resourceFromDict(dict(doc)).resource.asDict()),
+						('clone()', lambda i: resource.clone()) ]
+		print(f'  {name}')
+		for operation, func in operations:
+			print(f'    {operation:30} {timeIt(func, args.count):9.1f} us  {peakAllocation(func):10d} bytes')
@@ -0,0 +1,66 @@
+#
+#	ResourceSizeBenchmark.py
+#
+#	License: BSD 3-Clause License. See the LICENSE file for further details.
+#
+#	Benchmark for the memory size of instantiated resources. A number of <cin>, <cnt> and
+#	<ae> resources are instantiated from database documents, as it is done e.g. for a
+#	discovery, and the memory that is allocated for them (measured with tracemalloc) is
+#	printed in bytes per resource. The database documents themselves are not counted.
+#
+#	The benchmark only uses interfaces that existed before the resource classes declared
+#	__slots__, so it can be run on an older tree as well to compare the results.
+#
+
+from __future__ import annotations
+import argparse, gc, json, sys, tracemalloc
+
+import pathlib, os
+parent = pathlib.Path(os.path.abspath(os.path.dirname(__file__))).parent.parent
+sys.path.append(f'{parent}')
+from acme.services.Configuration import Configuration
+from acme.services import CSE	# import the CSE first to resolve the circular imports of the services
+from acme.resources import Factory
+from acme.etc.Types import JSON
+
+
+def bytesPerResource(doc:JSON, count:int) -> tuple[float, bool]:
+	"""	Instantiate *count* resources from copies of *doc*. Return the allocated bytes per
+		resource, and whether the resources have a per-instance __dict__.
+	"""
+	docs = [ json.loads(json.dumps(doc)) for _ in range(count) ]
+	Factory.resourceFromDict(json.loads(json.dumps(doc)))	# warm up, e.g. for caches and lazily created structures
+	gc.collect()
+	tracemalloc.start()
+	resources = [ Factory.resourceFromDict(d).resource for d in docs ]
+	current, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	try:
+		object.__getattribute__(resources[0], '__dict__')	# not through __getattr__(), which forwards to the resource attributes
+		return current / count, True
+	except AttributeError:
+		return current / count, False
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description = 'Benchmark the memory size of instantiated resources')
+	parser.add_argument('--count', type = int, default = 10000, help = 'number of resources per resource type (default: 10000)')
+	args = parser.parse_args()
+
+	# The resources are not stored, so no further configuration is needed
+	Configuration._configuration = { 'db.inMemory' : True, 'db.resetOnStartup' : False, 'db.backend' : 'tinydb', 'db.cacheSize' : 0,
+									 'db.journal' : False, 'db.resourceCacheSize' : 0, 'db.identifierCacheSize' : 0 }
+	CSE.cseCsi = '/id-benchmark'
+
+	common = { 'ct' : '20220101T000000', 'lt' : '20220101T000000', 'et' : '99991231T235959', '__announcedTo__' : [] }
+	docs = [	('<cin>', common | {	'ri' : 'cin1', 'pi' : 'cnt1', 'ty' : 4, 'rn' : 'cin1', '__srn__' : 'cse-in/ae1/cnt1/cin1', '__rtype__' : 'm2m:cin',
+										'con' : 'hello', 'cnf' : 'text/plain:0', 'cs' : 5, 'st' : 1 }),
+				('<cnt>', common | {	'ri' : 'cnt1', 'pi' : 'ae1', 'ty' : 3, 'rn' : 'cnt1', '__srn__' : 'cse-in/ae1/cnt1', '__rtype__' : 'm2m:cnt',
+										'cni' : 0, 'cbs' : 0, 'st' : 0 }),
+				('<ae>', common | {		'ri' : 'Cae1', 'pi' : 'cb', 'ty' : 2, 'rn' : 'ae1', '__srn__' : 'cse-in/ae1', '__rtype__' : 'm2m:ae',
+										'aei' : 'Cae1', 'api' : 'Nbenchmark', 'rr' : True, 'srv' : [ '3' ], 'poa' : [ 'http://127.0.0.1:9999' ] }) ]
+
+	print(f'{args.count} resources per type (bytes per resource)')
+	for name, doc in docs:
+		size, hasDict = bytesPerResource(doc, args.count)
+		print(f'  {name:8} {size:8.0f}   {"with" if hasDict else "without"} __dict__')
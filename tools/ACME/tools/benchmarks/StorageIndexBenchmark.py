@@ -0,0 +1,64 @@
+#
+#	StorageIndexBenchmark.py
+#
+#	License: BSD 3-Clause License. See the LICENSE file for further details.
+#
+#	Benchmark for the in-memory indexes of the TinyDB binding. Lookups by ri, pi/ty
+#	and ty through the indexes are compared with a scan of the resources table. This
+#	is done for the in-memory storage and the file-backed storage.
+#
+
+from __future__ import annotations
+import argparse, sys, tempfile, time
+
+import pathlib, os
+parent = pathlib.Path(os.path.abspath(os.path.dirname(__file__))).parent.parent
+sys.path.append(f'{parent}')
+from acme.services.Configuration import Configuration
+from acme.services import CSE	# import the CSE first to resolve the circular imports of the services
+from acme.services.Storage import TinyDBBinding
+
+
+def timeIt(func, count:int) -> float:
+	"""	Return the average time in ms of *count* calls of *func(i)*.
+	"""
+	start = time.perf_counter()
+	for i in range(count):
+		func(i)
+	return (time.perf_counter() - start) / count * 1000.0
+
+
+def benchmark(inMemory:bool, resources:int, parents:int, count:int) -> None:
+	with tempfile.TemporaryDirectory() as path:
+		Configuration._configuration = { 'db.cacheSize' : 0, 'db.inMemory' : inMemory, 'db.journal' : False }
+		db = TinyDBBinding(path)
+		db.tabResources.insert_multiple([ { 'ri' : f'cin{i}', 'pi' : f'cnt{i % parents}', 'ty' : 4, 'con' : 'x' } for i in range(resources) ]
+									  + [ { 'ri' : f'cnt{i}', 'pi' : 'ae', 'ty' : 3 } for i in range(parents) ])
+		db._buildIndexes()
+		query = db.resourceQuery
+		perParent = resources // parents
+
+		print(f'{"memory" if inMemory else "file"} storage, {resources} <cin> under {parents} <cnt> (ms per lookup)')
+		for name, indexed, scan in [
+			(	'ri',
+				lambda i: db.searchResources(ri = f'cin{i * 37 % resources}'),
+				lambda i: db.tabResources.search(query.ri == f'cin{i * 37 % resources}') ),
+			(	f'pi/ty ({perParent} results)',
+				lambda i: db.searchResources(pi = f'cnt{i % parents}', ty = 4),
+				lambda i: db.tabResources.search((query.pi == f'cnt{i % parents}') & (query.ty == 4)) ),
+			(	f'ty ({parents} results)',
+				lambda i: db.searchResources(ty = 3),
+				lambda i: db.tabResources.search(query.ty == 3) ),
+		]:
+			print(f'  {name:24} index: {timeIt(indexed, count):9.3f}   scan: {timeIt(scan, count):9.3f}')
+		db.closeDB()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description = 'Benchmark the resource lookups of the TinyDB binding')
+	parser.add_argument('--resources', type = int, default = 20000, help = 'number of <cin> resources')
+	parser.add_argument('--parents', type = int, default = 100, help = 'number of <cnt> parent resources')
+	parser.add_argument('--count', type = int, default = 20, help = 'number of lookups per measurement')
+	args = parser.parse_args()
+	for inMemory in [ True, False ]:
+		benchmark(inMemory, args.resources, args.parents, args.count)